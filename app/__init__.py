@@ -3,6 +3,9 @@ from flask import Flask
 from flask_cors import CORS
 from app.models import db
 from app.config import Config
+from app.utils.json_provider import FastJSONProvider
+from app.utils.metrics import Metrics
+from app.utils.profiler import RequestProfiler
 
 
 def create_app(config_class=Config):
@@ -10,6 +13,9 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    # orjson-backed JSON encoding (stdlib fallback) for jsonify and request.json
+    app.json = FastJSONProvider(app)
+    
     # Configure CORS
     CORS(app)
     
@@ -21,6 +27,8 @@ def create_app(config_class=Config):
     
     # Initialize extensions
     db.init_app(app)
+    Metrics.init_app(app)
+    RequestProfiler.init_app(app)
     
     # Register API blueprints
     from app.routes.meetings import meetings_bp
@@ -30,18 +38,38 @@ def create_app(config_class=Config):
     from app.routes.projects import projects_bp
     app.register_blueprint(projects_bp)
     
+    # Register Events (SSE) blueprint
+    from app.routes.events import events_bp
+    app.register_blueprint(events_bp)
+    
+    # Register Prometheus metrics blueprint
+    from app.routes.metrics import metrics_bp
+    app.register_blueprint(metrics_bp)
+    
     # Register UI blueprint
     from app.routes.ui import ui_bp
     app.register_blueprint(ui_bp)
     
+    # Register profile viewer when the request profiler is enabled
+    if app.config['PROFILER_ENABLED']:
+        from app.routes.profiles import profiles_bp
+        app.register_blueprint(profiles_bp)
+    
     # Register test utils blueprint in development mode
     if app.config['DEBUG']:
         from app.routes.test_utils import test_utils_bp
         app.register_blueprint(test_utils_bp)
     
-    # Create database tables
+    # Create database tables and the full-text search index
     with app.app_context():
         db.create_all()
+        Metrics.instrument_engine(db.engine)
+        
+        from app.services.search_service import TranscriptSearchService
+        TranscriptSearchService.ensure_schema()
+        
+        from app.services.prompt_registry import PromptRegistry
+        PromptRegistry.preload()
     
     @app.route('/health')
     def health_check():
@@ -29,13 +29,97 @@ class Config:
     # Webhook
     FIREFLIES_WEBHOOK_SECRET = os.getenv("FIREFLIES_WEBHOOK_SECRET", "")
     VERIFY_SIGNATURE = bool(FIREFLIES_WEBHOOK_SECRET)
+    WEBHOOK_LEDGER_RETENTION_DAYS = float(os.getenv("WEBHOOK_LEDGER_RETENTION_DAYS", "30"))  # Processed-event ledger retention
+    WEBHOOK_LEDGER_PRUNE_INTERVAL = float(os.getenv("WEBHOOK_LEDGER_PRUNE_INTERVAL", "3600"))  # Seconds between prunes
     
     # External Services
     PROJECT_BRIEF_SERVICE_URL = os.getenv("PROJECT_BRIEF_SERVICE_URL", "http://localhost:8001")
     
+    # In-process project brief cache (stale-while-revalidate)
+    PROJECT_CACHE_SOFT_TTL = float(os.getenv("PROJECT_CACHE_SOFT_TTL", "3600"))  # Refresh in background after this
+    PROJECT_CACHE_HARD_TTL = float(os.getenv("PROJECT_CACHE_HARD_TTL", "86400"))  # Stop serving from memory after this
+    PROJECT_CACHE_MAX_ENTRIES = int(os.getenv("PROJECT_CACHE_MAX_ENTRIES", "1024"))
+    
     # OpenAI brief validation
     ENABLE_BRIEF_VALIDATION = os.getenv("ENABLE_BRIEF_VALIDATION", "false").lower() == "true"
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")  # Part of the validation cache key
+    PROMPT_RELOAD_INTERVAL = float(os.getenv("PROMPT_RELOAD_INTERVAL", "5"))  # Seconds between prompt file mtime checks
+    VALIDATION_CHUNK_TOKEN_THRESHOLD = int(os.getenv("VALIDATION_CHUNK_TOKEN_THRESHOLD", "8000"))  # Larger briefs are split
+    VALIDATION_CHUNK_TOKENS = int(os.getenv("VALIDATION_CHUNK_TOKENS", "4000"))  # Target size of each part
+    VALIDATION_MAX_PARALLEL = int(os.getenv("VALIDATION_MAX_PARALLEL", "4"))  # Concurrent OpenAI calls per brief
+
+    # API pagination
+    MEETINGS_PAGE_SIZE = int(os.getenv("MEETINGS_PAGE_SIZE", "50"))
+    MEETINGS_MAX_PAGE_SIZE = int(os.getenv("MEETINGS_MAX_PAGE_SIZE", "200"))
+    MEETINGS_STREAM_BATCH_SIZE = int(os.getenv("MEETINGS_STREAM_BATCH_SIZE", "50"))  # Rows fetched per server-side cursor round trip
+    TRANSCRIPT_MAX_SENTENCE_RANGE = int(os.getenv("TRANSCRIPT_MAX_SENTENCE_RANGE", "1000"))
+    TRANSCRIPT_DOWNLOAD_BATCH_SIZE = int(os.getenv("TRANSCRIPT_DOWNLOAD_BATCH_SIZE", "1000"))  # Sentences per query when streaming a download
+    IMMUTABLE_CACHE_MAX_AGE = int(os.getenv("IMMUTABLE_CACHE_MAX_AGE", "86400"))  # Seconds completed transcripts may be cached
+
+    # Batch meeting creation
+    MEETINGS_BATCH_MAX = int(os.getenv("MEETINGS_BATCH_MAX", "100"))  # Meetings per batch request
+    MEETINGS_BATCH_CONCURRENCY = int(os.getenv("MEETINGS_BATCH_CONCURRENCY", "8"))  # Parallel bot invites
+
+    # Lazy transcript fetches from GET /projects/<id>/meetings/<mid>
+    TRANSCRIPT_FETCH_BACKOFF_BASE = float(os.getenv("TRANSCRIPT_FETCH_BACKOFF_BASE", "30"))  # Seconds, doubled per miss
+    TRANSCRIPT_FETCH_BACKOFF_MAX = float(os.getenv("TRANSCRIPT_FETCH_BACKOFF_MAX", "900"))
+    TRANSCRIPT_FETCH_LEASE = int(os.getenv("TRANSCRIPT_FETCH_LEASE", "60"))  # Cross-worker single-flight lease
+    TRANSCRIPT_FETCH_WAIT = float(os.getenv("TRANSCRIPT_FETCH_WAIT", "15"))  # Max wait for an in-process fetch
+    TRANSCRIPT_FETCH_RETENTION_DAYS = float(os.getenv("TRANSCRIPT_FETCH_RETENTION_DAYS", "7"))  # Idle fetch state is deleted after this
+    TRANSCRIPT_FETCH_PRUNE_INTERVAL = float(os.getenv("TRANSCRIPT_FETCH_PRUNE_INTERVAL", "3600"))  # Seconds between prunes
+
+    # Transcript ingestion (streamed from Fireflies into sentence rows)
+    TRANSCRIPT_INSERT_BATCH_SIZE = int(os.getenv("TRANSCRIPT_INSERT_BATCH_SIZE", "500"))  # Sentence rows per INSERT while ingesting
+
+    # Server-Sent Events
+    EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "auto")  # auto, local or postgres (LISTEN/NOTIFY)
+    EVENTS_HEARTBEAT_INTERVAL = float(os.getenv("EVENTS_HEARTBEAT_INTERVAL", "15"))
+    EVENTS_STREAM_MAX_SECONDS = float(os.getenv("EVENTS_STREAM_MAX_SECONDS", "300"))  # Clients reconnect after this
+    EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+    EVENTS_MAX_STREAMS = int(os.getenv("EVENTS_MAX_STREAMS", "4"))  # Per process; each open stream holds a gunicorn thread
+    EVENTS_RETRY_AFTER = int(os.getenv("EVENTS_RETRY_AFTER", "60"))  # Seconds rejected clients poll before reconnecting
+
+    # Outbound HTTP client (shared keep-alive pools per process)
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # Number of per-host pools kept
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))  # Keep-alive connections per host
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))  # Idempotent calls only
+    HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+
+    # Upstream rate limits shared by all workers: name=requests/seconds
+    RATE_LIMITS = os.getenv("RATE_LIMITS", "fireflies=50/60,openai=500/60")
+    RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "60"))  # Seconds a caller queues for a token
+
+    # Background job queue
+    JOB_WORKER_EMBEDDED = os.getenv("JOB_WORKER_EMBEDDED", "true").lower() == "true"
+    JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))  # Seconds between polls when idle
+    JOB_VISIBILITY_TIMEOUT = int(os.getenv("JOB_VISIBILITY_TIMEOUT", "300"))  # Seconds before a stuck job is re-claimed
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    JOB_RETRY_BASE_DELAY = float(os.getenv("JOB_RETRY_BASE_DELAY", "10"))  # Seconds, doubled per attempt
+    JOB_RETENTION_DAYS = float(os.getenv("JOB_RETENTION_DAYS", "7"))  # Completed jobs are deleted after this
+    JOB_PRUNE_INTERVAL = float(os.getenv("JOB_PRUNE_INTERVAL", "3600"))  # Seconds between prunes per process
+
+    # Transcript reconciler (backfills meetings whose webhook was lost)
+    RECONCILE_INTERVAL = float(os.getenv("RECONCILE_INTERVAL", "300"))  # Seconds between scheduled runs, 0 disables
+    RECONCILE_MIN_AGE = float(os.getenv("RECONCILE_MIN_AGE", "30"))  # Minutes a meeting must be pending
+    RECONCILE_MAX_AGE = float(os.getenv("RECONCILE_MAX_AGE", "72"))  # Hours after which a meeting is given up on
+    RECONCILE_BATCH_SIZE = int(os.getenv("RECONCILE_BATCH_SIZE", "100"))
+    RECONCILE_CONCURRENCY = int(os.getenv("RECONCILE_CONCURRENCY", "4"))
+
+    # Prometheus metrics (GET /metrics); set PROMETHEUS_MULTIPROC_DIR when running several workers
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Request profiler, opt-in per request through PROFILER_HEADER (off unless enabled)
+    PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() == "true"
+    PROFILER_HEADER = os.getenv("PROFILER_HEADER", "X-Profile")
+    PROFILER_TOKEN = os.getenv("PROFILER_TOKEN")  # If set, the header value must match it
+    PROFILER_DIR = os.getenv("PROFILER_DIR")  # Defaults to "profiles" in the Flask instance folder
+    PROFILER_INTERVAL = float(os.getenv("PROFILER_INTERVAL", "0.005"))  # Seconds between stack samples
+    PROFILER_MAX_PROFILES = int(os.getenv("PROFILER_MAX_PROFILES", "200"))  # Oldest profiles are deleted beyond this
+    PROFILER_N_PLUS_ONE_THRESHOLD = int(os.getenv("PROFILER_N_PLUS_ONE_THRESHOLD", "5"))  # Repeats of one statement to flag
 
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
\ No newline at end of file
@@ -1,6 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
-import json
+import zlib
+from app.utils.json_provider import RawJSON
+from app.utils.meet_link import MeetLink
 
 db = SQLAlchemy()
 
@@ -15,6 +17,9 @@ class Project(db.Model):
     requirements = db.Column(db.Text, nullable=True)
     questions = db.Column(db.Text, nullable=True)
     validation_data = db.Column(db.Text, nullable=True)  # JSON string from OpenAI validation
+    validation_hash = db.Column(db.String(64), nullable=True)  # Content hash validation_data was produced for
+    validation_status = db.Column(db.String(20), nullable=True)  # pending, ready, failed
+    validation_prompt_version = db.Column(db.String(100), nullable=True)  # PromptRegistry version used
     last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -23,20 +28,21 @@ class Project(db.Model):
                               primaryjoin="Project.project_id == foreign(Meeting.project_id)")
     
     def to_dict(self):
-        """Convert project object to dictionary for JSON responses."""
-        validation = None
-        if self.validation_data:
-            try:
-                validation = json.loads(self.validation_data)
-            except json.JSONDecodeError:
-                validation = None
-                
+        """
+        Convert project object to dictionary for JSON responses.
+        
+        The stored validation JSON is passed through as RawJSON instead of
+        being parsed and re-encoded on every request.
+        """
         return {
             'id': self.id,
             'project_id': self.project_id,
             'requirements': self.requirements,
             'questions': self.questions,
-            'validation': validation,
+            'validation': RawJSON(self.validation_data) if self.validation_data else None,
+            'validation_hash': self.validation_hash,
+            'validation_status': self.validation_status,
+            'validation_prompt_version': self.validation_prompt_version,
             'last_updated': self.last_updated.isoformat() if self.last_updated else None,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
@@ -47,20 +53,202 @@ class Meeting(db.Model):
     
     __tablename__ = 'meetings'
     
+    # Fields that can be requested through the `fields=` projection
+    SERIALIZABLE_FIELDS = ('id', 'project_id', 'meeting_id', 'meeting_url', 'transcription',
+                           'has_transcription', 'meeting_datetime')
+    # List responses leave out the (potentially multi-MB) transcript unless asked for
+    DEFAULT_LIST_FIELDS = tuple(f for f in SERIALIZABLE_FIELDS if f != 'transcription')
+    
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.String(50), nullable=False, index=True)  # References Project.project_id
     meeting_id = db.Column(db.String(50), nullable=True, index=True)  # Fireflies transcript ID
-    meeting_url = db.Column(db.Text, nullable=False, index=True)
-    transcription = db.Column(db.Text, nullable=True)
-    meeting_datetime = db.Column(db.DateTime, default=datetime.utcnow)
+    meeting_url = db.Column(db.Text, nullable=False)
+    meet_code = db.Column(db.String(64), nullable=True)  # Normalized Meet code, e.g. abc-defg-hij
+    transcription = db.deferred(db.Column(db.Text, nullable=True))  # Legacy uncompressed transcript
+    transcript_blob = db.deferred(db.Column(db.LargeBinary, nullable=True))  # zlib-compressed full text
+    sentence_count = db.Column(db.Integer, nullable=True)
+    transcript_size = db.Column(db.Integer, nullable=True)  # Uncompressed size in bytes
+    transcript_payload_size = db.Column(db.Integer, nullable=True)  # Bytes of the Fireflies response it was ingested from
+    transcript_ingest_ms = db.Column(db.Integer, nullable=True)  # Time spent downloading and storing the transcript
+    meeting_datetime = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # Keyset cursors need a value
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Version for conditional GETs
+    
+    # Computed in SQL so listing pending/completed meetings never reads the transcript
+    has_transcription = db.column_property(
+        db.or_(
+            transcript_blob.expression.isnot(None),
+            db.and_(transcription.expression.isnot(None), transcription.expression != '')
+        )
+    )
+    
+    __table_args__ = (
+        # Keyset pagination of a project's meetings by (meeting_datetime, id)
+        db.Index('ix_meetings_project_datetime_id', 'project_id', 'meeting_datetime', 'id'),
+        # Webhook matching: most recent meeting for a Meet code
+        db.Index('ix_meetings_meet_code_datetime', 'meet_code', 'meeting_datetime'),
+        # Conditional GET of a project's meeting list: MAX(updated_at) per project
+        db.Index('ix_meetings_project_updated_at', 'project_id', 'updated_at'),
+    )
+    
+    @db.validates('meeting_url')
+    def _set_meet_code(self, key, meeting_url):
+        """Keep meet_code in sync whenever the meeting URL is set."""
+        self.meet_code = MeetLink.normalize_code(meeting_url)
+        return meeting_url
+    
+    def to_dict(self, fields=None):
+        """
+        Convert meeting object to dictionary for JSON responses.
+        
+        Args:
+            fields (iterable, optional): Subset of SERIALIZABLE_FIELDS to include.
+                Only the requested attributes are touched, so deferred columns
+                that were not asked for are never loaded.
+        """
+        fields = fields or self.SERIALIZABLE_FIELDS
+        result = {}
+        for field in fields:
+            if field == 'meeting_datetime':
+                result[field] = self.meeting_datetime.isoformat() if self.meeting_datetime else None
+            elif field == 'has_transcription':
+                result[field] = bool(self.has_transcription)
+            elif field == 'transcription':
+                result[field] = self.transcript_text
+            else:
+                result[field] = getattr(self, field)
+        return result
+    
+    @property
+    def transcript_text(self):
+        """Full transcript text, decompressed from the blob or read from the legacy column."""
+        if self.transcript_blob is not None:
+            return zlib.decompress(self.transcript_blob).decode('utf-8')
+        return self.transcription
+
+
+class TranscriptSentence(db.Model):
+    """Database model for storing individual transcript sentences for range reads."""
+    
+    __tablename__ = 'transcript_sentences'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    meeting_pk = db.Column(db.Integer, db.ForeignKey('meetings.id', ondelete='CASCADE'), nullable=False)  # References Meeting.id
+    sentence_index = db.Column(db.Integer, nullable=False)
+    speaker = db.Column(db.String(255), nullable=True)
+    text = db.Column(db.Text, nullable=False)
+    start_time = db.Column(db.Float, nullable=True)  # Seconds from the start of the meeting
+    end_time = db.Column(db.Float, nullable=True)
+    
+    __table_args__ = (
+        # Serves sentence range reads: WHERE meeting_pk = ? AND sentence_index BETWEEN ? AND ?
+        db.UniqueConstraint('meeting_pk', 'sentence_index', name='uq_transcript_sentences_meeting_index'),
+    )
+    
+    def to_dict(self):
+        """Convert sentence object to dictionary for JSON responses."""
+        return {
+            'index': self.sentence_index,
+            'speaker': self.speaker,
+            'text': self.text,
+            'start_time': self.start_time,
+            'end_time': self.end_time
+        }
+
+
+class Job(db.Model):
+    """Database model for durable background jobs (e.g. webhook processing)."""
+    
+    __tablename__ = 'jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=True)  # JSON string passed to the job handler
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    dedupe_key = db.Column(db.String(100), nullable=True)  # At most one queued/running job per key
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = db.Column(db.DateTime, nullable=True)  # Visibility timeout while running
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_jobs_status_available_at', 'status', 'available_at'),
+        db.Index('uq_jobs_active_dedupe_key', 'dedupe_key', unique=True,
+                 postgresql_where=db.text("status IN ('queued', 'running')"),
+                 sqlite_where=db.text("status IN ('queued', 'running')")),
+    )
     
     def to_dict(self):
-        """Convert meeting object to dictionary for JSON responses."""
+        """Convert job object to dictionary for JSON responses."""
         return {
             'id': self.id,
-            'project_id': self.project_id,
-            'meeting_id': self.meeting_id,
-            'meeting_url': self.meeting_url,
-            'transcription': self.transcription,
-            'meeting_datetime': self.meeting_datetime.isoformat() if self.meeting_datetime else None
-        }
\ No newline at end of file
+            'kind': self.kind,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'available_at': self.available_at.isoformat() if self.available_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+
+class TranscriptFetchState(db.Model):
+    """Database model coordinating lazy Fireflies transcript fetches across workers."""
+    
+    __tablename__ = 'transcript_fetch_state'
+    
+    fireflies_id = db.Column(db.String(50), primary_key=True)  # Fireflies transcript ID
+    attempts = db.Column(db.Integer, nullable=False, default=0)  # Consecutive failed attempts
+    next_attempt_at = db.Column(db.DateTime, nullable=True)  # Negative cache: no fetch before this time
+    lease_until = db.Column(db.DateTime, nullable=True)  # Set while a worker is fetching
+    last_error = db.Column(db.Text, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class BriefValidation(db.Model):
+    """Database model caching OpenAI brief validations by content hash."""
+    
+    __tablename__ = 'brief_validations'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    # sha256 of requirements, questions, prompt versions and model
+    content_hash = db.Column(db.String(64), nullable=False, unique=True)
+    model = db.Column(db.String(50), nullable=False)
+    prompt_version = db.Column(db.String(100), nullable=True)  # PromptRegistry version used
+    result = db.Column(db.Text, nullable=False)  # JSON string from OpenAI validation
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class RateLimitBucket(db.Model):
+    """Database model holding a token bucket shared by all workers calling an upstream API."""
+    
+    __tablename__ = 'rate_limit_buckets'
+    
+    name = db.Column(db.String(50), primary_key=True)  # Upstream name, e.g. fireflies
+    capacity = db.Column(db.Float, nullable=False)  # Maximum burst
+    refill_rate = db.Column(db.Float, nullable=False)  # Tokens added per second
+    tokens = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False)  # Unix time of the last refill
+    blocked_until = db.Column(db.Float, nullable=True)  # Unix time from Retry-After / rate-limit reset headers
+
+
+class WebhookEvent(db.Model):
+    """Database model recording accepted webhook events so duplicates are processed only once."""
+    
+    __tablename__ = 'webhook_events'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    meeting_id = db.Column(db.String(50), nullable=False)  # Fireflies transcript ID
+    event_type = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='received')  # received, processed
+    job_id = db.Column(db.Integer, nullable=True)  # Job processing the event
+    received_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime, nullable=True)
+    
+    __table_args__ = (
+        db.UniqueConstraint('meeting_id', 'event_type', name='uq_webhook_events_meeting_event'),
+        # Retention pruning
+        db.Index('ix_webhook_events_received_at', 'received_at'),
+    )
@@ -0,0 +1,75 @@
+"""
+Event stream routes for the Fireflies Transcription Service.
+This module contains the Server-Sent Events stream used by the UI instead of polling.
+"""
+
+from flask import Blueprint, Response, current_app, jsonify, stream_with_context
+from app.services.event_broker import EventBroker
+import itertools
+import json
+import logging
+import queue
+import time
+
+logger = logging.getLogger(__name__)
+events_bp = Blueprint('events', __name__)
+
+
+@events_bp.route("/projects/<project_id>/events", methods=["GET"])
+def project_events(project_id):
+    """
+    GET: Server-Sent Events stream of a project's events
+    
+    Path parameters:
+    - project_id: Project ID to receive events for
+    
+    Events:
+    - meeting.transcribed: {"id": int, "meeting_id": str} when a transcript is stored
+    - project.validated: {"project_id": str, "status": "ready"|"failed"} when a brief validation finishes
+    
+    The stream sends a comment every EVENTS_HEARTBEAT_INTERVAL seconds and is
+    closed after EVENTS_STREAM_MAX_SECONDS; EventSource reconnects automatically.
+    
+    Every open stream occupies a worker thread, so a process serves at most
+    EVENTS_MAX_STREAMS of them and answers further ones with 503 and
+    Retry-After; the UI polls until then.
+    """
+    heartbeat = current_app.config['EVENTS_HEARTBEAT_INTERVAL']
+    max_seconds = current_app.config['EVENTS_STREAM_MAX_SECONDS']
+    subscription = EventBroker.subscribe(project_id, limit=current_app.config['EVENTS_MAX_STREAMS'])
+    if subscription is None:
+        retry_after = current_app.config['EVENTS_RETRY_AFTER']
+        logger.info(f"Event stream limit reached, rejecting viewer of project {project_id}")
+        return jsonify({"error": "Too many event streams, poll instead"}), 503, {"Retry-After": str(retry_after)}
+    
+    def release():
+        EventBroker.unsubscribe(project_id, subscription)
+    
+    def stream():
+        try:
+            yield "retry: 5000\n\n"
+            deadline = time.monotonic() + max_seconds
+            event_ids = itertools.count(1)
+            while time.monotonic() < deadline:
+                try:
+                    event = subscription.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {next(event_ids)}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+        finally:
+            release()
+    
+    try:
+        response = Response(
+            stream_with_context(stream()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    except Exception:
+        release()
+        raise
+    # The generator's finally only runs once it started; a response closed before
+    # its first chunk (e.g. the client went away) must free the slot as well
+    response.call_on_close(release)
+    return response
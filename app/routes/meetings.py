@@ -1,26 +1,161 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from sqlalchemy import and_, case, func, insert, or_
+from sqlalchemy.orm import load_only
 from app.models import db, Meeting
+from app.services.event_broker import EventBroker
 from app.services.fireflies import FirefliesService
+from app.services.job_queue import JobQueue, JobError, PermanentJobError
+from app.services.reconciler import TranscriptReconciler
+from app.services.search_service import TranscriptSearchService
+from app.services.transcript_fetch import TranscriptFetchCoordinator
+from app.services.transcript_export import TranscriptExport
+from app.services.transcript_store import TranscriptStore
+from app.services.webhook_ledger import WebhookLedger
+from app.utils.http_cache import HttpCache
+from app.utils.meet_link import MeetLink
 from app.utils.webhook import WebhookHandler
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
 from datetime import datetime
+import base64
+import binascii
+import json
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 meetings_bp = Blueprint('meetings', __name__)
 
 
+def _encode_cursor(meeting):
+    """Builds an opaque keyset cursor pointing after the given meeting."""
+    position = [meeting.meeting_datetime.isoformat(), meeting.id]
+    return base64.urlsafe_b64encode(json.dumps(position).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor):
+    """
+    Decodes a cursor produced by _encode_cursor.
+    
+    Returns:
+        tuple: (meeting_datetime, id)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        dt_value, meeting_pk = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(dt_value), int(meeting_pk)
+    except (TypeError, ValueError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _parse_fields(fields_param, default):
+    """
+    Parses a comma separated `fields=` projection.
+    
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if not fields_param:
+        return default
+    fields = [f.strip() for f in fields_param.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in Meeting.SERIALIZABLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
 @meetings_bp.route("/projects/<project_id>/meetings", methods=["GET"])
 def get_meetings(project_id):
     """
-    GET: Retrieve meetings for a specific project
+    GET: Retrieve meetings for a specific project, newest first
     
     Path parameters:
     - project_id: Project ID to filter meetings
+    
+    Query parameters:
+    - limit: Page size (default MEETINGS_PAGE_SIZE, capped at MEETINGS_MAX_PAGE_SIZE)
+    - cursor: Opaque cursor from a previous page's next_cursor
+    - fields: Comma separated fields to return; transcription is only included when listed
+    
+    Returns:
+    - {"meetings": [...], "total": int, "next_cursor": str or null}
+    
+    The response is streamed: rows are read from a server-side cursor in
+    batches of MEETINGS_STREAM_BATCH_SIZE and encoded one at a time, so
+    memory does not grow with the page (or transcript) size.
     """
     try:
-        # Query meetings for this project
-        meetings = Meeting.query.filter(Meeting.project_id == project_id).all()
-        return jsonify([meeting.to_dict() for meeting in meetings]), 200
+        try:
+            fields = _parse_fields(request.args.get("fields"), Meeting.DEFAULT_LIST_FIELDS)
+            cursor = request.args.get("cursor")
+            position = _decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        limit = request.args.get("limit", default=current_app.config['MEETINGS_PAGE_SIZE'], type=int)
+        limit = max(1, min(limit, current_app.config['MEETINGS_MAX_PAGE_SIZE']))
+        
+        project_filter = Meeting.project_id == project_id
+        # One index-only aggregate gives both the total and the list's version
+        total, last_modified = db.session.query(
+            func.count(Meeting.id), func.max(Meeting.updated_at)
+        ).filter(project_filter).one()
+        
+        etag = HttpCache.etag(project_id, total, last_modified, request.query_string.decode("utf-8"))
+        # ETag only: a deletion lowers the count without moving max(updated_at),
+        # so If-Modified-Since would keep answering 304 for a stale list
+        not_modified = HttpCache.not_modified(etag)
+        if not_modified:
+            return not_modified
+        
+        # Only load the requested columns; the cursor always needs meeting_datetime and id
+        columns = {"id", "meeting_datetime", *fields}
+        if "transcription" in columns:
+            # Avoid one lazy load per row for the compressed transcript
+            columns.add("transcript_blob")
+        query = Meeting.query.options(
+            load_only(*[getattr(Meeting, name) for name in columns])
+        ).filter(project_filter)
+        
+        if position:
+            cursor_datetime, cursor_id = position
+            query = query.filter(or_(
+                Meeting.meeting_datetime < cursor_datetime,
+                and_(Meeting.meeting_datetime == cursor_datetime, Meeting.id < cursor_id)
+            ))
+        
+        # Fetch one extra row to know whether another page exists
+        # iter() executes the query here, so SQL errors still produce a 500
+        meetings = iter(
+            query.order_by(Meeting.meeting_datetime.desc(), Meeting.id.desc())
+            .limit(limit + 1)
+            .yield_per(current_app.config['MEETINGS_STREAM_BATCH_SIZE'])
+        )
+        encode = current_app.json.dumps_bytes
+        
+        def stream():
+            try:
+                yield b'{"meetings":['
+                previous = None
+                next_cursor = None
+                sent = 0
+                for meeting in meetings:
+                    if sent == limit:
+                        next_cursor = _encode_cursor(previous)
+                        break
+                    yield (b"," if sent else b"") + encode(meeting.to_dict(fields))
+                    previous = meeting
+                    sent += 1
+                yield b'],"total":' + encode(total) + b',"next_cursor":' + encode(next_cursor) + b'}\n'
+            except Exception:
+                # Headers are already sent, so the client sees a truncated body
+                logger.exception("Error streaming meetings")
+                raise
+        
+        response = Response(stream_with_context(stream()), status=200, mimetype="application/json")
+        return HttpCache.apply(response, etag)
             
     except Exception as e:
         logger.exception("Error retrieving meetings")
@@ -48,17 +183,14 @@ def create_meeting(project_id):
         if not data:
             return jsonify({"error": "Invalid JSON body"}), 400
             
-        if 'google_meet_url' not in data:
-            return jsonify({"error": "Missing required field: google_meet_url"}), 400
+        error = _meeting_input_error(data)
+        if error:
+            return jsonify({"error": error}), 400
             
         meeting_url = data["google_meet_url"]
         title = data.get("title")
         duration = data.get("duration")
         
-        # Check if this is a valid Google Meet URL
-        if not meeting_url.startswith("https://meet.google.com/"):
-            return jsonify({"error": "Invalid Google Meet URL"}), 400
-        
         # Add Fireflies bot to the meeting
         success = FirefliesService.add_bot_to_meeting(meeting_url, title=title, duration=duration)
         if not success:
@@ -84,7 +216,115 @@ def create_meeting(project_id):
         return jsonify({"error": "Internal server error"}), 500
 
 
+def _meeting_input_error(data):
+    """Returns why a meeting creation payload is invalid, or None."""
+    if not isinstance(data, dict) or 'google_meet_url' not in data:
+        return "Missing required field: google_meet_url"
+    meeting_url = data["google_meet_url"]
+    # Check if this is a valid Google Meet URL
+    if not isinstance(meeting_url, str) or not meeting_url.startswith("https://meet.google.com/"):
+        return "Invalid Google Meet URL"
+    return None
+
 
+@meetings_bp.route("/projects/<project_id>/meetings:batch", methods=["POST"])
+def create_meetings_batch(project_id):
+    """
+    POST: Create several meetings at once, inviting the Fireflies bot concurrently
+    
+    Path parameters:
+    - project_id: Project ID to associate with the meetings
+    
+    Expected JSON body:
+    {
+        "meetings": [
+            {"google_meet_url": "https://meet.google.com/abc-defg-hij", "title": "Optional", "duration": 45},
+            ...
+        ]
+    }
+    
+    Returns:
+    - 201 if every meeting was created, otherwise 207 with per-item results:
+      {"results": [{"index": 0, "status": "created", "id": 1, "meeting_url": "..."},
+                   {"index": 1, "status": "error", "error": "..."}],
+       "created": 1, "failed": 1}
+    """
+    try:
+        data = request.get_json(silent=True)
+        items = data.get("meetings") if isinstance(data, dict) else None
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "Expected a non-empty 'meetings' list"}), 400
+        
+        max_items = current_app.config['MEETINGS_BATCH_MAX']
+        if len(items) > max_items:
+            return jsonify({"error": f"At most {max_items} meetings per batch"}), 400
+        
+        results = [None] * len(items)
+        to_invite = []
+        for index, item in enumerate(items):
+            error = _meeting_input_error(item)
+            if error:
+                results[index] = {"index": index, "status": "error", "error": error}
+            else:
+                to_invite.append(index)
+        
+        # Invite the bot to all meetings concurrently; wall-clock time tracks the slowest invite
+        app = current_app._get_current_object()
+        
+        def invite(index):
+            item = items[index]
+            with app.app_context():
+                return FirefliesService.add_bot_to_meeting(
+                    item["google_meet_url"], title=item.get("title"), duration=item.get("duration")
+                )
+        
+        invited = []
+        if to_invite:
+            workers = min(current_app.config['MEETINGS_BATCH_CONCURRENCY'], len(to_invite))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for index, success in zip(to_invite, executor.map(invite, to_invite)):
+                    if success:
+                        invited.append(index)
+                    else:
+                        results[index] = {"index": index, "status": "error",
+                                          "error": "Failed to add Fireflies bot to the meeting"}
+        
+        # Store all invited meetings with a single multi-row insert
+        if invited:
+            now = datetime.utcnow()
+            rows = [
+                {
+                    "project_id": project_id,
+                    "meeting_url": items[index]["google_meet_url"],
+                    "meet_code": MeetLink.normalize_code(items[index]["google_meet_url"]),
+                    "meeting_datetime": now
+                }
+                for index in invited
+            ]
+            ids = db.session.scalars(
+                insert(Meeting).returning(Meeting.id, sort_by_parameter_order=True),
+                rows
+            ).all()
+            db.session.commit()
+            for index, meeting_pk in zip(invited, ids):
+                results[index] = {
+                    "index": index,
+                    "status": "created",
+                    "id": meeting_pk,
+                    "meeting_url": items[index]["google_meet_url"]
+                }
+        
+        created = len(invited)
+        return jsonify({
+            "project_id": project_id,
+            "results": results,
+            "created": created,
+            "failed": len(items) - created
+        }), 201 if created == len(items) else 207
+    except Exception as e:
+        logger.exception("Error creating meetings batch")
+        db.session.rollback()
+        return jsonify({"error": "Internal server error"}), 500
 
 
 def process_transcription(fireflies_meeting_id):
@@ -98,49 +338,113 @@ def process_transcription(fireflies_meeting_id):
         tuple: (meeting_record, error_message, status_code)
             - meeting_record: Updated Meeting object or None if error
             - error_message: Error message or None if successful
-            - status_code: HTTP status code (404, 500, etc.) or None if successful
+            - status_code: HTTP status code or None if successful; 404 if the
+              transcript does not belong to a meeting booked here, 502/500 for
+              upstream and processing errors
     """
+    started = time.monotonic()
     try:
-        # Fetch the transcript from Fireflies
-        transcript_data = FirefliesService.get_transcript_by_id(fireflies_meeting_id)
-        print(transcript_data)
-        if not transcript_data:
-            return None, "Failed to retrieve transcript", 404
-            
-        # Extract meeting link and sentences
-        meeting_link = transcript_data.get("meeting_link")
-        sentences = transcript_data.get("sentences", [])
+        # Open the transcript from Fireflies; sentences are parsed while they are stored
+        transcript = FirefliesService.stream_transcript_by_id(fireflies_meeting_id)
+        if not transcript:
+            # Upstream error or transcript not ready yet, worth retrying
+            return None, "Failed to retrieve transcript", 502
         
-        if not meeting_link:
-            return None, "Meeting link not found in transcript data", 404
-            
-        # Format transcription with speaker names
-        transcript_lines = []
-        for sentence in sentences:
-            speaker = sentence.get("speaker_name", "Unknown")
-            text = sentence.get("text", "")
-            if text:
-                transcript_lines.append(f"{speaker}: {text}")
-        
-        full_text = "\n".join(transcript_lines)
-        
-        # Find the corresponding meeting in our database
-        meeting_record = Meeting.query.filter(Meeting.meeting_url == meeting_link).first()
-        if not meeting_record:
-            return None, f"No matching meeting found for URL: {meeting_link}", 404
+        with transcript:
+            meeting_link = transcript.meeting_link
+            if not meeting_link:
+                return None, "Meeting link not found in transcript data", 404
                 
-        # Update the meeting record with transcript info
-        meeting_record.meeting_id = fireflies_meeting_id
-        meeting_record.transcription = full_text
+            # Find the corresponding meeting in our database: the one already linked to this
+            # transcript, otherwise the most recent pending meeting booked on the same Meet code
+            meet_code = MeetLink.normalize_code(meeting_link)
+            meeting_record = Meeting.query.filter(
+                Meeting.meet_code == meet_code,
+                or_(
+                    Meeting.meeting_id == fireflies_meeting_id,
+                    and_(Meeting.meeting_id.is_(None), ~Meeting.has_transcription)
+                )
+            ).order_by(
+                case((Meeting.meeting_id == fireflies_meeting_id, 0), else_=1),
+                Meeting.meeting_datetime.desc()
+            ).first()
+            if not meeting_record:
+                return None, f"No matching meeting found for URL: {meeting_link}", 404
+                    
+            # Update the meeting record with transcript info
+            meeting_record.meeting_id = fireflies_meeting_id
+            stored = TranscriptStore.save_sentences(meeting_record, (
+                {
+                    "speaker": sentence.get("speaker_name"),
+                    "text": sentence.get("text"),
+                    "start_time": sentence.get("start_time"),
+                    "end_time": sentence.get("end_time")
+                }
+                for sentence in transcript.sentences()
+            ))
+            payload_size = transcript.bytes_read
+        
+        meeting_record.transcript_payload_size = payload_size
+        meeting_record.transcript_ingest_ms = int((time.monotonic() - started) * 1000)
         db.session.commit()
+        logger.info(
+            f"Ingested transcript {fireflies_meeting_id} for meeting {meeting_record.id}: "
+            f"{stored['sentences']} sentences, {payload_size} bytes received, "
+            f"{stored['bytes']} bytes stored ({stored['compressed_bytes']} compressed) "
+            f"in {meeting_record.transcript_ingest_ms} ms"
+        )
+        
+        EventBroker.publish(meeting_record.project_id, "meeting.transcribed", {
+            "id": meeting_record.id,
+            "meeting_id": meeting_record.meeting_id
+        })
         
         logger.info(f"Successfully processed transcript for meeting: {meeting_record.id}")
         return meeting_record, None, None
     except Exception as e:
         logger.exception(f"Error processing transcription for meeting ID {fireflies_meeting_id}")
+        db.session.rollback()
         return None, f"Error processing transcription: {str(e)}", 500
 
 
+@JobQueue.handler("process_transcription")
+def process_transcription_job(payload):
+    """
+    Job handler for webhook-triggered transcript processing.
+    
+    Args:
+        payload (dict): {"meeting_id": "<Fireflies transcript ID>", "event_type": "<webhook event>"}
+    """
+    meeting_record, error_message, status_code = process_transcription(payload["meeting_id"])
+    if error_message:
+        if status_code in (400, 404):
+            # e.g. a meeting never booked through this service; downloading it again won't help
+            raise PermanentJobError(error_message)
+        raise JobError(error_message)
+    
+    # The transcript is stored, drop any lazy-fetch backoff for it
+    TranscriptFetchCoordinator.reset(payload["meeting_id"])
+    if payload.get("event_type"):
+        WebhookLedger.mark_processed(payload["meeting_id"], payload["event_type"])
+
+
+@JobQueue.handler(TranscriptReconciler.JOB_KIND)
+def reconcile_transcripts_job(payload):
+    """
+    Periodic job backfilling transcripts whose webhook never arrived.
+    
+    Schedules the next run itself, even if this one failed.
+    """
+    try:
+        # Finish well before the visibility timeout lets another worker claim this job
+        TranscriptReconciler.run_once(
+            process_transcription,
+            max_seconds=current_app.config['JOB_VISIBILITY_TIMEOUT'] / 2
+        )
+    finally:
+        TranscriptReconciler.schedule()
+
+
 @meetings_bp.route("/webhooks/meetings", methods=["POST"])
 def fireflies_webhook():
     """Receive webhook notifications from Fireflies.ai."""
@@ -149,7 +453,6 @@ def fireflies_webhook():
         # signature = request.headers.get("X-Hub-Signature", "")
         # if not WebhookHandler.verify_signature(request.data, signature):
         #     return jsonify({"error": "Invalid signature"}), 403
-        print(request.json)
         data = request.json
         if not data:
             return jsonify({"error": "Invalid JSON payload"}), 400
@@ -163,13 +466,21 @@ def fireflies_webhook():
             if not fireflies_meeting_id:
                 return jsonify({"error": "Missing meetingId"}), 400
                 
-            # Process the transcription
-            meeting_record, error_message, status_code = process_transcription(fireflies_meeting_id)
+            # Persist the event and let the job workers fetch the transcript; redeliveries
+            # of an event that is queued or already processed are acknowledged without work
+            event, job, duplicate = WebhookLedger.accept(
+                fireflies_meeting_id,
+                event_type,
+                lambda: JobQueue.enqueue(
+                    "process_transcription",
+                    {"meeting_id": fireflies_meeting_id, "event_type": event_type},
+                    dedupe_key=f"process_transcription:{fireflies_meeting_id}"
+                )
+            )
+            if duplicate:
+                return jsonify({"status": "duplicate", "event_status": event.status}), 200
             
-            if error_message:
-                return jsonify({"error": error_message}), status_code
-                
-            return "OK", 200
+            return jsonify({"status": "queued", "job_id": job.id}), 202
         
         # Acknowledge other event types without processing them
         return "OK", 200
@@ -178,6 +489,125 @@ def fireflies_webhook():
         return jsonify({"error": "Internal server error"}), 500
 
 
+@meetings_bp.route("/projects/<project_id>/meetings/search", methods=["GET"])
+def search_meetings(project_id):
+    """
+    GET: Full-text search across a project's transcripts, best matches first
+    
+    Path parameters:
+    - project_id: Project ID to search in
+    
+    Query parameters:
+    - q: Search query
+    - limit: Page size (default MEETINGS_PAGE_SIZE, capped at MEETINGS_MAX_PAGE_SIZE)
+    - offset: Number of ranked results to skip
+    
+    Returns:
+    - {"results": [{"meeting": {...}, "rank": float, "snippet": str}], "total": int, "next_offset": int or null}
+      Matched terms in snippets are wrapped in <mark></mark>.
+    """
+    try:
+        query = (request.args.get("q") or "").strip()
+        if not query:
+            return jsonify({"error": "Missing required parameter: q"}), 400
+        
+        if not TranscriptSearchService.is_supported():
+            return jsonify({"error": "Full-text search is not supported by the configured database"}), 501
+        
+        limit = request.args.get("limit", default=current_app.config['MEETINGS_PAGE_SIZE'], type=int)
+        limit = max(1, min(limit, current_app.config['MEETINGS_MAX_PAGE_SIZE']))
+        offset = max(0, request.args.get("offset", default=0, type=int))
+        
+        matches, total = TranscriptSearchService.search(project_id, query, limit, offset)
+        
+        # Load the matched meetings (without transcripts) in one query
+        meeting_pks = [match["meeting_pk"] for match in matches]
+        meetings = {
+            meeting.id: meeting
+            for meeting in Meeting.query.options(
+                load_only(*[getattr(Meeting, name) for name in Meeting.DEFAULT_LIST_FIELDS])
+            ).filter(Meeting.id.in_(meeting_pks)).all()
+        } if meeting_pks else {}
+        
+        results = [
+            {
+                "meeting": meetings[match["meeting_pk"]].to_dict(Meeting.DEFAULT_LIST_FIELDS),
+                "rank": match["rank"],
+                "snippet": match["snippet"]
+            }
+            for match in matches if match["meeting_pk"] in meetings
+        ]
+        
+        return jsonify({
+            "results": results,
+            "total": total,
+            "next_offset": offset + limit if offset + limit < total else None
+        }), 200
+    except Exception as e:
+        logger.exception("Error searching meetings")
+        return jsonify({"error": "Internal server error"}), 500
+
+
+def _find_project_meeting(project_id, meeting_id):
+    """
+    Looks up a project's meeting by Fireflies meeting ID or internal database ID.
+    
+    Returns:
+        Meeting: The meeting or None if not found
+    """
+    # Try to find by Fireflies meeting ID first, filtered by project
+    meeting_record = Meeting.query.filter(
+        Meeting.meeting_id == meeting_id,
+        Meeting.project_id == project_id
+    ).first()
+    
+    # If not found, try looking up by internal database ID (if meeting_id is numeric)
+    if not meeting_record and meeting_id.isdigit():
+        meeting_record = Meeting.query.filter(
+            Meeting.id == int(meeting_id),
+            Meeting.project_id == project_id
+        ).first()
+    
+    return meeting_record
+
+
+def _fetch_missing_transcript(meeting_record, meeting_id):
+    """
+    Fetches the transcript of a meeting that has none yet from Fireflies.
+    
+    Args:
+        meeting_record (Meeting): Meeting found by _find_project_meeting
+        meeting_id (str): ID the meeting was requested with
+        
+    Returns:
+        Meeting: The updated meeting, or the stored record if nothing was fetched
+    """
+    # If we have a meeting record but no transcription and it has a Fireflies meeting ID,
+    # try to fetch the transcription from Fireflies
+    fireflies_id = None
+    if (not meeting_record.has_transcription and meeting_record.meeting_id):
+        logger.info(f"Meeting {meeting_id} found but has no transcription. Fetching from Fireflies...")
+        fireflies_id = meeting_record.meeting_id
+    
+    # If we have a meeting record with no transcription and no Fireflies meeting ID,
+    # but it matches the provided meeting_id, try to fetch the transcription
+    elif (not meeting_record.has_transcription and not meeting_record.meeting_id 
+          and meeting_id != str(meeting_record.id)):
+        logger.info(f"Trying to use provided ID as Fireflies meeting ID: {meeting_id}")
+        fireflies_id = meeting_id
+    
+    if fireflies_id:
+        # Concurrent polls share one fetch; recent misses are served from the stored record
+        updated_meeting, fetch_status = TranscriptFetchCoordinator.fetch(fireflies_id, process_transcription)
+        
+        if updated_meeting:
+            return updated_meeting
+        logger.info(f"Transcript {fireflies_id} not fetched ({fetch_status}), returning stored record")
+        # Pick up a transcript stored by a concurrent fetch, if any
+        db.session.refresh(meeting_record)
+    return meeting_record
+
+
 @meetings_bp.route("/projects/<project_id>/meetings/<meeting_id>", methods=["GET"])
 def get_project_meeting(project_id, meeting_id):
     """
@@ -188,49 +618,125 @@ def get_project_meeting(project_id, meeting_id):
     - meeting_id: Meeting ID to retrieve
     """
     try:
-        # Try to find by Fireflies meeting ID first, filtered by project
-        meeting_record = Meeting.query.filter(
-            Meeting.meeting_id == meeting_id,
-            Meeting.project_id == project_id
-        ).first()
-        
-        # If not found, try looking up by internal database ID (if meeting_id is numeric)
-        if not meeting_record and meeting_id.isdigit():
-            meeting_record = Meeting.query.filter(
-                Meeting.id == int(meeting_id),
-                Meeting.project_id == project_id
-            ).first()
+        meeting_record = _find_project_meeting(project_id, meeting_id)
             
         if not meeting_record:
             return jsonify({"error": "Meeting not found"}), 404
         
-        # If we have a meeting record but no transcription and it has a Fireflies meeting ID,
-        # try to fetch the transcription from Fireflies
-        if (not meeting_record.transcription and meeting_record.meeting_id):
-            logger.info(f"Meeting {meeting_id} found but has no transcription. Fetching from Fireflies...")
-            updated_meeting, error_message, status_code = process_transcription(meeting_record.meeting_id)
-            
-            if updated_meeting:
-                meeting_record = updated_meeting
-            else:
-                logger.warning(f"Failed to fetch transcription from Fireflies: {error_message}")
-                # Continue with the existing record even if fetching failed
-        
-        # If we have a meeting record with no transcription and no Fireflies meeting ID,
-        # but it matches the provided meeting_id, try to fetch the transcription
-        elif (not meeting_record.transcription and not meeting_record.meeting_id 
-              and meeting_id != str(meeting_record.id)):
-            logger.info(f"Trying to use provided ID as Fireflies meeting ID: {meeting_id}")
-            updated_meeting, error_message, status_code = process_transcription(meeting_id)
-            
-            if updated_meeting:
-                meeting_record = updated_meeting
-            else:
-                logger.warning(f"Failed to fetch transcription using provided ID: {error_message}")
-                # Continue with the existing record even if fetching failed
+        meeting_record = _fetch_missing_transcript(meeting_record, meeting_id)
+        
+        # Validated from the row version, so unchanged transcripts are never decompressed
+        etag = HttpCache.etag(meeting_record.id, meeting_record.updated_at, meeting_record.has_transcription)
+        cache_control = HttpCache.immutable() if meeting_record.has_transcription else HttpCache.REVALIDATE
+        not_modified = HttpCache.not_modified(etag, meeting_record.updated_at, cache_control)
+        if not_modified:
+            return not_modified
             
         # Return meeting data
-        return jsonify(meeting_record.to_dict()), 200
+        return HttpCache.apply(jsonify(meeting_record.to_dict()), etag, meeting_record.updated_at, cache_control), 200
     except Exception as e:
         logger.exception("Error retrieving meeting")
-        return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@meetings_bp.route("/projects/<project_id>/meetings/<meeting_id>/transcript", methods=["GET"])
+def download_transcript(project_id, meeting_id):
+    """
+    Download a meeting's transcript, streamed from the database.
+    
+    Path parameters:
+    - project_id: Project ID
+    - meeting_id: Fireflies meeting ID or internal meeting ID
+    
+    Query parameters:
+    - format: text (default, "speaker: text" lines), ndjson (one sentence object per line) or vtt (WebVTT)
+    
+    Full downloads are compressed with zstd or gzip when the client accepts it.
+    Range requests (optionally with If-Range) return 206 with the requested
+    bytes of the uncompressed body, so interrupted downloads can be resumed.
+    """
+    try:
+        fmt = request.args.get("format", "text")
+        if fmt not in TranscriptExport.FORMATS:
+            return jsonify({"error": f"Unsupported format: {fmt}"}), 400
+        
+        meeting_record = _find_project_meeting(project_id, meeting_id)
+        if not meeting_record:
+            return jsonify({"error": "Meeting not found"}), 404
+        
+        meeting_record = _fetch_missing_transcript(meeting_record, meeting_id)
+        if not meeting_record.has_transcription:
+            return jsonify({"error": "Transcript not available yet"}), 404
+        
+        # Ranges address the uncompressed representation, so they are never compressed
+        range_requested = "Range" in request.headers
+        encoding = None if range_requested else request.accept_encodings.best_match(TranscriptExport.encodings())
+        
+        body = TranscriptExport.render(meeting_record, fmt)
+        if encoding:
+            body = TranscriptExport.compress(body, encoding)
+        response = Response(stream_with_context(body), status=200, content_type=TranscriptExport.FORMATS[fmt])
+        response.vary.add("Accept-Encoding")
+        
+        # Strong validator of the stored transcript in this format and coding
+        etag = HttpCache.etag(meeting_record.id, meeting_record.updated_at, meeting_record.transcript_size, fmt, encoding)
+        HttpCache.apply(response, etag, meeting_record.updated_at, HttpCache.immutable())
+        if encoding:
+            response.content_encoding = encoding
+            return response.make_conditional(request)
+        
+        # Only measure formats whose size isn't stored when a range actually needs it
+        complete_length = None
+        if range_requested or fmt == "text":
+            complete_length = TranscriptExport.content_length(meeting_record, fmt)
+            response.content_length = complete_length
+        try:
+            return response.make_conditional(request, accept_ranges=True, complete_length=complete_length)
+        except RequestedRangeNotSatisfiable:
+            return jsonify({"error": "Requested range not satisfiable"}), 416, {"Content-Range": f"bytes */{complete_length}"}
+    except Exception as e:
+        logger.exception("Error downloading transcript")
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@meetings_bp.route("/projects/<project_id>/meetings/<meeting_id>/sentences", methods=["GET"])
+def get_meeting_sentences(project_id, meeting_id):
+    """
+    Get a range of transcript sentences without loading the whole transcript.
+    
+    Path parameters:
+    - project_id: Project ID
+    - meeting_id: Fireflies meeting ID or internal meeting ID
+    
+    Query parameters:
+    - start: First sentence index, inclusive (default 0)
+    - end: Last sentence index, exclusive (default start + TRANSCRIPT_MAX_SENTENCE_RANGE)
+    
+    Returns:
+    - {"meeting_id": ..., "start": int, "end": int, "total": int, "sentences": [...]}
+    """
+    try:
+        max_range = current_app.config['TRANSCRIPT_MAX_SENTENCE_RANGE']
+        start = request.args.get("start", default=0, type=int)
+        end = request.args.get("end", default=start + max_range, type=int)
+        if start < 0 or end < start:
+            return jsonify({"error": "Invalid sentence range"}), 400
+        if end - start > max_range:
+            return jsonify({"error": f"Sentence range is limited to {max_range} sentences"}), 400
+        
+        meeting_record = _find_project_meeting(project_id, meeting_id)
+        if not meeting_record:
+            return jsonify({"error": "Meeting not found"}), 404
+        
+        sentences = TranscriptStore.get_sentence_range(meeting_record, start, end)
+        
+        return jsonify({
+            "meeting_id": meeting_record.id,
+            "start": start,
+            "end": start + len(sentences),
+            "total": meeting_record.sentence_count,
+            "sentences": sentences
+        }), 200
+    except Exception as e:
+        logger.exception("Error retrieving meeting sentences")
+        return jsonify({"error": "Internal server error"}), 500
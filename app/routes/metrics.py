@@ -0,0 +1,22 @@
+"""
+Metrics routes for the Fireflies Transcription Service.
+This module exposes request, upstream and database pool metrics to Prometheus.
+"""
+
+from flask import Blueprint, Response, current_app
+from app.utils.metrics import Metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    GET: Prometheus metrics in the text exposition format
+    
+    Aggregated over all worker processes when PROMETHEUS_MULTIPROC_DIR is set.
+    """
+    if not current_app.config['METRICS_ENABLED']:
+        return Response("Metrics are disabled\n", status=404, mimetype="text/plain")
+    body, content_type = Metrics.render()
+    return Response(body, status=200, content_type=content_type)
@@ -0,0 +1,59 @@
+"""
+Profile routes for the Fireflies Transcription Service.
+This module serves the request profiles written by RequestProfiler. It is only
+registered when PROFILER_ENABLED is set, and profiles contain SQL parameters,
+so every request must carry PROFILER_TOKEN in PROFILER_HEADER.
+"""
+
+from flask import Blueprint, Response, current_app, request, jsonify
+from app.utils.profiler import RequestProfiler
+
+profiles_bp = Blueprint('profiles', __name__, url_prefix='/profiles')
+
+
+@profiles_bp.before_request
+def require_token():
+    """Rejects requests without the profiler token; without a token configured only DEBUG allows access."""
+    config = current_app.config
+    if not config['PROFILER_TOKEN'] and not config['DEBUG']:
+        return jsonify({"error": "Set PROFILER_TOKEN to view profiles"}), 403
+    if not RequestProfiler.authorized(request.headers.get(config['PROFILER_HEADER']), config):
+        return jsonify({"error": f"Missing or invalid {config['PROFILER_HEADER']} header"}), 403
+
+
+@profiles_bp.route('', methods=['GET'])
+def list_profiles():
+    """
+    GET: Summaries of the stored profiles, newest first
+    
+    Query parameters:
+        limit (int, optional): Maximum number of profiles (default 50)
+    """
+    limit = request.args.get('limit', default=50, type=int)
+    return jsonify({"profiles": RequestProfiler.list_profiles(limit=max(1, limit))}), 200
+
+
+@profiles_bp.route('/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """
+    GET: A stored profile with its SQL statements, N+1 warnings and stack samples
+    """
+    profile = RequestProfiler.load(profile_id)
+    if profile is None:
+        return jsonify({"error": "Profile not found"}), 404
+    return jsonify(profile), 200
+
+
+@profiles_bp.route('/<profile_id>/folded', methods=['GET'])
+def get_profile_folded(profile_id):
+    """
+    GET: The stack samples of a profile in collapsed stack format
+    
+    One "frame;frame;frame count" line per stack, as read by flamegraph.pl
+    and speedscope.
+    """
+    profile = RequestProfiler.load(profile_id)
+    if profile is None:
+        return jsonify({"error": "Profile not found"}), 404
+    lines = [f"{stack['stack']} {stack['count']}" for stack in profile["profile"]["stacks"]]
+    return Response("\n".join(lines) + "\n", status=200, mimetype="text/plain")
@@ -3,11 +3,13 @@ Project routes for the Fireflies Transcription Service.
 This module contains routes for accessing project data from the external service.
 """
 
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, Response, jsonify, current_app, request, stream_with_context
+from app.services.event_broker import EventBroker
 from app.services.project_brief_service import ProjectBriefService
 from app.models import Project, db
+from app.utils.http_cache import HttpCache
+from datetime import datetime
 import logging
-import json
 
 logger = logging.getLogger(__name__)
 projects_bp = Blueprint('projects', __name__)
@@ -30,18 +32,30 @@ def get_project(project_id):
         if not project_data:
             return jsonify({"error": "Failed to retrieve project data"}), 404
         
-        # If this project doesn't have validation data yet, generate it if enabled
+        # Validation runs in the job queue; report it as pending until the result is stored
         if current_app.config.get('ENABLE_BRIEF_VALIDATION', False) and current_app.config.get('OPENAI_API_KEY'):
-            if 'validation' not in project_data or not project_data.get('validation'):
-                # Only validate if we have requirements
-                if 'requirements' in project_data and project_data.get('requirements'):
-                    logger.info(f"Generating validation for project {project_id}")
-                    validation_data = ProjectBriefService.validate_project_brief(project_id)
-                    if validation_data and not isinstance(validation_data, dict) or "error" not in validation_data:
-                        project_data['validation'] = validation_data
+            if project_data.get('requirements') and not ProjectBriefService.is_validation_current(project_data):
+                outcome = ProjectBriefService.request_validation(project_id)
+                if outcome and "status" in outcome:
+                    project_data['validation_status'] = outcome["status"]
+                    if outcome["status"] == "ready":
+                        project_data['validation'] = outcome["validation"]
+            
+        # The UI polls this endpoint; answer unchanged projects with 304 before serializing them
+        etag = HttpCache.etag(
+            project_id,
+            project_data.get('last_updated'),
+            project_data.get('validation_status'),
+            project_data.get('validation_hash'),
+            project_data.get('validation_prompt_version')
+        )
+        last_modified = datetime.fromisoformat(project_data['last_updated']) if project_data.get('last_updated') else None
+        not_modified = HttpCache.not_modified(etag, last_modified)
+        if not_modified:
+            return not_modified
             
         # Return the project data (should contain id, requirements, questions, validation fields)
-        return jsonify(project_data), 200
+        return HttpCache.apply(jsonify(project_data), etag, last_modified), 200
             
     except Exception as e:
         logger.exception(f"Error retrieving project data for project ID {project_id}")
@@ -51,13 +65,20 @@ def get_project(project_id):
 @projects_bp.route("/projects/<project_id>/validate", methods=["POST"])
 def validate_project(project_id):
     """
-    POST: Force validation of a project brief using OpenAI
+    POST: Validate a project brief using OpenAI
     
     Path parameters:
     - project_id: Project ID to validate
     
+    Query parameters:
+    - force: "true" to validate again even if the brief content is unchanged
+    - stream: "true" to validate within the request and stream progress as
+      Server-Sent Events (progress, delta, result, error); reports the job ID
+      instead if a validation job is already queued or running. Counts towards
+      EVENTS_MAX_STREAMS, beyond which it is answered with 503 and Retry-After
+    
     Returns:
-    - JSON with validation results
+    - JSON with validation results, or 202 with the pending job ID
     """
     try:
         # Check if validation is enabled
@@ -85,18 +106,60 @@ def validate_project(project_id):
         if not project.requirements:
             return jsonify({"error": "Project has no requirements to validate"}), 400
         
-        # Validate the brief regardless of cached validation
-        validation_result = ProjectBriefService.validate_project_brief(project_id)
+        # Results cached for identical content are reused unless ?force=true
+        force = request.args.get('force', 'false').lower() == 'true'
+        
+        if request.args.get('stream', 'false').lower() == 'true':
+            return _stream_validation(project_id, force)
+        
+        outcome = ProjectBriefService.request_validation(project_id, force=force)
         
-        if not validation_result:
+        if not outcome:
             return jsonify({"error": "Failed to validate project brief"}), 500
             
-        if isinstance(validation_result, dict) and "error" in validation_result:
-            return jsonify(validation_result), 500
+        if "error" in outcome:
+            return jsonify(outcome), 500
+            
+        if outcome["status"] == "pending":
+            return jsonify(outcome), 202
+            
+        if outcome["status"] == "failed":
+            return jsonify({"error": "Last validation attempt failed, retry with ?force=true"}), 502
             
         # Return the validation results
-        return jsonify({"validation": validation_result}), 200
+        return jsonify({"validation": outcome["validation"]}), 200
             
     except Exception as e:
         logger.exception(f"Error validating project brief for project ID {project_id}")
-        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
\ No newline at end of file
+        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+
+
+def _stream_validation(project_id, force):
+    """Runs a validation in the request and streams its events as Server-Sent Events."""
+    # The stream holds a worker thread like an event stream, so it takes one of the same slots
+    slot = EventBroker.subscribe(project_id, limit=current_app.config['EVENTS_MAX_STREAMS'])
+    if slot is None:
+        retry_after = current_app.config['EVENTS_RETRY_AFTER']
+        return jsonify({"error": "Too many streams, retry later or validate without ?stream=true"}), 503, {"Retry-After": str(retry_after)}
+    
+    def release():
+        EventBroker.unsubscribe(project_id, slot)
+    
+    def stream():
+        try:
+            for event, data in ProjectBriefService.stream_validation(project_id, force=force):
+                yield f"event: {event}\ndata: {current_app.json.dumps(data)}\n\n"
+        finally:
+            release()
+    
+    try:
+        response = Response(
+            stream_with_context(stream()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    except Exception:
+        release()
+        raise
+    response.call_on_close(release)
+    return response
@@ -5,6 +5,8 @@ This module contains routes that should ONLY be enabled in the testing environme
 
 from flask import Blueprint, request, jsonify
 from app.models import db, Meeting
+from app.services.transcript_store import TranscriptStore
+from app.utils.meet_link import MeetLink
 
 test_utils_bp = Blueprint('test_utils', __name__, url_prefix='/test-utils')
 
@@ -41,7 +43,7 @@ def update_meeting(meeting_id):
             meeting.meeting_id = data['meeting_id']
             
         if 'transcription' in data:
-            meeting.transcription = data['transcription']
+            TranscriptStore.save_text(meeting, data['transcription'])
             
         if 'meeting_url' in data:
             meeting.meeting_url = data['meeting_url']
@@ -62,14 +64,16 @@ def inject_transcript():
         if not data or 'meeting_url' not in data or 'meeting_id' not in data or 'transcription' not in data:
             return jsonify({"error": "Missing required fields"}), 400
             
-        # Find meeting by URL
-        meeting = Meeting.query.filter(Meeting.meeting_url == data['meeting_url']).first()
+        # Find the most recent meeting booked on this Meet code
+        meeting = Meeting.query.filter(
+            Meeting.meet_code == MeetLink.normalize_code(data['meeting_url'])
+        ).order_by(Meeting.meeting_datetime.desc()).first()
         if not meeting:
             return jsonify({"error": "Meeting not found with provided URL"}), 404
             
         # Update the meeting with test data
         meeting.meeting_id = data['meeting_id']
-        meeting.transcription = data['transcription']
+        TranscriptStore.save_text(meeting, data['transcription'])
         db.session.commit()
         
         return jsonify({
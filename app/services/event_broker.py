@@ -0,0 +1,141 @@
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from flask import current_app
+from sqlalchemy import text
+from app.models import db
+
+logger = logging.getLogger(__name__)
+
+
+class EventBroker:
+    """Pub/sub fan-out of project events to Server-Sent Events subscribers.
+
+    Subscribers are in-process queues keyed by project ID. With a single
+    process (or SQLite) events are delivered directly; on Postgres they are
+    sent with NOTIFY and every process delivers them from a LISTEN thread, so
+    events published by any gunicorn worker or job worker reach all viewers.
+    """
+
+    CHANNEL = "meeting_events"
+
+    _subscribers = {}
+    _lock = threading.Lock()
+    _listener = None
+
+    @staticmethod
+    def _use_postgres():
+        """Whether events are distributed through Postgres LISTEN/NOTIFY."""
+        backend = current_app.config['EVENTS_BACKEND']
+        if backend == "auto":
+            return db.engine.dialect.name == "postgresql"
+        return backend == "postgres"
+
+    @classmethod
+    def subscribe(cls, project_id, limit=None):
+        """
+        Registers a subscriber for a project's events.
+
+        Args:
+            project_id (str): Project to receive events for
+            limit (int, optional): Maximum number of subscribers in this process
+
+        Returns:
+            queue.Queue: Queue receiving event dicts, or None if the limit is reached
+        """
+        if cls._use_postgres():
+            cls._ensure_listener(current_app._get_current_object())
+
+        subscription = queue.Queue(maxsize=current_app.config['EVENTS_QUEUE_SIZE'])
+        with cls._lock:
+            if limit is not None and sum(len(subscribers) for subscribers in cls._subscribers.values()) >= limit:
+                return None
+            cls._subscribers.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    @classmethod
+    def unsubscribe(cls, project_id, subscription):
+        """Removes a subscriber registered with subscribe()."""
+        with cls._lock:
+            subscribers = cls._subscribers.get(project_id)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del cls._subscribers[project_id]
+
+    @classmethod
+    def publish(cls, project_id, event_type, data):
+        """
+        Publishes an event to all subscribers of a project.
+
+        Call after the related database changes are committed.
+
+        Args:
+            project_id (str): Project the event belongs to
+            event_type (str): Event name, e.g. "meeting.transcribed"
+            data (dict): JSON-serializable event payload
+        """
+        event = {"project_id": project_id, "type": event_type, "data": data}
+        try:
+            if cls._use_postgres():
+                with db.engine.begin() as conn:
+                    conn.execute(text("SELECT pg_notify(:channel, :payload)"),
+                                 {"channel": cls.CHANNEL, "payload": json.dumps(event)})
+            else:
+                cls._deliver(event)
+        except Exception as e:
+            logger.error(f"Error publishing {event_type} event for project {project_id}: {str(e)}")
+
+    @classmethod
+    def _deliver(cls, event):
+        """Pushes an event onto the queues of local subscribers."""
+        with cls._lock:
+            subscribers = list(cls._subscribers.get(event["project_id"], ()))
+        for subscription in subscribers:
+            try:
+                subscription.put_nowait(event)
+            except queue.Full:
+                logger.warning(f"Dropping event for slow subscriber of project {event['project_id']}")
+
+    @classmethod
+    def _ensure_listener(cls, app):
+        """Starts the process-wide LISTEN thread on first use."""
+        with cls._lock:
+            if cls._listener is None or not cls._listener.is_alive():
+                cls._listener = threading.Thread(
+                    target=cls._listen, args=(app,), name="event-listener", daemon=True
+                )
+                cls._listener.start()
+
+    @classmethod
+    def _listen(cls, app):
+        """LISTEN loop delivering Postgres notifications to local subscribers; reconnects on errors."""
+        while True:
+            try:
+                with app.app_context():
+                    raw_connection = db.engine.raw_connection()
+                # Keep this connection out of the pool, it is dedicated to LISTEN
+                raw_connection.detach()
+                connection = raw_connection.driver_connection
+                connection.autocommit = True
+                connection.cursor().execute(f"LISTEN {cls.CHANNEL}")
+                logger.info(f"Listening for events on channel {cls.CHANNEL}")
+
+                if callable(getattr(connection, "notifies", None)):
+                    # psycopg 3
+                    for notify in connection.notifies():
+                        cls._deliver(json.loads(notify.payload))
+                else:
+                    # psycopg2
+                    while True:
+                        if select.select([connection], [], [], 5) == ([], [], []):
+                            continue
+                        connection.poll()
+                        while connection.notifies:
+                            cls._deliver(json.loads(connection.notifies.pop(0).payload))
+            except Exception as e:
+                logger.error(f"Event listener error, reconnecting: {str(e)}")
+                time.sleep(5)
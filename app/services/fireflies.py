@@ -1,9 +1,136 @@
 import requests
+from collections import deque
 from flask import current_app
+from app.utils.http_client import HttpClient
 import logging
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 logger = logging.getLogger(__name__)
 
+SENTENCE_PREFIX = "data.transcript.sentences.item"
+
+
+class _CountingReader:
+    """File-like wrapper counting the bytes read from a response body."""
+    
+    def __init__(self, raw):
+        self._raw = raw
+        self.bytes_read = 0
+    
+    def read(self, size=-1):
+        data = self._raw.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+class TranscriptStream:
+    """
+    A Fireflies transcript parsed incrementally from a streamed GraphQL response.
+    
+    Opening the stream reads the response up to the first sentence, which
+    sets title, meeting_link, found and error. sentences() then parses the
+    remaining sentences one at a time, so the transcript is never held in
+    memory as a whole. Without ijson installed the response is parsed in one
+    piece instead, with the same interface.
+    """
+    
+    def __init__(self, response):
+        self._response = response
+        self._reader = None
+        self._pending = deque()
+        self.title = None
+        self.meeting_link = None
+        self.found = False
+        self.error = None
+        self._items = self._parse_incrementally() if ijson else self._parse_loaded()
+        self._read_header()
+    
+    def _parse_incrementally(self):
+        """Yields ("found"|"field"|"error"|"sentence", value) items from ijson parse events."""
+        self._response.raw.decode_content = True
+        self._reader = _CountingReader(self._response.raw)
+        sentence = None
+        for prefix, event, value in ijson.parse(self._reader, use_float=True):
+            if prefix == SENTENCE_PREFIX:
+                if event == "start_map":
+                    sentence = {}
+                elif event == "end_map":
+                    yield "sentence", sentence
+                    sentence = None
+            elif sentence is not None:
+                # Sentence fields are scalars, their prefix is SENTENCE_PREFIX.<field>
+                sentence[prefix[len(SENTENCE_PREFIX) + 1:]] = value
+            elif prefix == "data.transcript" and event == "start_map":
+                yield "found", True
+            elif prefix in ("data.transcript.title", "data.transcript.meeting_link"):
+                yield "field", (prefix.rsplit(".", 1)[1], value)
+            elif prefix == "errors.item.message":
+                yield "error", value
+    
+    def _parse_loaded(self):
+        """Same items as _parse_incrementally, from the fully loaded response."""
+        data = self._response.json()
+        for error in data.get("errors") or []:
+            yield "error", error.get("message", "Unknown GraphQL error")
+        transcript = (data.get("data") or {}).get("transcript")
+        if transcript is None:
+            return
+        yield "found", True
+        yield "field", ("title", transcript.get("title"))
+        yield "field", ("meeting_link", transcript.get("meeting_link"))
+        for sentence in transcript.get("sentences") or []:
+            yield "sentence", sentence
+    
+    def _read_header(self):
+        """Consumes items until the meeting link and the first sentence were seen."""
+        for kind, value in self._items:
+            if kind == "found":
+                self.found = True
+            elif kind == "field":
+                setattr(self, value[0], value[1])
+            elif kind == "error":
+                self.error = self.error or value
+            elif kind == "sentence":
+                # Buffered until the meeting link arrives, in case Fireflies sends it last
+                self._pending.append(value)
+                if self.meeting_link:
+                    return
+    
+    def sentences(self):
+        """
+        Yields the transcript's sentences in order.
+        
+        Yields:
+            dict: Sentence with text, speaker_name, start_time and end_time
+        """
+        while self._pending:
+            yield self._pending.popleft()
+        for kind, value in self._items:
+            if kind == "sentence":
+                yield value
+    
+    @property
+    def bytes_read(self):
+        """Size of the response body read so far."""
+        if self._reader is None:
+            return len(self._response.content)
+        return self._reader.bytes_read
+    
+    def close(self):
+        """Releases the underlying connection."""
+        self._response.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
 class FirefliesService:
     """Service for interacting with the Fireflies.ai GraphQL API."""
     
@@ -45,10 +172,12 @@ class FirefliesService:
         }
         
         try:
-            resp = requests.post(
+            resp = HttpClient.post(
                 current_app.config['FIREFLIES_API_URL'], 
                 json={"query": query, "variables": variables}, 
-                headers=headers
+                headers=headers,
+                upstream="fireflies",
+                operation="add_bot"
             )
             resp.raise_for_status()
             data = resp.json()
@@ -72,12 +201,43 @@ class FirefliesService:
         """
         Retrieves transcript from Fireflies.ai by meeting ID.
         
+        Loads every sentence into memory; ingestion uses stream_transcript_by_id.
+        
         Args:
             meeting_id (str): Fireflies transcript ID
             
         Returns:
             dict: Transcript data or None if error
         """
+        stream = FirefliesService.stream_transcript_by_id(meeting_id)
+        if not stream:
+            return None
+        try:
+            with stream:
+                return {
+                    "title": stream.title,
+                    "meeting_link": stream.meeting_link,
+                    "sentences": list(stream.sentences())
+                }
+        except Exception as e:
+            logger.error(f"Error getting transcript: {str(e)}")
+            return None
+    
+    @staticmethod
+    def stream_transcript_by_id(meeting_id):
+        """
+        Opens a transcript from Fireflies.ai for incremental reading.
+        
+        The response body is parsed while it is downloaded: the title and
+        meeting link are available on return, the sentences are parsed one at
+        a time by TranscriptStream.sentences(). The caller closes the stream.
+        
+        Args:
+            meeting_id (str): Fireflies transcript ID
+            
+        Returns:
+            TranscriptStream: Open transcript or None if error
+        """
         api_key = current_app.config['FIREFLIES_API_KEY']
         if not api_key:
             logger.error("Fireflies API key not configured")
@@ -88,6 +248,8 @@ class FirefliesService:
             "Content-Type": "application/json"
         }
         
+        # meeting_link is selected before sentences: GraphQL returns fields in
+        # selection order, so the meeting can be matched before the sentences arrive
         query = """
             query GetTranscript($id: String!) {
               transcript(id: $id) {
@@ -96,10 +258,8 @@ class FirefliesService:
                 sentences { 
                   text
                   speaker_name
-                }
-                summary {
-                  overview
-                  short_summary
+                  start_time
+                  end_time
                 }
               }
             }
@@ -107,26 +267,109 @@ class FirefliesService:
         
         variables = {"id": meeting_id}
         
+        resp = None
         try:
-            resp = requests.post(
+            # Read-only GraphQL query, safe to retry
+            resp = HttpClient.post(
                 current_app.config['FIREFLIES_API_URL'], 
                 json={"query": query, "variables": variables}, 
-                headers=headers
+                headers=headers,
+                idempotent=True,
+                stream=True,
+                upstream="fireflies",
+                operation="transcript"
             )
-            print({"query": query, "variables": variables})
             resp.raise_for_status()
-            data = resp.json()
+            stream = TranscriptStream(resp)
             
             # Check for GraphQL errors
-            if "errors" in data:
-                error_msg = data["errors"][0].get("message", "Unknown GraphQL error")
-                logger.error(f"GraphQL error: {error_msg}")
+            if stream.error:
+                logger.error(f"GraphQL error: {stream.error}")
+                stream.close()
                 return None
-                
-            return data.get("data", {}).get("transcript")
+            if not stream.found:
+                stream.close()
+                return None
+            return stream
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error getting transcript: {str(e)}")
+            if resp is not None:
+                resp.close()
             return None
         except Exception as e:
             logger.error(f"Error getting transcript: {str(e)}")
+            if resp is not None:
+                resp.close()
+            return None
+    
+    @staticmethod
+    def list_transcripts(from_date=None, page_size=50, max_pages=20):
+        """
+        Lists recent transcripts, newest first.
+        
+        Args:
+            from_date (datetime, optional): Only transcripts on or after this time (UTC)
+            page_size (int, optional): Transcripts per request (Fireflies allows at most 50)
+            max_pages (int, optional): Upper bound on requests per call
+            
+        Returns:
+            list: Dicts with id, title, date and meeting_link, or None if error
+        """
+        api_key = current_app.config['FIREFLIES_API_KEY']
+        if not api_key:
+            logger.error("Fireflies API key not configured")
+            return None
+            
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        query = """
+            query RecentTranscripts($fromDate: DateTime, $limit: Int, $skip: Int) {
+              transcripts(fromDate: $fromDate, limit: $limit, skip: $skip) {
+                id
+                title
+                date
+                meeting_link
+              }
+            }
+        """
+        
+        transcripts = []
+        try:
+            for page in range(max_pages):
+                variables = {
+                    "fromDate": from_date.strftime("%Y-%m-%dT%H:%M:%S.000Z") if from_date else None,
+                    "limit": page_size,
+                    "skip": page * page_size
+                }
+                # Read-only GraphQL query, safe to retry
+                resp = HttpClient.post(
+                    current_app.config['FIREFLIES_API_URL'],
+                    json={"query": query, "variables": variables},
+                    headers=headers,
+                    idempotent=True,
+                    upstream="fireflies",
+                    operation="list_transcripts"
+                )
+                resp.raise_for_status()
+                data = resp.json()
+                
+                # Check for GraphQL errors
+                if "errors" in data:
+                    error_msg = data["errors"][0].get("message", "Unknown GraphQL error")
+                    logger.error(f"GraphQL error: {error_msg}")
+                    return None
+                
+                batch = (data.get("data") or {}).get("transcripts") or []
+                transcripts.extend(batch)
+                if len(batch) < page_size:
+                    break
+            return transcripts
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request error listing transcripts: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Error listing transcripts: {str(e)}")
             return None
@@ -0,0 +1,331 @@
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+from app.models import db, Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobError(Exception):
+    """Raised by job handlers to signal a failure that should be retried."""
+
+
+class PermanentJobError(JobError):
+    """Raised by job handlers to signal a failure that must not be retried."""
+
+
+class JobQueue:
+    """DB-backed durable job queue shared by all web and worker processes.
+
+    Completed jobs older than JOB_RETENTION_DAYS are deleted by idle workers
+    at most once per JOB_PRUNE_INTERVAL per process; failed jobs are kept
+    for inspection.
+    """
+
+    _handlers = {}
+    _failure_handlers = {}
+    _last_pruned = None
+    _prune_lock = threading.Lock()
+
+    @classmethod
+    def handler(cls, kind, on_failure=None):
+        """
+        Decorator registering a function as the handler for a job kind.
+
+        The handler receives the decoded payload dict and runs inside an
+        application context. Raising an exception marks the attempt as failed.
+
+        Args:
+            kind (str): Job kind the handler processes
+            on_failure (callable, optional): Called with (payload, error) once a
+                job of this kind failed for good, i.e. no retry will follow
+        """
+        def decorator(func):
+            cls._handlers[kind] = func
+            if on_failure:
+                cls._failure_handlers[kind] = on_failure
+            return func
+        return decorator
+
+    @staticmethod
+    def enqueue(kind, payload=None, delay=0, max_attempts=None, dedupe_key=None):
+        """
+        Persists a new job so that a worker can pick it up.
+
+        Args:
+            kind (str): Registered job kind
+            payload (dict, optional): JSON-serializable handler arguments
+            delay (float, optional): Seconds to wait before the job becomes available
+            max_attempts (int, optional): Overrides JOB_MAX_ATTEMPTS
+            dedupe_key (str, optional): If a queued or running job with this key
+                exists, it is returned instead of creating a new one
+
+        Returns:
+            Job: The stored (or existing) job
+        """
+        if dedupe_key:
+            existing = JobQueue.find_active(dedupe_key)
+            if existing:
+                return existing
+
+        job = Job(
+            kind=kind,
+            payload=json.dumps(payload or {}),
+            status='queued',
+            dedupe_key=dedupe_key,
+            attempts=0,
+            max_attempts=max_attempts or current_app.config['JOB_MAX_ATTEMPTS'],
+            available_at=datetime.utcnow() + timedelta(seconds=delay)
+        )
+        db.session.add(job)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request enqueued the same key first
+            db.session.rollback()
+            existing = JobQueue.find_active(dedupe_key) if dedupe_key else None
+            if existing:
+                return existing
+            raise
+        logger.info(f"Enqueued job {job.id} ({kind})")
+        return job
+
+    @staticmethod
+    def find_active(dedupe_key):
+        """Returns the queued or running job with the given dedupe key, if any."""
+        return Job.query.filter(
+            Job.dedupe_key == dedupe_key,
+            Job.status.in_(('queued', 'running'))
+        ).first()
+
+    @staticmethod
+    def _claimable(now):
+        """SQL condition matching jobs that are due or whose visibility timeout expired."""
+        return or_(
+            and_(Job.status == 'queued', Job.available_at <= now),
+            and_(Job.status == 'running', Job.locked_until < now)
+        )
+
+    @staticmethod
+    def claim(batch_size=10):
+        """
+        Atomically claims the next available job.
+
+        Candidates are read first and then claimed with a conditional UPDATE, so
+        concurrent workers never run the same job twice. On Postgres the
+        candidate read also uses SKIP LOCKED to avoid contending on the same rows.
+
+        Args:
+            batch_size (int, optional): Number of candidates to try per call
+
+        Returns:
+            Job: The claimed job or None if nothing is available
+        """
+        now = datetime.utcnow()
+        locked_until = now + timedelta(seconds=current_app.config['JOB_VISIBILITY_TIMEOUT'])
+
+        query = (
+            db.session.query(Job.id)
+            .filter(JobQueue._claimable(now))
+            .order_by(Job.available_at, Job.id)
+            .limit(batch_size)
+        )
+        if db.engine.dialect.name == 'postgresql':
+            query = query.with_for_update(skip_locked=True)
+        candidate_ids = [row[0] for row in query.all()]
+
+        for job_id in candidate_ids:
+            result = db.session.execute(
+                update(Job)
+                .where(Job.id == job_id, JobQueue._claimable(now))
+                .values(
+                    status='running',
+                    locked_until=locked_until,
+                    attempts=Job.attempts + 1,
+                    updated_at=now
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                db.session.commit()
+                return db.session.get(Job, job_id)
+
+        db.session.rollback()
+        return None
+
+    @staticmethod
+    def complete(job):
+        """Marks a claimed job as successfully processed."""
+        job.status = 'done'
+        job.locked_until = None
+        job.last_error = None
+        db.session.commit()
+
+    @classmethod
+    def prune_if_due(cls):
+        """
+        Deletes completed jobs past the retention window.
+
+        Runs at most once per JOB_PRUNE_INTERVAL in each process; failed jobs
+        are kept for inspection.
+
+        Returns:
+            int: Number of jobs deleted, 0 if pruning was not due or failed
+        """
+        interval = current_app.config['JOB_PRUNE_INTERVAL']
+        with cls._prune_lock:
+            now = time.monotonic()
+            if cls._last_pruned is not None and now - cls._last_pruned < interval:
+                return 0
+            cls._last_pruned = now
+
+        cutoff = datetime.utcnow() - timedelta(days=current_app.config['JOB_RETENTION_DAYS'])
+        try:
+            deleted = Job.query.filter(Job.status == 'done', Job.updated_at < cutoff).delete(synchronize_session=False)
+            db.session.commit()
+            if deleted:
+                logger.info(f"Pruned {deleted} completed jobs older than {cutoff.isoformat()}")
+            return deleted
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to prune completed jobs: {str(e)}")
+            return 0
+
+    @classmethod
+    def fail(cls, job, error, retry=True):
+        """
+        Records a failed attempt and schedules a retry with jittered backoff.
+
+        Runs the kind's on_failure callback when the job fails permanently.
+
+        Args:
+            job (Job): The claimed job
+            error (str): Error description stored on the job
+            retry (bool, optional): False to fail the job permanently
+        """
+        job.last_error = error
+        job.locked_until = None
+
+        if not retry or job.attempts >= job.max_attempts:
+            job.status = 'failed'
+            logger.error(f"Job {job.id} ({job.kind}) failed permanently after {job.attempts} attempts: {error}")
+        else:
+            base_delay = current_app.config['JOB_RETRY_BASE_DELAY']
+            delay = base_delay * (2 ** (job.attempts - 1)) * random.uniform(0.5, 1.5)
+            job.status = 'queued'
+            job.available_at = datetime.utcnow() + timedelta(seconds=delay)
+            logger.warning(f"Job {job.id} ({job.kind}) attempt {job.attempts} failed, retrying in {delay:.0f}s: {error}")
+        db.session.commit()
+
+        on_failure = cls._failure_handlers.get(job.kind)
+        if job.status == 'failed' and on_failure:
+            try:
+                on_failure(json.loads(job.payload or "{}"), error)
+            except Exception:
+                db.session.rollback()
+                logger.exception(f"Failure callback of job {job.id} ({job.kind}) raised")
+
+    @classmethod
+    def execute(cls, job):
+        """
+        Runs the handler for a claimed job and records the outcome.
+
+        Args:
+            job (Job): The claimed job
+
+        Returns:
+            bool: True if the handler succeeded, False otherwise
+        """
+        handler = cls._handlers.get(job.kind)
+        if not handler:
+            cls.fail(job, f"No handler registered for job kind: {job.kind}", retry=False)
+            return False
+
+        if job.attempts > job.max_attempts:
+            cls.fail(job, job.last_error or "Visibility timeout exceeded too many times", retry=False)
+            return False
+
+        try:
+            handler(json.loads(job.payload or "{}"))
+        except PermanentJobError as e:
+            db.session.rollback()
+            cls.fail(job, str(e), retry=False)
+            return False
+        except Exception as e:
+            db.session.rollback()
+            if not isinstance(e, JobError):
+                logger.exception(f"Unexpected error running job {job.id} ({job.kind})")
+            cls.fail(job, str(e))
+            return False
+
+        cls.complete(job)
+        return True
+
+
+class JobWorker:
+    """Pool of threads draining the job queue, embedded in the app or run standalone."""
+
+    def __init__(self, app, concurrency=None, poll_interval=None):
+        """
+        Args:
+            app (Flask): Application whose config and database the workers use
+            concurrency (int, optional): Number of worker threads (JOB_WORKER_CONCURRENCY)
+            poll_interval (float, optional): Idle sleep in seconds (JOB_POLL_INTERVAL)
+        """
+        self.app = app
+        self.concurrency = concurrency or app.config['JOB_WORKER_CONCURRENCY']
+        self.poll_interval = poll_interval or app.config['JOB_POLL_INTERVAL']
+        self.worker_id = uuid.uuid4().hex[:8]
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Starts the worker threads in the background."""
+        for i in range(self.concurrency):
+            thread = threading.Thread(
+                target=self._run,
+                name=f"job-worker-{self.worker_id}-{i}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started job worker {self.worker_id} with {self.concurrency} threads")
+
+    def stop(self, timeout=None):
+        """Signals the worker threads to exit and waits for running jobs to finish."""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_forever(self):
+        """Starts the worker threads and blocks until interrupted."""
+        self.start()
+        try:
+            while not self._stop_event.wait(1):
+                pass
+        except KeyboardInterrupt:
+            logger.info(f"Stopping job worker {self.worker_id}...")
+        finally:
+            self.stop()
+
+    def _run(self):
+        """Worker thread loop: claim, execute, repeat; sleep when the queue is empty."""
+        while not self._stop_event.is_set():
+            try:
+                with self.app.app_context():
+                    job = JobQueue.claim()
+                    if job:
+                        JobQueue.execute(job)
+                        continue
+                    JobQueue.prune_if_due()
+            except Exception:
+                logger.exception(f"Job worker {self.worker_id} loop error")
+            self._stop_event.wait(self.poll_interval)
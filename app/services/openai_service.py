@@ -1,93 +1,343 @@
-import requests
 from flask import current_app
+from app.utils.http_client import HttpClient
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from app.utils.brief_chunker import BriefChunker
 import logging
 import json
-import os
 
 logger = logging.getLogger(__name__)
 
+OPENAI_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+# Section statuses from the system prompt, ordered from worst to best
+STATUS_RANK = {"Missing": 0, "Partially Addressed": 1, "Fully Addressed": 2}
+
+# Error statuses worth another attempt besides 5xx
+RETRYABLE_STATUS_CODES = (408, 409, 429)
+
 class OpenAIService:
     """Service for interacting with OpenAI API."""
+
+    @staticmethod
+    def _build_request(project_data, system_prompt, reference_template, stream=False, part=None):
+        """
+        Builds the headers and payload of a brief validation request.
+        
+        Args:
+            part (tuple, optional): (index, total) when only a chunk of the brief is sent
+        
+        Returns:
+            tuple: (headers, payload) or None if the API key is not configured
+        """
+        # Get API key from config
+        api_key = current_app.config.get('OPENAI_API_KEY')
+        if not api_key:
+            logger.error("OpenAI API key not configured")
+            return None
+        
+        # Instead of using the library, make a direct API request
+        # This avoids potential version compatibility issues
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        }
+        
+        # Prepare user message with project brief and reference template
+        user_message = f"""
+        Here is the project brief to validate:
+        
+        {json.dumps(project_data, indent=2)}
+        
+        Here is the reference template:
+        
+        {reference_template}
+        """
+        
+        if part:
+            user_message += f"""
+        Note: this is part {part[0]} of {part[1]} of a larger brief. Only judge what this
+        part covers; report sections it does not mention as "Missing".
+        """
+        
+        # Prepare API request payload
+        payload = {
+            "model": current_app.config['OPENAI_MODEL'],
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message}
+            ],
+            "temperature": 0.1
+        }
+        if stream:
+            payload["stream"] = True
+        return headers, payload
+
+    @staticmethod
+    def _extract_json(content):
+        """
+        Parses the validation JSON from a model response.
+        
+        Args:
+            content (str): Full assistant message, optionally wrapping the JSON in a ```json block
+        
+        Returns:
+            dict: Validation results, or an error dict with the raw response
+        """
+        validation_json = content
+        try:
+            # Look for JSON content between triple backticks if present
+            if "```json" in validation_json and "```" in validation_json:
+                json_start = validation_json.find("```json") + 7
+                json_end = validation_json.rfind("```")
+                validation_json = validation_json[json_start:json_end].strip()
+            
+            # Parse the JSON content
+            return json.loads(validation_json)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse validation results: {e}")
+            # The model answered, so asking again is unlikely to help
+            return {"error": "Failed to parse validation results", "raw_response": validation_json, "retryable": False}
+
+    @staticmethod
+    def needs_chunking(project_data):
+        """Whether a brief's requirements are estimated to be too large for a single validation call.
+        
+        Only the requirements are split; the questions are sent with every part,
+        so they do not count towards the threshold.
+        """
+        requirements_tokens = BriefChunker.estimate_tokens(project_data.get("requirements"))
+        return requirements_tokens > current_app.config['VALIDATION_CHUNK_TOKEN_THRESHOLD']
     
     @staticmethod
     def validate_project_brief(project_data, system_prompt, reference_template):
         """
         Validates a project brief against a reference template using OpenAI.
         
+        Briefs above VALIDATION_CHUNK_TOKEN_THRESHOLD (estimated) are validated
+        in sections concurrently and the reports merged.
+        
         Args:
             project_data (dict): Project data to validate
             system_prompt (str): System prompt for OpenAI
             reference_template (str): Reference template to compare against
-            
+        
         Returns:
-            dict: Validation results from OpenAI
+            dict: Validation results from OpenAI, or {"error": str, "retryable": bool}
         """
+        if OpenAIService.needs_chunking(project_data):
+            outcome = None
+            for kind, data in OpenAIService._validate_in_chunks(project_data, system_prompt, reference_template):
+                outcome = data
+            return outcome
+        return OpenAIService._validate_single(project_data, system_prompt, reference_template)
+    
+    @staticmethod
+    def _validate_single(project_data, system_prompt, reference_template, part=None):
+        """Validates a brief (or one part of it) with a single chat completion."""
         try:
-            # Get API key from config
-            api_key = current_app.config.get('OPENAI_API_KEY')
-            if not api_key:
-                logger.error("OpenAI API key not configured")
+            request = OpenAIService._build_request(project_data, system_prompt, reference_template, part=part)
+            if not request:
                 return None
-
-            # Instead of using the library, make a direct API request
-            # This avoids potential version compatibility issues
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}"
-            }
-            
-            # Prepare user message with project brief and reference template
-            user_message = f"""
-            Here is the project brief to validate:
-            
-            {json.dumps(project_data, indent=2)}
-            
-            Here is the reference template:
-            
-            {reference_template}
-            """
-            
-            # Prepare API request payload
-            payload = {
-                "model": "gpt-4o",
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                "temperature": 0.1
-            }
+            headers, payload = request
             
             # Make API request
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
+            response = HttpClient.post(
+                OPENAI_CHAT_COMPLETIONS_URL,
                 headers=headers,
-                json=payload
+                json=payload,
+                upstream="openai",
+                operation="validate"
             )
             
             # Check for errors
             if response.status_code != 200:
                 logger.error(f"OpenAI API error: {response.status_code} - {response.text}")
-                return {"error": f"OpenAI API error: {response.status_code}"}
+                return {
+                    "error": f"OpenAI API error: {response.status_code}",
+                    # Other 4xx (e.g. invalid request or context length) fail the same way every time
+                    "retryable": response.status_code in RETRYABLE_STATUS_CODES or response.status_code >= 500
+                }
             
             # Parse response
             response_data = response.json()
-            validation_json = response_data['choices'][0]['message']['content']
-            
-            # Try to extract JSON from the response
-            try:
-                # Look for JSON content between triple backticks if present
-                if "```json" in validation_json and "```" in validation_json:
-                    json_start = validation_json.find("```json") + 7
-                    json_end = validation_json.rfind("```")
-                    validation_json = validation_json[json_start:json_end].strip()
-                
-                # Parse the JSON content
-                validation_results = json.loads(validation_json)
-                return validation_results
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse validation results: {e}")
-                return {"error": "Failed to parse validation results", "raw_response": validation_json}
-                
+            return OpenAIService._extract_json(response_data['choices'][0]['message']['content'])
+        
         except Exception as e:
             logger.error(f"Error validating project brief: {str(e)}")
-            return {"error": f"Error validating project brief: {str(e)}"}
\ No newline at end of file
+            return {"error": f"Error validating project brief: {str(e)}", "retryable": True}
+
+    @staticmethod
+    def stream_project_brief_validation(project_data, system_prompt, reference_template):
+        """
+        Validates a project brief like validate_project_brief, yielding output as it is generated.
+        
+        Reads the chat completion with stream=True and yields each content
+        delta as soon as OpenAI sends it; the JSON is parsed once the stream ends.
+        
+        Args:
+            project_data (dict): Project data to validate
+            system_prompt (str): System prompt for OpenAI
+            reference_template (str): Reference template to compare against
+        
+        Yields:
+            tuple: ("delta", str) for each chunk of model output (or ("chunk", dict)
+                per completed part of a chunked brief), then exactly one
+                ("result", dict) with the parsed validation or ("error", str)
+        """
+        if OpenAIService.needs_chunking(project_data):
+            # Parts complete out of order, so progress is reported per part instead of per token
+            for kind, data in OpenAIService._validate_in_chunks(project_data, system_prompt, reference_template):
+                yield kind, data["error"] if kind == "error" else data
+            return
+        
+        request = OpenAIService._build_request(project_data, system_prompt, reference_template, stream=True)
+        if not request:
+            yield "error", "OpenAI API key is not configured"
+            return
+        headers, payload = request
+        
+        try:
+            response = HttpClient.post(
+                OPENAI_CHAT_COMPLETIONS_URL,
+                headers=headers,
+                json=payload,
+                stream=True,
+                upstream="openai",
+                operation="validate_stream"
+            )
+        except Exception as e:
+            logger.error(f"Error validating project brief: {str(e)}")
+            yield "error", f"Error validating project brief: {str(e)}"
+            return
+        
+        with response:
+            if response.status_code != 200:
+                logger.error(f"OpenAI API error: {response.status_code} - {response.text}")
+                yield "error", f"OpenAI API error: {response.status_code}"
+                return
+            
+            parts = []
+            # iter_lines only decodes when the response declares an encoding
+            response.encoding = response.encoding or "utf-8"
+            try:
+                # Server-sent events: one "data: {...}" line per chunk, terminated by "data: [DONE]"
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    choices = chunk.get("choices") or [{}]
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        parts.append(delta)
+                        yield "delta", delta
+            except Exception as e:
+                logger.error(f"Error reading validation stream: {str(e)}")
+                yield "error", f"Error reading validation stream: {str(e)}"
+                return
+        
+        validation_results = OpenAIService._extract_json("".join(parts))
+        if "error" in validation_results:
+            yield "error", validation_results["error"]
+        else:
+            yield "result", validation_results
+    
+    @staticmethod
+    def _validate_in_chunks(project_data, system_prompt, reference_template):
+        """
+        Map-reduce validation of a large brief.
+        
+        The requirements are split at markdown headings into parts of about
+        VALIDATION_CHUNK_TOKENS, validated concurrently by up to
+        VALIDATION_MAX_PARALLEL threads and merged with merge_reports.
+        
+        Yields:
+            tuple: ("chunk", {"completed": int, "total": int}) per finished part,
+                then ("result", dict) or ("error", {"error": str, "retryable": bool})
+        """
+        config = current_app.config
+        # _validate_single returns None only without an API key
+        missing_key = {"error": "OpenAI API key is not configured", "retryable": False}
+        chunks = BriefChunker.chunk(project_data.get("requirements"), config['VALIDATION_CHUNK_TOKENS'])
+        total = len(chunks)
+        if not chunks:
+            # Nothing to split (e.g. whitespace-only requirements), so validate in one call
+            result = OpenAIService._validate_single(project_data, system_prompt, reference_template)
+            if not result or "error" in result:
+                yield "error", result or missing_key
+            else:
+                yield "result", result
+            return
+        logger.info(f"Validating brief {project_data.get('project_id')} in {total} parts")
+        
+        app = current_app._get_current_object()
+        
+        def validate_part(index, requirements):
+            part_data = dict(project_data, requirements=requirements)
+            with app.app_context():
+                return OpenAIService._validate_single(part_data, system_prompt, reference_template, part=(index, total))
+        
+        executor = ThreadPoolExecutor(max_workers=min(config['VALIDATION_MAX_PARALLEL'], total))
+        try:
+            futures = {
+                executor.submit(validate_part, index, chunk): index
+                for index, chunk in enumerate(chunks, start=1)
+            }
+            reports = {}
+            for future in as_completed(futures):
+                result = future.result()
+                if not result or "error" in result:
+                    # A missing part would be reported as "Missing" sections, so fail the whole validation
+                    yield "error", result or missing_key
+                    return
+                reports[futures[future]] = result
+                yield "chunk", {"completed": len(reports), "total": total}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        yield "result", OpenAIService.merge_reports([reports[index] for index in sorted(reports)])
+    
+    @staticmethod
+    def merge_reports(reports):
+        """
+        Merges per-part validation reports into one report of the same schema.
+        
+        Each section keeps the best status any part achieved; its notes are the
+        de-duplicated notes of the parts with that status (only the first part's
+        notes when the section is fully addressed).
+        
+        Args:
+            reports (list): Validation results in part order
+            
+        Returns:
+            dict: Merged validation results
+        """
+        def is_section(node):
+            return isinstance(node, dict) and "status" in node
+        
+        def merge(nodes):
+            if all(is_section(node) for node in nodes):
+                best = max(STATUS_RANK.get(node.get("status"), -1) for node in nodes)
+                best_nodes = [node for node in nodes if STATUS_RANK.get(node.get("status"), -1) == best]
+                if best == STATUS_RANK["Fully Addressed"]:
+                    best_nodes = best_nodes[:1]
+                notes = []
+                for node in best_nodes:
+                    for note in node.get("notes") or []:
+                        if note not in notes:
+                            notes.append(note)
+                return dict(best_nodes[0], notes=notes)
+            
+            if all(isinstance(node, dict) for node in nodes):
+                merged = {}
+                for node in nodes:
+                    for key in node:
+                        if key not in merged:
+                            merged[key] = merge([other[key] for other in nodes if key in other])
+                return merged
+            
+            return nodes[0]
+        
+        return merge(reports)
@@ -1,21 +1,52 @@
 import requests
 import json
 from flask import current_app
+import calendar
+import hashlib
 import logging
+import threading
+import time
 from datetime import datetime
-import os
-from app.models import db, Project
+from sqlalchemy.exc import IntegrityError
+from app.models import db, Project, BriefValidation
+from app.services.event_broker import EventBroker
+from app.services.job_queue import JobQueue, JobError, PermanentJobError
 from app.services.openai_service import OpenAIService
+from app.services.prompt_registry import PromptRegistry
+from app.utils.cache import TTLCache
+from app.utils.http_client import HttpClient
+from app.utils.json_provider import RawJSON
 
 logger = logging.getLogger(__name__)
 
 class ProjectBriefService:
     """Service for interacting with the external microservice."""
     
-    @staticmethod
-    def get_project_data(project_id):
+    _cache = None
+    _cache_lock = threading.Lock()
+    
+    @classmethod
+    def _get_cache(cls):
+        """Returns the per-process project cache, created from Config on first use."""
+        if cls._cache is None:
+            with cls._cache_lock:
+                if cls._cache is None:
+                    config = current_app.config
+                    cls._cache = TTLCache(
+                        max_entries=config['PROJECT_CACHE_MAX_ENTRIES'],
+                        soft_ttl=config['PROJECT_CACHE_SOFT_TTL'],
+                        hard_ttl=config['PROJECT_CACHE_HARD_TTL']
+                    )
+        return cls._cache
+    
+    @classmethod
+    def get_project_data(cls, project_id):
         """
-        Fetches project data from the external service or database cache.
+        Fetches project data from the in-process cache, the database or the external service.
+        
+        Data older than PROJECT_CACHE_SOFT_TTL is still returned immediately while a
+        single background refresh runs. The external service is only called
+        synchronously when no copy of the project exists yet.
         
         Args:
             project_id (str): ID of the project to fetch
@@ -23,24 +54,69 @@ class ProjectBriefService:
         Returns:
             dict: Project data or None if error
         """
-        # First, check if we already have this project in our database
+        cache = cls._get_cache()
+        data, state = cache.get(project_id)
+        if state == TTLCache.FRESH:
+            return dict(data)
+        if state == TTLCache.STALE:
+            cls._refresh_in_background(project_id)
+            return dict(data)
+        
+        # Not cached (or past the hard TTL): check if we already have this project in our database
         project = Project.query.filter_by(project_id=project_id).first()
+        if project:
+            data = project.to_dict()
+            fetched_at = calendar.timegm(project.last_updated.timetuple()) if project.last_updated else 0
+            cache.set(project_id, data, stored_at=fetched_at)
+            
+            if time.time() - fetched_at >= cache.soft_ttl:
+                logger.info(f"Serving stale project data for {project_id} while refreshing")
+                cls._refresh_in_background(project_id)
+            return dict(data)
+        
+        # No copy anywhere, the caller has to wait for the external service
+        return cls._fetch_project_data(project_id)
+    
+    @classmethod
+    def _refresh_in_background(cls, project_id):
+        """Starts a background refresh of a project unless one is already running in this process."""
+        cache = cls._get_cache()
+        if not cache.begin_refresh(project_id):
+            return
         
-        # If we have recent data (less than 1 hour old), return it without calling external service
-        if project and project.last_updated and (datetime.utcnow() - project.last_updated).total_seconds() < 3600:
-            logger.info(f"Using cached project data for {project_id}")
-            return project.to_dict()
+        app = current_app._get_current_object()
+        
+        def refresh():
+            try:
+                with app.app_context():
+                    cls._fetch_project_data(project_id)
+            finally:
+                cache.end_refresh(project_id)
+        
+        threading.Thread(target=refresh, name=f"project-refresh-{project_id}", daemon=True).start()
+    
+    @classmethod
+    def _fetch_project_data(cls, project_id):
+        """
+        Fetches a project from the external service and stores it in the database and cache.
+        
+        Args:
+            project_id (str): ID of the project to fetch
+            
+        Returns:
+            dict: Project data, the existing stored data if the service fails, or None
+        """
+        project = Project.query.filter_by(project_id=project_id).first()
         
-        # Otherwise, fetch from external service
         external_service_url = current_app.config.get('PROJECT_BRIEF_SERVICE_URL')
         if not external_service_url:
             logger.error("External service URL not configured")
-            return None
+            return project.to_dict() if project else None
             
         url = f"{external_service_url}/projects/{project_id}"
         
         try:
-            response = requests.get(url, timeout=10)
+            response = HttpClient.get(url, timeout=10, upstream="brief_service", operation="get_project")
             response.raise_for_status()
             data = response.json()
             
@@ -56,8 +132,9 @@ class ProjectBriefService:
             
             # Convert to our standard format
             result = project.to_dict()
+            cls._get_cache().set(project_id, result)
             
-            return result
+            return dict(result)
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching project data: {str(e)}")
             # If we have a project in the database but failed to update, use the cached data
@@ -67,18 +144,211 @@ class ProjectBriefService:
             return None
         except Exception as e:
             logger.error(f"Unexpected error getting project data: {str(e)}")
+            db.session.rollback()
             # Same fallback as above
             if project:
                 return project.to_dict()
             return None
             
+    PROMPTS = ("brief_validation_system", "brief_reference_template")
+    
     @staticmethod
-    def validate_project_brief(project_id):
+    def validation_hash(requirements, questions, prompt_version, model):
+        """
+        Hashes every input that determines a validation result.
+        
+        Args:
+            requirements (str): Brief requirements
+            questions (str): Brief follow-up questions
+            prompt_version (str): PromptRegistry version of the system prompt and template
+            model (str): OpenAI model
+        
+        Returns:
+            str: Hex sha256 digest identifying the validation
+        """
+        content = json.dumps([requirements, questions, prompt_version, model])
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def validation_job_key(project_id, force=False):
+        """Dedupe key of a project's validation job; forced runs get their own, so they are never absorbed."""
+        return f"validate_project_brief:{project_id}:force" if force else f"validate_project_brief:{project_id}"
+    
+    @classmethod
+    def _current_validation_hash(cls, requirements, questions):
+        """Computes the validation hash of a brief with the current prompts and model."""
+        return cls.validation_hash(
+            requirements,
+            questions,
+            PromptRegistry.version(*cls.PROMPTS),
+            current_app.config['OPENAI_MODEL']
+        )
+    
+    @classmethod
+    def is_validation_current(cls, project_data):
+        """
+        Checks whether project data carries a finished validation for its current content.
+        
+        Args:
+            project_data (dict): Project data as returned by get_project_data
+            
+        Returns:
+            bool: True if the stored result (or failure) matches the current hash
+        """
+        if project_data.get('validation_status') not in ('ready', 'failed'):
+            return False
+        try:
+            content_hash = cls._current_validation_hash(project_data.get('requirements'), project_data.get('questions'))
+        except FileNotFoundError:
+            return False
+        return project_data.get('validation_hash') == content_hash
+    
+    @classmethod
+    def request_validation(cls, project_id, force=False):
+        """
+        Returns a project's validation if it is current, otherwise schedules a validation job.
+        
+        A result cached for the same content hash (by this or any other project)
+        is reused without calling OpenAI. At most one validation job per project
+        is queued or running at a time.
+        
+        Args:
+            project_id (str): ID of the project to validate
+            force (bool, optional): Ignore stored results and validate again
+            
+        Returns:
+            dict: {"status": "ready", "validation": ...}, {"status": "failed"},
+                {"status": "pending", "job_id": ...}, {"error": ...} or None if
+                the project has no requirements
+        """
+        project = Project.query.filter_by(project_id=project_id).first()
+        if not project or not project.requirements:
+            return None
+        
+        try:
+            content_hash = cls._current_validation_hash(project.requirements, project.questions)
+        except FileNotFoundError as e:
+            logger.error(str(e))
+            return {"error": str(e)}
+        
+        if not force:
+            if project.validation_hash == content_hash and project.validation_status in ('ready', 'failed'):
+                cls._get_cache().invalidate(project_id)
+                if project.validation_status == 'failed':
+                    return {"status": "failed"}
+                return {"status": "ready", "validation": RawJSON(project.validation_data)}
+            
+            cached = BriefValidation.query.filter_by(content_hash=content_hash).first()
+            if cached:
+                logger.info(f"Reusing cached validation {content_hash[:12]} for project {project_id}")
+                cls._apply_validation(project, content_hash, cached.prompt_version, cached.result)
+                db.session.commit()
+                cls._get_cache().invalidate(project_id)
+                return {"status": "ready", "validation": RawJSON(cached.result)}
+        
+        job = JobQueue.enqueue(
+            "validate_project_brief",
+            {"project_id": project_id, "force": force},
+            dedupe_key=cls.validation_job_key(project_id, force)
+        )
+        if project.validation_hash != content_hash or project.validation_status != 'pending':
+            project.validation_hash = content_hash
+            project.validation_status = 'pending'
+            db.session.commit()
+            cls._get_cache().invalidate(project_id)
+        return {"status": "pending", "job_id": job.id}
+    
+    @staticmethod
+    def _store_validation(project, content_hash, prompt_version, validation_result):
+        """Saves a validation result on the project and in the content-hash cache."""
+        result = json.dumps(validation_result)
+        model = current_app.config['OPENAI_MODEL']
+        
+        cached = BriefValidation.query.filter_by(content_hash=content_hash).first()
+        if cached:
+            cached.result = result
+            cached.model = model
+            cached.prompt_version = prompt_version
+            cached.created_at = datetime.utcnow()
+        else:
+            db.session.add(BriefValidation(
+                content_hash=content_hash,
+                model=model,
+                prompt_version=prompt_version,
+                result=result
+            ))
+        
+        ProjectBriefService._apply_validation(project, content_hash, prompt_version, result)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another project with identical content cached the same hash concurrently
+            db.session.rollback()
+            ProjectBriefService._apply_validation(project, content_hash, prompt_version, result)
+            db.session.commit()
+    
+    @staticmethod
+    def _apply_validation(project, content_hash, prompt_version, result):
+        """Marks a stored validation result (JSON string) as the project's current one."""
+        project.validation_data = result
+        project.validation_hash = content_hash
+        project.validation_prompt_version = prompt_version
+        project.validation_status = 'ready'
+    
+    @staticmethod
+    def _mark_failed(project, content_hash):
+        """Records that validating the project's current content failed, so it is no longer pending."""
+        project.validation_hash = content_hash
+        project.validation_status = 'failed'
+        db.session.commit()
+        ProjectBriefService._get_cache().invalidate(project.project_id)
+
+            
+    @classmethod
+    def _load_prompts(cls):
+        """
+        Returns the validation prompts from the PromptRegistry.
+        
+        Returns:
+            tuple: (system_prompt, reference_template, prompt_version)
+            
+        Raises:
+            FileNotFoundError: If a prompt file is missing
+        """
+        return (
+            PromptRegistry.get("brief_validation_system").text,
+            PromptRegistry.get("brief_reference_template").text,
+            PromptRegistry.version(*cls.PROMPTS)
+        )
+    
+    @staticmethod
+    def _reuse_stored_validation(project, content_hash):
+        """
+        Returns the result stored for a content hash, making it the project's current one.
+        
+        Returns:
+            dict: Validation results or None if nothing is stored for this hash
+        """
+        if project.validation_hash == content_hash and project.validation_status == 'ready' and project.validation_data:
+            return json.loads(project.validation_data)
+        cached = BriefValidation.query.filter_by(content_hash=content_hash).first()
+        if not cached:
+            return None
+        ProjectBriefService._apply_validation(project, content_hash, cached.prompt_version, cached.result)
+        db.session.commit()
+        ProjectBriefService._get_cache().invalidate(project.project_id)
+        return json.loads(cached.result)
+    
+    @staticmethod
+    def validate_project_brief(project_id, force=False):
         """
         Validates a project brief using OpenAI API.
         
+        Runs in the job worker; web requests go through request_validation.
+        
         Args:
             project_id (str): ID of the project to validate
+            force (bool, optional): Call OpenAI even if a result for the same content is cached
             
         Returns:
             dict: Validation results or None if error
@@ -100,32 +370,26 @@ class ProjectBriefService:
             logger.error(f"Project {project_id} not found or has no requirements")
             return None
         
-        # Check if validation was already done and is not too old (72 hours)
-        if project.validation_data and project.last_updated and (datetime.utcnow() - project.last_updated).total_seconds() < 259200:
-            try:
-                return json.loads(project.validation_data)
-            except json.JSONDecodeError:
-                logger.warning(f"Invalid validation data for project {project_id}, will re-validate")
+        try:
+            system_prompt, reference_template, prompt_version = ProjectBriefService._load_prompts()
+        except FileNotFoundError as e:
+            logger.error(str(e))
+            return {"error": str(e)}
+        
+        content_hash = ProjectBriefService.validation_hash(
+            project.requirements,
+            project.questions,
+            prompt_version,
+            current_app.config['OPENAI_MODEL']
+        )
+        
+        # Only pay for OpenAI again when the brief, prompts or model changed
+        if not force:
+            stored = ProjectBriefService._reuse_stored_validation(project, content_hash)
+            if stored is not None:
+                return stored
         
         try:
-            # Load the system prompt
-            system_prompt_path = os.path.join('app', 'brief_validation_ai_agent_system_prompt.md')
-            if not os.path.exists(system_prompt_path):
-                logger.error(f"System prompt file not found at {system_prompt_path}")
-                return {"error": "System prompt file not found"}
-                
-            with open(system_prompt_path, 'r') as f:
-                system_prompt = f.read()
-                
-            # Load the reference template
-            reference_template_path = os.path.join('app', 'project_brief_reference_template.md')
-            if not os.path.exists(reference_template_path):
-                logger.error(f"Reference template file not found at {reference_template_path}")
-                return {"error": "Reference template file not found"}
-                
-            with open(reference_template_path, 'r') as f:
-                reference_template = f.read()
-                
             # Prepare project data for validation
             project_data = {
                 "project_id": project.project_id,
@@ -142,10 +406,129 @@ class ProjectBriefService:
             
             if validation_result and "error" not in validation_result:
                 # Save validation results to database
-                project.validation_data = json.dumps(validation_result)
-                db.session.commit()
+                ProjectBriefService._store_validation(project, content_hash, prompt_version, validation_result)
+                ProjectBriefService._get_cache().invalidate(project_id)
+            elif not (validation_result or {}).get("retryable"):
+                ProjectBriefService._mark_failed(project, content_hash)
+            # Retryable errors leave the project pending until the job's last attempt
                 
             return validation_result
         except Exception as e:
             logger.error(f"Error validating project brief: {str(e)}")
-            return {"error": f"Error validating project brief: {str(e)}"}
\ No newline at end of file
+            db.session.rollback()
+            # Leave the project failed rather than pending, so viewers stop waiting for a result
+            ProjectBriefService._mark_failed(project, content_hash)
+            return {"error": f"Error validating project brief: {str(e)}", "retryable": False}
+
+    
+    @staticmethod
+    def stream_validation(project_id, force=False):
+        """
+        Validates a project brief in the request, yielding progress as OpenAI generates it.
+        
+        The final result is stored exactly like a job-based validation. If a
+        validation job for the project is already queued or running, only its
+        id is reported instead of calling OpenAI a second time.
+        
+        Args:
+            project_id (str): ID of the project to validate
+            force (bool, optional): Call OpenAI even if a result for the same content is cached
+            
+        Yields:
+            tuple: (event, data) where event is "progress", "delta", "result" or "error"
+        """
+        project = Project.query.filter_by(project_id=project_id).first()
+        if not project or not project.requirements:
+            yield "error", {"error": "Project has no requirements to validate"}
+            return
+        
+        try:
+            system_prompt, reference_template, prompt_version = ProjectBriefService._load_prompts()
+        except FileNotFoundError as e:
+            logger.error(str(e))
+            yield "error", {"error": str(e)}
+            return
+        
+        content_hash = ProjectBriefService.validation_hash(
+            project.requirements,
+            project.questions,
+            prompt_version,
+            current_app.config['OPENAI_MODEL']
+        )
+        
+        if not force:
+            stored = ProjectBriefService._reuse_stored_validation(project, content_hash)
+            if stored is not None:
+                yield "progress", {"stage": "cached", "prompt_version": project.validation_prompt_version}
+                yield "result", {"validation": stored}
+                return
+        
+        job = (
+            JobQueue.find_active(ProjectBriefService.validation_job_key(project_id))
+            or JobQueue.find_active(ProjectBriefService.validation_job_key(project_id, force=True))
+        )
+        if job:
+            # Don't pay for a second call or hold this thread; the job's outcome arrives as a
+            # project.validated event on /projects/<project_id>/events
+            yield "progress", {"stage": job.status, "job_id": job.id}
+            return
+        
+        yield "progress", {"stage": "validating", "model": current_app.config['OPENAI_MODEL'], "prompt_version": prompt_version}
+        
+        project_data = {
+            "project_id": project.project_id,
+            "requirements": project.requirements,
+            "questions": project.questions
+        }
+        received = 0
+        try:
+            for kind, data in OpenAIService.stream_project_brief_validation(project_data, system_prompt, reference_template):
+                if kind == "delta":
+                    received += len(data)
+                    yield "delta", {"text": data, "received": received}
+                elif kind == "chunk":
+                    yield "progress", dict(data, stage="validating")
+                elif kind == "result":
+                    ProjectBriefService._store_validation(project, content_hash, prompt_version, data)
+                    ProjectBriefService._get_cache().invalidate(project_id)
+                    EventBroker.publish(project_id, "project.validated", {"project_id": project_id, "status": "ready"})
+                    yield "result", {"validation": data}
+                else:
+                    ProjectBriefService._mark_failed(project, content_hash)
+                    yield "error", {"error": data}
+        except Exception as e:
+            logger.error(f"Error streaming project brief validation: {str(e)}")
+            db.session.rollback()
+            ProjectBriefService._mark_failed(project, content_hash)
+            yield "error", {"error": f"Error validating project brief: {str(e)}"}
+
+
+def validate_project_brief_failed(payload, error):
+    """Marks the project failed and notifies its viewers once no further attempt will follow."""
+    project_id = payload["project_id"]
+    project = Project.query.filter_by(project_id=project_id).first()
+    if project and project.requirements:
+        try:
+            content_hash = ProjectBriefService._current_validation_hash(project.requirements, project.questions)
+        except FileNotFoundError:
+            content_hash = project.validation_hash
+        if project.validation_status != 'ready' or project.validation_hash != content_hash:
+            ProjectBriefService._mark_failed(project, content_hash)
+    EventBroker.publish(project_id, "project.validated", {"project_id": project_id, "status": "failed"})
+
+
+@JobQueue.handler("validate_project_brief", on_failure=validate_project_brief_failed)
+def validate_project_brief_job(payload):
+    """Job handler validating a project brief and notifying the project's viewers."""
+    project_id = payload["project_id"]
+    validation_result = ProjectBriefService.validate_project_brief(project_id, force=payload.get("force", False))
+    if validation_result is None:
+        return
+    
+    if "error" in validation_result:
+        # Parse errors and most 4xx would fail the same way (and cost the same) again
+        if validation_result.get("retryable"):
+            raise JobError(validation_result["error"])
+        raise PermanentJobError(validation_result["error"])
+    
+    EventBroker.publish(project_id, "project.validated", {"project_id": project_id, "status": "ready"})
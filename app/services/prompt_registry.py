@@ -0,0 +1,121 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class Prompt:
+    """A prompt template loaded from disk with its content hash and version."""
+
+    def __init__(self, name, path, text, mtime):
+        self.name = name
+        self.path = path
+        self.text = text
+        self.mtime = mtime
+        self.content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        # Derived from the content, so every process agrees on the version of a file
+        self.version = self.content_hash[:12]
+        self.checked_at = time.monotonic()
+
+
+class PromptRegistry:
+    """Process-wide registry of the prompt templates used for brief validation.
+
+    Templates are read once per process from the app package directory (not
+    the working directory). A file is only stat'ed again after
+    PROMPT_RELOAD_INTERVAL seconds and re-read when its mtime changed, so
+    edits are picked up without a restart and without file I/O per request.
+    """
+
+    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    FILES = {
+        "brief_validation_system": "brief_validation_ai_agent_system_prompt.md",
+        "brief_reference_template": "project_brief_reference_template.md",
+    }
+
+    _prompts = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _load(cls, name):
+        """Reads a prompt file from disk and stores it in the registry."""
+        filename = cls.FILES.get(name)
+        if not filename:
+            raise KeyError(f"Unknown prompt: {name}")
+        path = os.path.join(cls.BASE_DIR, filename)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Prompt file not found: {filename}")
+
+        mtime = os.stat(path).st_mtime
+        with open(path, 'r') as f:
+            prompt = Prompt(name, path, f.read(), mtime)
+
+        previous = cls._prompts.get(name)
+        if previous and previous.version != prompt.version:
+            logger.info(f"Reloaded prompt {name}: version {previous.version} -> {prompt.version}")
+        cls._prompts[name] = prompt
+        return prompt
+
+    @classmethod
+    def get(cls, name):
+        """
+        Returns the current version of a prompt, reloading it if the file changed.
+
+        Args:
+            name (str): Key in FILES
+
+        Returns:
+            Prompt: The loaded prompt
+
+        Raises:
+            FileNotFoundError: If the prompt file does not exist
+        """
+        prompt = cls._prompts.get(name)
+        interval = current_app.config['PROMPT_RELOAD_INTERVAL']
+        if prompt and time.monotonic() - prompt.checked_at < interval:
+            return prompt
+
+        with cls._lock:
+            prompt = cls._prompts.get(name)
+            if prompt is None:
+                return cls._load(name)
+            if time.monotonic() - prompt.checked_at < interval:
+                return prompt
+            try:
+                mtime = os.stat(prompt.path).st_mtime
+            except OSError:
+                # Keep serving the last good version if the file is being replaced
+                logger.warning(f"Prompt file {prompt.path} is not readable, keeping version {prompt.version}")
+                prompt.checked_at = time.monotonic()
+                return prompt
+            if mtime != prompt.mtime:
+                return cls._load(name)
+            prompt.checked_at = time.monotonic()
+            return prompt
+
+    @classmethod
+    def version(cls, *names):
+        """
+        Combined version of several prompts, e.g. "brief_validation_system@1a2b3c4d5e6f,...".
+
+        Args:
+            *names (str): Keys in FILES
+
+        Returns:
+            str: Version string identifying the exact prompt contents
+        """
+        return ",".join(f"{name}@{cls.get(name).version}" for name in names)
+
+    @classmethod
+    def preload(cls):
+        """Loads every registered prompt; called once at startup."""
+        for name in cls.FILES:
+            try:
+                cls.get(name)
+            except FileNotFoundError as e:
+                logger.warning(str(e))
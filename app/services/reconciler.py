@@ -0,0 +1,204 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import cast, func, literal, or_
+from app.models import db, Meeting, TranscriptFetchState
+from app.services.fireflies import FirefliesService
+from app.services.job_queue import JobQueue
+from app.services.transcript_fetch import TranscriptFetchCoordinator
+from app.utils.meet_link import MeetLink
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptReconciler:
+    """Backfills transcripts for meetings whose webhook never arrived.
+
+    Pending meetings older than RECONCILE_MIN_AGE minutes (and younger than
+    RECONCILE_MAX_AGE hours) are scanned in id order with a keyset query and
+    fetched with RECONCILE_CONCURRENCY threads. Fetches go through
+    TranscriptFetchCoordinator, so they share its lease and per-meeting
+    backoff with the lazy fetch in the meeting API. Meetings that were never
+    linked to a Fireflies ID are matched by Meet code against the recent
+    transcripts listed from Fireflies.
+    """
+
+    JOB_KIND = "reconcile_transcripts"
+
+    @staticmethod
+    def fetch_key(meeting_pk, fireflies_id):
+        """Key of a meeting's row in transcript_fetch_state."""
+        return fireflies_id or f"meeting:{meeting_pk}"
+
+    @staticmethod
+    def _fetch_key_expression():
+        """SQL equivalent of fetch_key, used to skip meetings that are backing off."""
+        return func.coalesce(Meeting.meeting_id, literal("meeting:") + cast(Meeting.id, db.String))
+
+    @classmethod
+    def run_once(cls, process, min_age=None, concurrency=None, batch_size=None, max_seconds=None):
+        """
+        Runs one reconciliation pass over the pending backlog.
+
+        Args:
+            process (callable): process_transcription-style function taking a
+                Fireflies ID and returning (meeting_record, error_message, status_code)
+            min_age (float, optional): Minutes a meeting must be pending (RECONCILE_MIN_AGE)
+            concurrency (int, optional): Parallel fetches (RECONCILE_CONCURRENCY)
+            batch_size (int, optional): Meetings per keyset page (RECONCILE_BATCH_SIZE)
+            max_seconds (float, optional): Stop starting new batches after this long
+
+        Returns:
+            dict: backlog, due, fetched, failed, skipped, elapsed_seconds and
+                fetched_per_minute of this pass
+        """
+        config = current_app.config
+        min_age = config['RECONCILE_MIN_AGE'] if min_age is None else min_age
+        concurrency = concurrency or config['RECONCILE_CONCURRENCY']
+        batch_size = batch_size or config['RECONCILE_BATCH_SIZE']
+
+        started = time.monotonic()
+        now = datetime.utcnow()
+        oldest = now - timedelta(hours=config['RECONCILE_MAX_AGE'])
+        pending = db.and_(
+            ~Meeting.has_transcription,
+            Meeting.meeting_datetime <= now - timedelta(minutes=min_age),
+            Meeting.meeting_datetime >= oldest
+        )
+
+        stats = {"backlog": 0, "due": 0, "fetched": 0, "failed": 0, "skipped": 0}
+        stats["backlog"] = db.session.query(func.count(Meeting.id)).filter(pending).scalar()
+
+        app = current_app._get_current_object()
+        matcher = None
+        last_id = 0
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while max_seconds is None or time.monotonic() - started < max_seconds:
+                rows = (
+                    db.session.query(Meeting.id, Meeting.meeting_id, Meeting.meet_code)
+                    .outerjoin(TranscriptFetchState, TranscriptFetchState.fireflies_id == cls._fetch_key_expression())
+                    .filter(
+                        pending,
+                        Meeting.id > last_id,
+                        or_(TranscriptFetchState.next_attempt_at.is_(None), TranscriptFetchState.next_attempt_at <= now)
+                    )
+                    .order_by(Meeting.id)
+                    .limit(batch_size)
+                    .all()
+                )
+                db.session.commit()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                stats["due"] += len(rows)
+
+                if matcher is None and any(not row.meeting_id for row in rows):
+                    matcher = _TranscriptMatcher.load(oldest)
+
+                for status in executor.map(lambda row: cls._reconcile(app, row, process, matcher), rows):
+                    if status == "fetched":
+                        stats["fetched"] += 1
+                    elif status == "failed":
+                        stats["failed"] += 1
+                    else:
+                        stats["skipped"] += 1
+
+        elapsed = time.monotonic() - started
+        stats["elapsed_seconds"] = round(elapsed, 2)
+        stats["fetched_per_minute"] = round(stats["fetched"] * 60 / elapsed, 1) if elapsed else 0.0
+        logger.info(
+            f"Reconciled transcripts: backlog={stats['backlog']} due={stats['due']} "
+            f"fetched={stats['fetched']} failed={stats['failed']} skipped={stats['skipped']} "
+            f"in {stats['elapsed_seconds']}s ({stats['fetched_per_minute']}/min)"
+        )
+        return stats
+
+    @classmethod
+    def _reconcile(cls, app, row, process, matcher):
+        """Fetches one meeting's transcript in a worker thread; returns the coordinator status."""
+        with app.app_context():
+            try:
+                if row.meeting_id:
+                    _, status = TranscriptFetchCoordinator.fetch(row.meeting_id, process)
+                    return status
+
+                def discover(_):
+                    fireflies_id = matcher.claim(row.meet_code) if matcher else None
+                    if not fireflies_id:
+                        return None, "No Fireflies transcript found for Meet code", 404
+                    return process(fireflies_id)
+
+                _, status = TranscriptFetchCoordinator.fetch(cls.fetch_key(row.id, None), discover)
+                return status
+            except Exception:
+                logger.exception(f"Error reconciling meeting {row.id}")
+                db.session.rollback()
+                return "failed"
+
+    @staticmethod
+    def schedule(delay=None):
+        """
+        Enqueues the next periodic reconciliation job.
+
+        Each RECONCILE_INTERVAL slot has its own dedupe key, so processes
+        scheduling the same slot share one job. Starting processes use the
+        default, so however many of them start they queue a single job and
+        nothing runs before the next slot.
+
+        Args:
+            delay (float, optional): Seconds from now; defaults to the start of the next slot
+        """
+        interval = current_app.config['RECONCILE_INTERVAL']
+        if interval <= 0:
+            return None
+        now = time.time()
+        if delay is None:
+            # Derive the delay from the slot so every process computes the same slot
+            slot = int(now // interval) + 1
+            delay = slot * interval - now
+        else:
+            slot = int((now + delay) // interval)
+        return JobQueue.enqueue(
+            TranscriptReconciler.JOB_KIND,
+            {"slot": slot},
+            delay=delay,
+            max_attempts=1,
+            dedupe_key=f"{TranscriptReconciler.JOB_KIND}:{slot}"
+        )
+
+
+class _TranscriptMatcher:
+    """Recent Fireflies transcripts not yet linked to a meeting, grouped by Meet code."""
+
+    def __init__(self, by_code):
+        self._by_code = by_code
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, from_date):
+        """Lists transcripts since from_date and drops the ones already linked."""
+        transcripts = FirefliesService.list_transcripts(from_date=from_date) or []
+        linked = set()
+        ids = [t["id"] for t in transcripts if t.get("id")]
+        if ids:
+            linked = {
+                row.meeting_id for row in
+                db.session.query(Meeting.meeting_id).filter(Meeting.meeting_id.in_(ids)).all()
+            }
+        by_code = {}
+        for transcript in transcripts:
+            if not transcript.get("id") or transcript["id"] in linked or not transcript.get("meeting_link"):
+                continue
+            code = MeetLink.normalize_code(transcript["meeting_link"])
+            by_code.setdefault(code, []).append(transcript["id"])
+        logger.info(f"Listed {len(transcripts)} recent Fireflies transcripts, {sum(map(len, by_code.values()))} unlinked")
+        return cls(by_code)
+
+    def claim(self, meet_code):
+        """Takes the newest unlinked transcript for a Meet code, or None."""
+        with self._lock:
+            candidates = self._by_code.get(meet_code)
+            return candidates.pop(0) if candidates else None
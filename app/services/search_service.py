@@ -0,0 +1,220 @@
+import logging
+import re
+from sqlalchemy import text
+from app.models import db
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptSearchService:
+    """Full-text search over transcripts using the database's native index.
+
+    Postgres keeps a tsvector per meeting in `transcript_search` with a GIN
+    index; SQLite uses an FTS5 virtual table `transcript_fts` keyed by the
+    meeting's primary key, with the project id as an indexed column so the
+    project filter is part of the MATCH. The indexed body is assembled from
+    transcript_sentences inside the database.
+    """
+
+    POSTGRES_SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS transcript_search (
+            meeting_pk INTEGER PRIMARY KEY REFERENCES meetings(id) ON DELETE CASCADE,
+            project_id VARCHAR(50) NOT NULL,
+            body TEXT NOT NULL,
+            document TSVECTOR NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_transcript_search_document ON transcript_search USING GIN (document)",
+        "CREATE INDEX IF NOT EXISTS ix_transcript_search_project_id ON transcript_search (project_id)",
+    )
+
+    SQLITE_SCHEMA = (
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS transcript_fts USING fts5(
+            body,
+            project_id,
+            tokenize = 'porter unicode61'
+        )
+        """,
+    )
+
+    # Indexes created before project_id was indexed are rebuilt from their own rows
+    SQLITE_UPGRADE = (
+        "ALTER TABLE transcript_fts RENAME TO transcript_fts_old",
+        SQLITE_SCHEMA[0],
+        "INSERT INTO transcript_fts (rowid, body, project_id) SELECT rowid, body, project_id FROM transcript_fts_old",
+        "DROP TABLE transcript_fts_old",
+    )
+
+    @staticmethod
+    def dialect():
+        """Returns the active database dialect name."""
+        return db.engine.dialect.name
+
+    @staticmethod
+    def is_supported():
+        """Whether the configured database has a supported full-text index."""
+        return TranscriptSearchService.dialect() in ("postgresql", "sqlite")
+
+    @staticmethod
+    def ensure_schema():
+        """Creates the search table and indexes if they do not exist yet."""
+        dialect = TranscriptSearchService.dialect()
+        if dialect == "postgresql":
+            statements = TranscriptSearchService.POSTGRES_SCHEMA
+        elif dialect == "sqlite":
+            statements = TranscriptSearchService.SQLITE_SCHEMA
+        else:
+            logger.warning(f"Full-text search is not supported on {dialect}")
+            return
+
+        try:
+            with db.engine.begin() as conn:
+                if dialect == "sqlite":
+                    existing = conn.execute(text(
+                        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'transcript_fts'"
+                    )).scalar()
+                    if existing and "UNINDEXED" in existing:
+                        logger.info("Rebuilding transcript_fts with an indexed project_id column")
+                        statements = TranscriptSearchService.SQLITE_UPGRADE
+                for statement in statements:
+                    conn.execute(text(statement))
+        except Exception as e:
+            logger.error(f"Failed to create full-text search schema: {str(e)}")
+
+    @staticmethod
+    def index_meeting(meeting):
+        """
+        (Re)indexes a meeting's transcript from its stored sentences.
+
+        Runs in the caller's session so the index is committed together with
+        the transcript.
+
+        Args:
+            meeting (Meeting): Meeting whose sentences were just written
+        """
+        dialect = TranscriptSearchService.dialect()
+        params = {"meeting_pk": meeting.id, "project_id": meeting.project_id}
+
+        if dialect == "postgresql":
+            db.session.execute(text(
+                """
+                INSERT INTO transcript_search (meeting_pk, project_id, body, document)
+                SELECT :meeting_pk, :project_id, b.body, to_tsvector('english', b.body)
+                FROM (
+                    SELECT coalesce(string_agg(speaker || ': ' || text, E'\\n' ORDER BY sentence_index), '') AS body
+                    FROM transcript_sentences
+                    WHERE meeting_pk = :meeting_pk
+                ) b
+                ON CONFLICT (meeting_pk) DO UPDATE
+                SET project_id = excluded.project_id, body = excluded.body, document = excluded.document
+                """
+            ), params)
+        elif dialect == "sqlite":
+            db.session.execute(text("DELETE FROM transcript_fts WHERE rowid = :meeting_pk"), params)
+            db.session.execute(text(
+                """
+                INSERT INTO transcript_fts (rowid, body, project_id)
+                SELECT :meeting_pk, coalesce(group_concat(line, char(10)), ''), :project_id
+                FROM (
+                    SELECT speaker || ': ' || text AS line
+                    FROM transcript_sentences
+                    WHERE meeting_pk = :meeting_pk
+                    ORDER BY sentence_index
+                )
+                """
+            ), params)
+
+    @staticmethod
+    def _fts5_query(query, project_id):
+        """
+        Turns free text into an FTS5 query matching all terms in a project's transcripts.
+
+        User input never reaches FTS5 as operators. The project id is matched as
+        a phrase in its column, so the index narrows the rows to the project;
+        callers still compare project_id exactly, since a phrase can also match
+        inside a longer id.
+
+        Returns:
+            str: The MATCH expression, or "" if the query has no terms
+        """
+        terms = re.findall(r"\w+", query, flags=re.UNICODE)
+        if not terms:
+            return ""
+        phrases = " ".join(f'"{term}"' for term in terms)
+        project = project_id.replace('"', '""')
+        return f'project_id : "{project}" AND body : ({phrases})'
+
+    @staticmethod
+    def search(project_id, query, limit, offset=0):
+        """
+        Ranks a project's transcripts against a free-text query.
+
+        Args:
+            project_id (str): Project to search
+            query (str): User query (web-search syntax on Postgres, all terms on SQLite)
+            limit (int): Page size
+            offset (int, optional): Number of ranked results to skip
+
+        Returns:
+            tuple: (results, total) where results is a list of
+                {"meeting_pk": int, "rank": float, "snippet": str}
+        """
+        dialect = TranscriptSearchService.dialect()
+        params = {"project_id": project_id, "query": query, "limit": limit, "offset": offset}
+
+        if dialect == "postgresql":
+            total = db.session.execute(text(
+                """
+                SELECT count(*) FROM transcript_search
+                WHERE project_id = :project_id AND document @@ websearch_to_tsquery('english', :query)
+                """
+            ), params).scalar()
+            # Headlines are expensive, so they are only built for the rows of the current page
+            rows = db.session.execute(text(
+                """
+                WITH q AS (SELECT websearch_to_tsquery('english', :query) AS query),
+                page AS (
+                    SELECT s.meeting_pk, s.body, ts_rank_cd(s.document, q.query) AS rank
+                    FROM transcript_search s, q
+                    WHERE s.project_id = :project_id AND s.document @@ q.query
+                    ORDER BY rank DESC, s.meeting_pk DESC
+                    LIMIT :limit OFFSET :offset
+                )
+                SELECT page.meeting_pk, page.rank,
+                       ts_headline('english', page.body, q.query,
+                                   'StartSel=<mark>, StopSel=</mark>, MaxFragments=3, MaxWords=20, MinWords=5') AS snippet
+                FROM page, q
+                ORDER BY page.rank DESC, page.meeting_pk DESC
+                """
+            ), params).all()
+        elif dialect == "sqlite":
+            params["query"] = TranscriptSearchService._fts5_query(query, project_id)
+            if not params["query"]:
+                return [], 0
+            total = db.session.execute(text(
+                "SELECT count(*) FROM transcript_fts WHERE transcript_fts MATCH :query AND project_id = :project_id"
+            ), params).scalar()
+            # bm25() is lower for better matches; negate it so higher rank means more relevant.
+            # The project_id column gets no weight, only the body is ranked.
+            rows = db.session.execute(text(
+                """
+                SELECT rowid AS meeting_pk, -bm25(transcript_fts, 1.0, 0.0) AS rank,
+                       snippet(transcript_fts, 0, '<mark>', '</mark>', '...', 16) AS snippet
+                FROM transcript_fts
+                WHERE transcript_fts MATCH :query AND project_id = :project_id
+                ORDER BY bm25(transcript_fts, 1.0, 0.0), rowid DESC
+                LIMIT :limit OFFSET :offset
+                """
+            ), params).all()
+        else:
+            # The route answers 501 based on is_supported(); callers that don't check get no matches
+            logger.warning(f"Full-text search is not supported on {dialect}")
+            return [], 0
+
+        results = [
+            {"meeting_pk": row.meeting_pk, "rank": float(row.rank), "snippet": row.snippet}
+            for row in rows
+        ]
+        return results, total
@@ -0,0 +1,174 @@
+import zlib
+from flask import current_app
+from app.models import db, TranscriptSentence
+from app.services.transcript_store import TranscriptStore
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class TranscriptExport:
+    """Renders stored transcripts as streamed text, NDJSON or WebVTT downloads.
+
+    Sentences are read from transcript_sentences in keyset batches of
+    TRANSCRIPT_DOWNLOAD_BATCH_SIZE and rendered one batch per chunk, so a
+    download never holds more than one batch in memory. The text format is
+    byte-identical to Meeting.transcript_text, whose size is already stored
+    as Meeting.transcript_size.
+    """
+
+    FORMATS = {
+        "text": "text/plain; charset=utf-8",
+        "ndjson": "application/x-ndjson",
+        "vtt": "text/vtt; charset=utf-8",
+    }
+
+    GZIP_LEVEL = 6
+
+    @staticmethod
+    def encodings():
+        """Content codings the server can produce, in order of preference."""
+        return ["zstd", "gzip"] if zstandard else ["gzip"]
+
+    @staticmethod
+    def _iter_sentences(meeting, batch_size):
+        """Yields lists of sentence dicts in index order, one list per query."""
+        if meeting.sentence_count is None:
+            # Legacy meetings only have the uncompressed text column
+            legacy = TranscriptStore.parse_text(meeting.transcription)
+            for start in range(0, len(legacy), batch_size):
+                yield [
+                    {"index": start + offset, "speaker": sentence["speaker"], "text": sentence["text"],
+                     "start_time": None, "end_time": None}
+                    for offset, sentence in enumerate(legacy[start:start + batch_size])
+                ]
+            return
+
+        last_index = -1
+        while True:
+            rows = (
+                db.session.query(
+                    TranscriptSentence.sentence_index,
+                    TranscriptSentence.speaker,
+                    TranscriptSentence.text,
+                    TranscriptSentence.start_time,
+                    TranscriptSentence.end_time
+                )
+                .filter(
+                    TranscriptSentence.meeting_pk == meeting.id,
+                    TranscriptSentence.sentence_index > last_index
+                )
+                .order_by(TranscriptSentence.sentence_index)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                return
+            last_index = rows[-1].sentence_index
+            yield [
+                {"index": row.sentence_index, "speaker": row.speaker, "text": row.text,
+                 "start_time": row.start_time, "end_time": row.end_time}
+                for row in rows
+            ]
+            if len(rows) < batch_size:
+                return
+
+    @staticmethod
+    def _vtt_timestamp(seconds):
+        """Formats seconds as a WebVTT timestamp (HH:MM:SS.mmm)."""
+        milliseconds = int(round((seconds or 0) * 1000))
+        hours, milliseconds = divmod(milliseconds, 3600000)
+        minutes, milliseconds = divmod(milliseconds, 60000)
+        seconds, milliseconds = divmod(milliseconds, 1000)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+    @staticmethod
+    def _vtt_escape(text):
+        """Escapes cue text; also prevents "-->" from ending up in a cue payload."""
+        return (text or "").replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+    @staticmethod
+    def _render_batch(fmt, batch):
+        """Renders one batch of sentences in the given format."""
+        if fmt == "text":
+            lines = [TranscriptStore.format_line(sentence["speaker"], sentence["text"]) for sentence in batch]
+            # Lines are separated, not terminated, by newlines like in transcript_text
+            prefix = "" if batch[0]["index"] == 0 else "\n"
+            return (prefix + "\n".join(lines)).encode("utf-8")
+        if fmt == "ndjson":
+            encode = current_app.json.dumps_bytes
+            return b"".join(encode(sentence, separators=(",", ":")) + b"\n" for sentence in batch)
+
+        cues = []
+        for sentence in batch:
+            start = sentence["start_time"] or 0
+            end = sentence["end_time"] if sentence["end_time"] is not None else start
+            cues.append(
+                f"{sentence['index'] + 1}\n"
+                f"{TranscriptExport._vtt_timestamp(start)} --> {TranscriptExport._vtt_timestamp(end)}\n"
+                f"<v {TranscriptExport._vtt_escape(sentence['speaker'] or 'Unknown')}>"
+                f"{TranscriptExport._vtt_escape(sentence['text'])}\n\n"
+            )
+        return "".join(cues).encode("utf-8")
+
+    @staticmethod
+    def render(meeting, fmt, batch_size=None):
+        """
+        Streams a meeting's transcript in the given format.
+
+        Args:
+            meeting (Meeting): Meeting with a stored transcript
+            fmt (str): Key in FORMATS
+            batch_size (int, optional): Overrides TRANSCRIPT_DOWNLOAD_BATCH_SIZE
+
+        Yields:
+            bytes: Rendered chunks, one per batch of sentences
+        """
+        batch_size = batch_size or current_app.config['TRANSCRIPT_DOWNLOAD_BATCH_SIZE']
+        if fmt == "text" and meeting.sentence_count is None:
+            # Legacy text is served verbatim, it is already loaded with the meeting
+            yield (meeting.transcription or "").encode("utf-8")
+            return
+        if fmt == "vtt":
+            yield b"WEBVTT\n\n"
+        for batch in TranscriptExport._iter_sentences(meeting, batch_size):
+            yield TranscriptExport._render_batch(fmt, batch)
+
+    @staticmethod
+    def content_length(meeting, fmt):
+        """
+        Size in bytes of the rendered transcript.
+
+        Free for the text format of ingested transcripts; other formats are
+        rendered once and counted without keeping the output.
+        """
+        if fmt == "text" and meeting.sentence_count is not None:
+            return meeting.transcript_size or 0
+        return sum(len(chunk) for chunk in TranscriptExport.render(meeting, fmt))
+
+    @staticmethod
+    def compress(chunks, encoding):
+        """
+        Compresses a stream of chunks with the given content coding.
+
+        Args:
+            chunks (iterable): Uncompressed byte chunks
+            encoding (str): "gzip" or "zstd"
+
+        Yields:
+            bytes: Compressed chunks, flushed once per input chunk
+        """
+        if encoding == "zstd":
+            compressor = zstandard.ZstdCompressor().compressobj()
+            flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            compressor = zlib.compressobj(TranscriptExport.GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+            flush_mode = zlib.Z_SYNC_FLUSH
+        for chunk in chunks:
+            # Flushing per chunk lets clients start decoding before the download ends
+            data = compressor.compress(chunk) + compressor.flush(flush_mode)
+            if data:
+                yield data
+        yield compressor.flush()
@@ -0,0 +1,163 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from app.models import db, TranscriptFetchState
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptFetchCoordinator:
+    """Single-flight and negative caching for lazy Fireflies transcript fetches.
+
+    Within a process, concurrent callers for the same Fireflies ID wait for
+    the one in-flight fetch. Across processes, a lease row in
+    transcript_fetch_state lets only one worker fetch at a time, and failed
+    ("not ready yet") fetches push the next attempt out with exponential
+    backoff so polls in between return immediately. Rows of IDs that never
+    resolve are pruned after TRANSCRIPT_FETCH_RETENTION_DAYS without a
+    fetch, at most once per TRANSCRIPT_FETCH_PRUNE_INTERVAL per process.
+    """
+
+    _inflight = {}
+    _lock = threading.Lock()
+    _last_pruned = None
+    _prune_lock = threading.Lock()
+
+    @classmethod
+    def fetch(cls, fireflies_id, process):
+        """
+        Fetches a transcript unless another fetch is running or the ID is backing off.
+
+        Args:
+            fireflies_id (str): Fireflies transcript ID
+            process (callable): process_transcription-style function returning
+                (meeting_record, error_message, status_code)
+
+        Returns:
+            tuple: (meeting_record, status) where meeting_record is the updated
+                Meeting or None, and status is one of "fetched", "failed",
+                "shared" (waited for another request in this process),
+                "in_flight" (another worker is fetching) or "backoff"
+        """
+        cls.prune_if_due()
+
+        with cls._lock:
+            done = cls._inflight.get(fireflies_id)
+            leader = done is None
+            if leader:
+                done = cls._inflight[fireflies_id] = threading.Event()
+
+        if not leader:
+            done.wait(current_app.config['TRANSCRIPT_FETCH_WAIT'])
+            return None, "shared"
+
+        try:
+            status = cls._acquire_lease(fireflies_id)
+            if status:
+                return None, status
+
+            meeting_record, error_message, status_code = process(fireflies_id)
+            if meeting_record and meeting_record.has_transcription:
+                cls.reset(fireflies_id)
+                return meeting_record, "fetched"
+
+            cls._record_failure(fireflies_id, error_message or "Transcript not ready")
+            return meeting_record, "failed"
+        finally:
+            with cls._lock:
+                cls._inflight.pop(fireflies_id, None)
+            done.set()
+
+    @staticmethod
+    def _acquire_lease(fireflies_id):
+        """
+        Takes the cross-worker fetch lease for a Fireflies ID.
+
+        Returns:
+            str: None if the lease was acquired, otherwise "backoff" or "in_flight"
+        """
+        now = datetime.utcnow()
+        lease_until = now + timedelta(seconds=current_app.config['TRANSCRIPT_FETCH_LEASE'])
+
+        state = db.session.get(TranscriptFetchState, fireflies_id)
+        if state is None:
+            try:
+                db.session.add(TranscriptFetchState(fireflies_id=fireflies_id, attempts=0, lease_until=lease_until))
+                db.session.commit()
+                return None
+            except IntegrityError:
+                # Another worker created the row first
+                db.session.rollback()
+                state = db.session.get(TranscriptFetchState, fireflies_id)
+
+        if state.next_attempt_at and state.next_attempt_at > now:
+            return "backoff"
+        if state.lease_until and state.lease_until > now:
+            return "in_flight"
+
+        result = db.session.execute(
+            update(TranscriptFetchState)
+            .where(
+                TranscriptFetchState.fireflies_id == fireflies_id,
+                or_(TranscriptFetchState.lease_until.is_(None), TranscriptFetchState.lease_until <= now),
+                or_(TranscriptFetchState.next_attempt_at.is_(None), TranscriptFetchState.next_attempt_at <= now)
+            )
+            .values(lease_until=lease_until)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return None if result.rowcount == 1 else "in_flight"
+
+    @staticmethod
+    def _record_failure(fireflies_id, error):
+        """Releases the lease and schedules the next attempt with exponential backoff."""
+        db.session.rollback()
+        state = db.session.get(TranscriptFetchState, fireflies_id)
+        if state is None:
+            return
+
+        config = current_app.config
+        state.attempts += 1
+        delay = min(
+            config['TRANSCRIPT_FETCH_BACKOFF_BASE'] * (2 ** (state.attempts - 1)),
+            config['TRANSCRIPT_FETCH_BACKOFF_MAX']
+        )
+        state.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+        state.lease_until = None
+        state.last_error = error
+        db.session.commit()
+        logger.info(f"Transcript {fireflies_id} not available (attempt {state.attempts}), next try in {delay:.0f}s")
+
+    @classmethod
+    def prune_if_due(cls):
+        """Deletes fetch state not touched within the retention window, at most once per interval."""
+        interval = current_app.config['TRANSCRIPT_FETCH_PRUNE_INTERVAL']
+        with cls._prune_lock:
+            now = time.monotonic()
+            if cls._last_pruned is not None and now - cls._last_pruned < interval:
+                return
+            cls._last_pruned = now
+
+        now = datetime.utcnow()
+        cutoff = now - timedelta(days=current_app.config['TRANSCRIPT_FETCH_RETENTION_DAYS'])
+        try:
+            deleted = TranscriptFetchState.query.filter(
+                TranscriptFetchState.updated_at < cutoff,
+                or_(TranscriptFetchState.lease_until.is_(None), TranscriptFetchState.lease_until <= now)
+            ).delete(synchronize_session=False)
+            db.session.commit()
+            if deleted:
+                logger.info(f"Pruned {deleted} transcript fetch states older than {cutoff.isoformat()}")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to prune transcript fetch state: {str(e)}")
+
+    @staticmethod
+    def reset(fireflies_id):
+        """Clears the fetch state once a transcript has been stored."""
+        TranscriptFetchState.query.filter(TranscriptFetchState.fireflies_id == fireflies_id).delete(synchronize_session=False)
+        db.session.commit()
@@ -0,0 +1,149 @@
+import logging
+import zlib
+from flask import current_app
+from sqlalchemy import insert
+from app.models import db, TranscriptSentence
+from app.services.search_service import TranscriptSearchService
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptStore:
+    """Stores transcripts as sentence rows plus a compressed full-text blob."""
+
+    COMPRESSION_LEVEL = 6
+
+    @staticmethod
+    def format_line(speaker, text):
+        """Formats a sentence the way it appears in the full-text transcript."""
+        return f"{speaker or 'Unknown'}: {text}"
+
+    @staticmethod
+    def save_sentences(meeting, sentences, batch_size=None):
+        """
+        Replaces a meeting's transcript with the given sentences.
+
+        Writes one transcript_sentences row per sentence, the compressed
+        full text to Meeting.transcript_blob and refreshes the search index.
+        Sentences are consumed lazily: rows are inserted in batches of
+        TRANSCRIPT_INSERT_BATCH_SIZE and the text is compressed as it goes,
+        so memory does not grow with the transcript length.
+        The caller commits the session.
+
+        Args:
+            meeting (Meeting): Meeting to update
+            sentences (iterable): Dicts with "speaker", "text" and optional
+                "start_time"/"end_time"; sentences without text are skipped
+            batch_size (int, optional): Overrides TRANSCRIPT_INSERT_BATCH_SIZE
+
+        Returns:
+            dict: sentences, bytes (uncompressed) and compressed_bytes stored
+        """
+        batch_size = batch_size or current_app.config['TRANSCRIPT_INSERT_BATCH_SIZE']
+        TranscriptSentence.query.filter(TranscriptSentence.meeting_pk == meeting.id).delete(synchronize_session=False)
+
+        compressor = zlib.compressobj(TranscriptStore.COMPRESSION_LEVEL)
+        compressed = []
+        count = 0
+        size = 0
+        rows = []
+        for sentence in sentences:
+            text = sentence.get("text")
+            if not text:
+                continue
+            speaker = sentence.get("speaker") or "Unknown"
+            rows.append({
+                "meeting_pk": meeting.id,
+                "sentence_index": count,
+                "speaker": speaker,
+                "text": text,
+                "start_time": sentence.get("start_time"),
+                "end_time": sentence.get("end_time")
+            })
+            line = TranscriptStore.format_line(speaker, text).encode("utf-8")
+            if count:
+                line = b"\n" + line
+            chunk = compressor.compress(line)
+            if chunk:
+                compressed.append(chunk)
+            size += len(line)
+            count += 1
+            if len(rows) >= batch_size:
+                db.session.execute(insert(TranscriptSentence), rows)
+                rows = []
+        if rows:
+            db.session.execute(insert(TranscriptSentence), rows)
+        compressed.append(compressor.flush())
+        blob = b"".join(compressed)
+
+        # An empty transcript keeps the meeting pending, like an empty text column did
+        meeting.transcript_blob = blob if count else None
+        meeting.transcription = None
+        meeting.sentence_count = count
+        meeting.transcript_size = size
+        TranscriptSearchService.index_meeting(meeting)
+        logger.info(f"Stored {count} sentences for meeting {meeting.id} ({size} bytes, {len(blob)} compressed)")
+        return {"sentences": count, "bytes": size, "compressed_bytes": len(blob)}
+
+    @staticmethod
+    def parse_text(text):
+        """
+        Splits a "speaker: text" transcript into sentence dicts.
+
+        Args:
+            text (str): Transcript with one sentence per line
+
+        Returns:
+            list: Sentence dicts accepted by save_sentences
+        """
+        sentences = []
+        for line in (text or "").splitlines():
+            if not line.strip():
+                continue
+            speaker, separator, content = line.partition(":")
+            if separator and speaker.strip():
+                sentences.append({"speaker": speaker.strip(), "text": content.strip()})
+            else:
+                sentences.append({"speaker": None, "text": line.strip()})
+        return sentences
+
+    @staticmethod
+    def save_text(meeting, text):
+        """Replaces a meeting's transcript with a plain "speaker: text" transcript."""
+        return TranscriptStore.save_sentences(meeting, TranscriptStore.parse_text(text))
+
+    @staticmethod
+    def get_sentence_range(meeting, start, end):
+        """
+        Reads sentences [start, end) of a meeting's transcript.
+
+        Only the requested rows are read; the full-text blob is not loaded.
+        Legacy meetings that only have the uncompressed text column are split
+        on the fly.
+
+        Args:
+            meeting (Meeting): Meeting to read
+            start (int): First sentence index (inclusive)
+            end (int): Last sentence index (exclusive)
+
+        Returns:
+            list: Sentence dicts with index, speaker, text, start_time, end_time
+        """
+        if meeting.sentence_count is None:
+            legacy = TranscriptStore.parse_text(meeting.transcription)
+            return [
+                {"index": i, "speaker": s["speaker"], "text": s["text"], "start_time": None, "end_time": None}
+                for i, s in enumerate(legacy) if start <= i < end
+            ]
+
+        sentences = (
+            TranscriptSentence.query
+            .filter(
+                TranscriptSentence.meeting_pk == meeting.id,
+                TranscriptSentence.sentence_index >= start,
+                TranscriptSentence.sentence_index < end
+            )
+            .order_by(TranscriptSentence.sentence_index)
+            .all()
+        )
+        return [sentence.to_dict() for sentence in sentences]
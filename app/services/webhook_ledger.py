@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from app.models import db, Job, WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookLedger:
+    """Idempotency ledger for incoming webhooks, keyed by (meeting ID, event type).
+
+    The first delivery of an event is recorded and handed to the job queue;
+    redeliveries are recognized by the unique index and acknowledged without
+    an outbound call or a transcript rewrite. Entries older than
+    WEBHOOK_LEDGER_RETENTION_DAYS are pruned from the intake path at most once
+    per WEBHOOK_LEDGER_PRUNE_INTERVAL per process.
+    """
+
+    # A delivery without a job yet is assumed to be mid-intake for this long
+    INTAKE_GRACE_SECONDS = 60
+
+    _last_pruned = None
+    _prune_lock = threading.Lock()
+
+    @classmethod
+    def accept(cls, meeting_id, event_type, enqueue):
+        """
+        Records a webhook event and enqueues its processing unless it is a duplicate.
+
+        Args:
+            meeting_id (str): Fireflies transcript ID from the payload
+            event_type (str): Event type from the payload
+            enqueue (callable): Called without arguments to enqueue the job; returns the Job
+
+        Returns:
+            tuple: (event, job, duplicate) where job is None for duplicates of
+                processed events or events still being taken in
+        """
+        cls.prune_if_due()
+
+        try:
+            event = WebhookEvent(meeting_id=meeting_id, event_type=event_type, status='received')
+            db.session.add(event)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            event = WebhookEvent.query.filter_by(meeting_id=meeting_id, event_type=event_type).first()
+            if event is None:
+                # Pruned in between, treat as new
+                return cls.accept(meeting_id, event_type, enqueue)
+            if event.status == 'processed':
+                return event, None, True
+            job = db.session.get(Job, event.job_id) if event.job_id else None
+            if job and job.status in ('queued', 'running', 'done'):
+                return event, job, True
+            if not job and event.received_at > datetime.utcnow() - timedelta(seconds=cls.INTAKE_GRACE_SECONDS):
+                return event, None, True
+            # The earlier attempt failed for good, let this delivery try again
+            logger.info(f"Retrying {event_type} for {meeting_id}, previous processing failed")
+
+        job = enqueue()
+        event.job_id = job.id
+        db.session.commit()
+        return event, job, False
+
+    @staticmethod
+    def mark_processed(meeting_id, event_type):
+        """Marks a recorded event as processed so later deliveries are ignored."""
+        db.session.execute(
+            update(WebhookEvent)
+            .where(WebhookEvent.meeting_id == meeting_id, WebhookEvent.event_type == event_type)
+            .values(status='processed', processed_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+    @classmethod
+    def prune_if_due(cls):
+        """Deletes ledger entries past the retention window, at most once per interval."""
+        interval = current_app.config['WEBHOOK_LEDGER_PRUNE_INTERVAL']
+        with cls._prune_lock:
+            now = time.monotonic()
+            if cls._last_pruned is not None and now - cls._last_pruned < interval:
+                return
+            cls._last_pruned = now
+
+        cutoff = datetime.utcnow() - timedelta(days=current_app.config['WEBHOOK_LEDGER_RETENTION_DAYS'])
+        try:
+            deleted = WebhookEvent.query.filter(WebhookEvent.received_at < cutoff).delete(synchronize_session=False)
+            db.session.commit()
+            if deleted:
+                logger.info(f"Pruned {deleted} webhook ledger entries older than {cutoff.isoformat()}")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to prune webhook ledger: {str(e)}")
@@ -1,5 +1,8 @@
 // Configuration
 const API_BASE_URL = ''; // Leave empty for relative URLs, or set to your API server URL if different
+const EVENTS_RECONNECT_DELAY = 60000; // Retry a rejected event stream after this many ms (matches EVENTS_RETRY_AFTER)
+const MEETINGS_PAGE_SIZE = 50; // Meetings loaded at first and per "Load More" click
+const MEETINGS_MAX_PAGE_SIZE = 200; // Largest page the API returns (matches MEETINGS_MAX_PAGE_SIZE)
 
 // State management
 let currentMeetingId = null;
@@ -8,7 +11,12 @@ let meetingData = {};
 let projectId = null;
 let projectData = null;
 let allMeetings = [];
+let meetingsTotal = 0;
+let meetingsCursor = null;
 let currentFilter = 'all';
+let eventSource = null;
+let eventsConnected = false;
+let eventsReconnectTimer = null;
 
 // DOM Elements
 const loaderScreen = document.getElementById('loaderScreen');
@@ -29,6 +37,7 @@ const transcriptContent = document.getElementById('transcriptContent');
 
 const listProjectId = document.getElementById('listProjectId');
 const meetingsList = document.getElementById('meetingsList');
+const loadMoreMeetingsButton = document.getElementById('loadMoreMeetingsButton');
 const statusSummary = document.getElementById('statusSummary');
 const filterControls = document.getElementById('filterControls');
 
@@ -104,9 +113,11 @@ function startPolling(projectId, meetingId) {
         clearInterval(pollingInterval);
     }
     
-    // Set up polling every 10 seconds
+    // Set up polling every 10 seconds, skipped while the event stream is connected
     pollingInterval = setInterval(() => {
-        checkMeetingStatus(projectId, meetingId);
+        if (!eventsConnected) {
+            checkMeetingStatus(projectId, meetingId);
+        }
     }, 10000);
 }
 
@@ -117,6 +128,68 @@ function stopPolling() {
     }
 }
 
+// Subscribe to server-pushed project events (falls back to polling when unavailable)
+function connectProjectEvents(projectId) {
+    if (!window.EventSource || !projectId) return;
+    
+    if (eventSource) {
+        eventSource.close();
+    }
+    
+    eventSource = new EventSource(`${API_BASE_URL}/projects/${projectId}/events`);
+    
+    eventSource.onopen = () => {
+        const wasConnected = eventsConnected;
+        eventsConnected = true;
+        
+        // Catch up on anything missed while the stream was down
+        if (!wasConnected) {
+            if (currentMeetingId && waitingScreen.classList.contains('active')) {
+                checkMeetingStatus(projectId, currentMeetingId);
+            } else if (meetingListScreen.classList.contains('active')) {
+                refreshMeetings();
+            }
+        }
+    };
+    
+    eventSource.onerror = () => {
+        // EventSource reconnects by itself; poll in the meantime
+        eventsConnected = false;
+        
+        // A rejected stream (e.g. 503 when the server is at its stream limit) is not retried
+        // by the browser, so try again later and keep polling until then
+        if (eventSource.readyState === EventSource.CLOSED) {
+            clearTimeout(eventsReconnectTimer);
+            eventsReconnectTimer = setTimeout(() => connectProjectEvents(projectId), EVENTS_RECONNECT_DELAY);
+        }
+    };
+    
+    eventSource.addEventListener('meeting.transcribed', async (e) => {
+        const event = JSON.parse(e.data);
+        
+        const meetingIndex = allMeetings.findIndex(m => m.id === event.id);
+        if (meetingIndex !== -1) {
+            allMeetings[meetingIndex].has_transcription = true;
+        }
+        
+        if (currentMeetingId && String(event.id) === String(currentMeetingId)
+            && waitingScreen.classList.contains('active')) {
+            await checkMeetingStatus(projectId, currentMeetingId);
+        } else if (meetingListScreen.classList.contains('active')) {
+            await refreshMeetings();
+        }
+    });
+    
+    eventSource.addEventListener('project.validated', async () => {
+        await loadProjectDetails(projectId);
+    });
+}
+
+// List responses carry has_transcription instead of the full transcript
+function hasTranscript(meeting) {
+    return !!(meeting.has_transcription || meeting.transcription);
+}
+
 // Get parameters from URL
 function getProjectIdFromUrl() {
     const urlParams = new URLSearchParams(window.location.search);
@@ -130,13 +203,13 @@ function getMeetingIdFromUrl() {
 
 // Calculate status summary
 function updateStatusSummary(meetings) {
-    // Count meetings by status
-    let totalCount = meetings.length;
+    // Count meetings by status; only loaded pages are counted by status
+    let totalCount = Math.max(meetingsTotal, meetings.length);
     let completedCount = 0;
     let pendingCount = 0;
     
     meetings.forEach(meeting => {
-        if (meeting.transcription) {
+        if (hasTranscript(meeting)) {
             completedCount++;
         } else {
             pendingCount++;
@@ -158,6 +231,18 @@ function updateStatusSummary(meetings) {
             <div><span class="status-indicator status-pending"></span>Pending</div>
         </div>
     `;
+    
+    if (meetings.length < totalCount) {
+        statusSummary.insertAdjacentHTML('beforeend', `
+            <div class="status-summary-item">
+                <div class="status-count">${meetings.length}</div>
+                <div>Loaded</div>
+            </div>
+        `);
+    }
+    
+    // Offer the next page only while the server has more
+    loadMoreMeetingsButton.classList.toggle('hidden', !meetingsCursor);
 }
 
 // Filter meetings
@@ -177,8 +262,8 @@ function filterMeetings(filter) {
     // Apply filter to meetings list
     const filteredMeetings = allMeetings.filter(meeting => {
         if (filter === 'all') return true;
-        if (filter === 'completed') return !!meeting.transcription;
-        if (filter === 'pending') return !meeting.transcription;
+        if (filter === 'completed') return hasTranscript(meeting);
+        if (filter === 'pending') return !hasTranscript(meeting);
         return true;
     });
     
@@ -214,10 +299,10 @@ function renderMeetingsList(meetings) {
         title.textContent = meetingTitle;
         
         // Add prominent status badge
-        const hasTranscript = !!meeting.transcription;
+        const isCompleted = hasTranscript(meeting);
         const statusBadge = document.createElement('div');
-        statusBadge.className = `status-badge ${hasTranscript ? 'status-completed' : 'status-pending'}`;
-        statusBadge.textContent = hasTranscript ? 'Completed' : 'Pending';
+        statusBadge.className = `status-badge ${isCompleted ? 'status-completed' : 'status-pending'}`;
+        statusBadge.textContent = isCompleted ? 'Completed' : 'Pending';
         meetingCard.appendChild(statusBadge);
         
         // Add meeting details
@@ -226,8 +311,8 @@ function renderMeetingsList(meetings) {
             <p><strong>Date:</strong> ${formatDate(meeting.meeting_datetime)}</p>
             <p><strong>URL:</strong> ${meeting.meeting_url}</p>
             <p><strong>Status:</strong> 
-                <span class="status-indicator ${hasTranscript ? 'status-complete' : 'status-pending'}"></span>
-                ${hasTranscript ? 'Completed' : 'Pending'}
+                <span class="status-indicator ${isCompleted ? 'status-complete' : 'status-pending'}"></span>
+                ${isCompleted ? 'Completed' : 'Pending'}
             </p>
         `;
         
@@ -236,7 +321,7 @@ function renderMeetingsList(meetings) {
         meetingCard.appendChild(details);
         
         // Add click handler to view the meeting
-        meetingCard.addEventListener('click', () => {
+        meetingCard.addEventListener('click', async () => {
             // Stop any existing polling
             stopPolling();
             
@@ -245,8 +330,16 @@ function renderMeetingsList(meetings) {
             meetingData = meeting;
             
             // Show the appropriate screen based on meeting status
-            if (hasTranscript) {
-                displayTranscript(meeting);
+            if (isCompleted) {
+                // The list does not include transcripts, load the full meeting
+                try {
+                    showScreen('loaderScreen');
+                    meetingData = await getMeeting(meeting.project_id, meeting.id);
+                    displayTranscript(meetingData);
+                } catch (error) {
+                    showError(error.message || 'Failed to load transcript');
+                    showScreen('meetingListScreen');
+                }
             } else {
                 // Meeting is in progress
                 displayMeetingUrl.textContent = meeting.meeting_url;
@@ -264,16 +357,21 @@ function renderMeetingsList(meetings) {
     });
 }
 
-// Get meetings by project ID
-async function getMeetingsByProjectId(projectId) {
+// Get one page of a project's meetings ({meetings, total, next_cursor}), newest first
+async function getMeetingsByProjectId(projectId, cursor = null, limit = MEETINGS_PAGE_SIZE) {
     try {
-        const response = await fetch(`${API_BASE_URL}/projects/${projectId}/meetings`);
+        const params = new URLSearchParams({ limit: limit });
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        
+        const response = await fetch(`${API_BASE_URL}/projects/${projectId}/meetings?${params}`);
         
         if (!response.ok) {
             const errorData = await response.json();
             throw new Error(errorData.error || 'Failed to retrieve meetings for project');
         }
-
+        
         return await response.json();
     } catch (error) {
         console.error('Error retrieving meetings for project:', error);
@@ -404,6 +502,19 @@ function renderProjectDetails(screenType) {
         container.appendChild(validationSection);
     }
     
+    // Validation runs in the background; the project.validated event reloads the details
+    if (projectData.validation_status === 'pending') {
+        const pendingNotice = document.createElement('div');
+        pendingNotice.className = 'project-details mb-4';
+        pendingNotice.innerHTML = `
+            <div class="project-details-header">
+                <h3>Brief Validation</h3>
+                <span>Validation in progress...</span>
+            </div>
+        `;
+        container.appendChild(pendingNotice);
+    }
+    
     // Add toggle functionality to show/hide buttons
     container.querySelectorAll('.project-details-toggle').forEach(button => {
         button.addEventListener('click', () => {
@@ -535,9 +646,13 @@ function renderValidationReport(validationReport) {
 }
 
 // Function to display the meetings list
-function displayMeetingsList(meetings, projectId) {
+function displayMeetingsList(page, projectId) {
+    const meetings = page.meetings;
+    
     // Save all meetings for filtering
     allMeetings = meetings;
+    meetingsTotal = page.total;
+    meetingsCursor = page.next_cursor;
     
     // Update project ID display
     listProjectId.textContent = projectId;
@@ -606,7 +721,7 @@ async function checkMeetingStatus(projectId, meetingId) {
             // Update the meeting in the list if we're polling for status
             const meetingIndex = allMeetings.findIndex(m => m.id === meetingData.id);
             if (meetingIndex !== -1) {
-                allMeetings[meetingIndex] = meetingData;
+                allMeetings[meetingIndex] = { ...meetingData, has_transcription: true };
             }
             
             return true;
@@ -619,16 +734,20 @@ async function checkMeetingStatus(projectId, meetingId) {
     }
 }
 
-// Refresh all meetings data
+// Refresh the loaded meetings (as many as are shown, up to one full page)
 async function refreshMeetings() {
     if (!projectId) return;
     
     try {
-        const meetings = await getMeetingsByProjectId(projectId);
+        const limit = Math.min(Math.max(allMeetings.length, MEETINGS_PAGE_SIZE), MEETINGS_MAX_PAGE_SIZE);
+        const page = await getMeetingsByProjectId(projectId, null, limit);
+        const meetings = page.meetings;
         
         if (meetings && Array.isArray(meetings)) {
             // Update our meetings list
             allMeetings = meetings;
+            meetingsTotal = page.total;
+            meetingsCursor = page.next_cursor;
             
             // Update displays
             updateStatusSummary(meetings);
@@ -644,6 +763,27 @@ async function refreshMeetings() {
     }
 }
 
+// Append the next page of meetings to the list
+async function loadMoreMeetings() {
+    if (!projectId || !meetingsCursor) return;
+    
+    try {
+        loadMoreMeetingsButton.disabled = true;
+        const page = await getMeetingsByProjectId(projectId, meetingsCursor);
+        
+        allMeetings = allMeetings.concat(page.meetings);
+        meetingsTotal = page.total;
+        meetingsCursor = page.next_cursor;
+        
+        updateStatusSummary(allMeetings);
+        filterMeetings(currentFilter);
+    } catch (error) {
+        showError(`Failed to load more meetings: ${error.message}`);
+    } finally {
+        loadMoreMeetingsButton.disabled = false;
+    }
+}
+
 // Load project details
 async function loadProjectDetails(projectId) {
     try {
@@ -851,6 +991,8 @@ backToListFromTranscriptButton.addEventListener('click', async function() {
     showScreen('meetingListScreen');
 });
 
+loadMoreMeetingsButton.addEventListener('click', loadMoreMeetings);
+
 // Set up filter button event listeners
 filterControls.addEventListener('click', function(e) {
     if (e.target.classList.contains('filter-button')) {
@@ -861,9 +1003,9 @@ filterControls.addEventListener('click', function(e) {
     }
 });
 
-// Auto-refresh meeting list every 30 seconds
+// Auto-refresh meeting list every 30 seconds when the event stream is not connected
 setInterval(async () => {
-    if (meetingListScreen.classList.contains('active')) {
+    if (!eventsConnected && meetingListScreen.classList.contains('active')) {
         await refreshMeetings();
     }
 }, 30000);
@@ -878,8 +1020,10 @@ document.addEventListener('DOMContentLoaded', async function() {
         projectId = getProjectIdFromUrl();
         const urlMeetingId = getMeetingIdFromUrl();
         
-        // Load project details if project ID is available
+        // Load project details and subscribe to events if project ID is available
         if (projectId) {
+            connectProjectEvents(projectId);
+            
             try {
                 await loadProjectDetails(projectId);
             } catch (error) {
@@ -926,7 +1070,7 @@ document.addEventListener('DOMContentLoaded', async function() {
                 // Get meetings for this project
                 const projectMeetings = await getMeetingsByProjectId(projectId);
                 
-                if (projectMeetings && projectMeetings.length > 0) {
+                if (projectMeetings && projectMeetings.meetings.length > 0) {
                     // Display the meetings list
                     displayMeetingsList(projectMeetings, projectId);
                     return; // Exit initialization
@@ -0,0 +1,91 @@
+import re
+
+HEADING_PATTERN = re.compile(r"^#{1,6}\s")
+
+
+class BriefChunker:
+    """Splits large markdown project briefs into heading-aligned chunks."""
+
+    # Rough average for English text with GPT tokenizers
+    CHARS_PER_TOKEN = 4
+
+    @staticmethod
+    def estimate_tokens(text):
+        """Cheap token estimate used to decide whether a brief needs chunking."""
+        return len(text or "") // BriefChunker.CHARS_PER_TOKEN + 1
+
+    @staticmethod
+    def split_sections(text):
+        """
+        Splits markdown into sections, each starting at a heading line.
+
+        Text before the first heading becomes its own section.
+
+        Args:
+            text (str): Markdown requirements
+
+        Returns:
+            list: Section strings in document order
+        """
+        sections = []
+        current = []
+        for line in (text or "").splitlines():
+            if HEADING_PATTERN.match(line) and current:
+                sections.append("\n".join(current))
+                current = []
+            current.append(line)
+        if current:
+            sections.append("\n".join(current))
+        return [section for section in sections if section.strip()]
+
+    @staticmethod
+    def _split_oversized(section, max_tokens):
+        """Splits a section that alone exceeds max_tokens at paragraph, then line boundaries."""
+        pieces = []
+        current = ""
+        blocks = re.split(r"\n\s*\n", section)
+        separator = "\n\n"
+        if any(BriefChunker.estimate_tokens(block) > max_tokens for block in blocks):
+            blocks = section.splitlines()
+            separator = "\n"
+        for block in blocks:
+            candidate = f"{current}{separator}{block}" if current else block
+            if current and BriefChunker.estimate_tokens(candidate) > max_tokens:
+                pieces.append(current)
+                current = block
+            else:
+                current = candidate
+        if current:
+            pieces.append(current)
+        return pieces
+
+    @staticmethod
+    def chunk(text, max_tokens):
+        """
+        Packs consecutive sections into chunks of at most max_tokens (estimated).
+
+        Args:
+            text (str): Markdown requirements
+            max_tokens (int): Target size of a chunk
+
+        Returns:
+            list: Chunk strings; a single chunk if the text is small enough
+        """
+        chunks = []
+        current = ""
+        for section in BriefChunker.split_sections(text):
+            if BriefChunker.estimate_tokens(section) > max_tokens:
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.extend(BriefChunker._split_oversized(section, max_tokens))
+                continue
+            candidate = f"{current}\n\n{section}" if current else section
+            if current and BriefChunker.estimate_tokens(candidate) > max_tokens:
+                chunks.append(current)
+                current = section
+            else:
+                current = candidate
+        if current:
+            chunks.append(current)
+        return chunks
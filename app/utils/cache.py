@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe in-process LRU cache with stale-while-revalidate semantics.
+    
+    Entries younger than soft_ttl are fresh. Between soft_ttl and hard_ttl
+    they are stale: still served, but the caller should refresh them in the
+    background. Entries older than hard_ttl are treated as missing.
+    """
+    
+    FRESH = "fresh"
+    STALE = "stale"
+    
+    def __init__(self, max_entries, soft_ttl, hard_ttl):
+        """
+        Args:
+            max_entries (int): Maximum number of entries before the least recently used is evicted
+            soft_ttl (float): Seconds an entry is served without refreshing
+            hard_ttl (float): Seconds after which an entry is no longer served
+        """
+        self.max_entries = max_entries
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """
+        Looks up an entry.
+        
+        Returns:
+            tuple: (value, state) where state is FRESH, STALE or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, None
+            value, stored_at = entry
+            age = time.time() - stored_at
+            if age >= self.hard_ttl:
+                del self._entries[key]
+                return None, None
+            self._entries.move_to_end(key)
+            return value, (self.FRESH if age < self.soft_ttl else self.STALE)
+    
+    def set(self, key, value, stored_at=None):
+        """
+        Stores an entry.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            stored_at (float, optional): Epoch seconds the value was produced at (defaults to now)
+        """
+        with self._lock:
+            self._entries[key] = (value, stored_at if stored_at is not None else time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, key):
+        """Removes an entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def begin_refresh(self, key):
+        """
+        Marks a key as being refreshed.
+        
+        Returns:
+            bool: True if the caller should run the refresh, False if one is already running
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+    
+    def end_refresh(self, key):
+        """Clears the refresh marker set by begin_refresh."""
+        with self._lock:
+            self._refreshing.discard(key)
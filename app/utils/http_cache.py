@@ -0,0 +1,75 @@
+import hashlib
+from datetime import timezone
+from flask import current_app, request
+
+
+class HttpCache:
+    """Validators and Cache-Control for conditional GETs.
+
+    Routes build an ETag from cheap version data (row ids, update
+    timestamps, counts), call not_modified() before loading or serializing
+    anything large, and pass the full response through apply() otherwise.
+    """
+
+    # Cached copies may be stored but must be revalidated before every use
+    REVALIDATE = "no-cache"
+
+    @staticmethod
+    def etag(*parts):
+        """Builds an opaque ETag from version data such as ids, timestamps and counts."""
+        key = "|".join("" if part is None else str(part) for part in parts)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def immutable():
+        """Cache-Control for content that no longer changes, e.g. completed transcripts."""
+        return f"public, max-age={current_app.config['IMMUTABLE_CACHE_MAX_AGE']}, immutable"
+
+    @staticmethod
+    def _matches(etag, last_modified):
+        """Whether the request's If-None-Match (or, without it, If-Modified-Since) matches."""
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(etag)
+        if last_modified and request.if_modified_since:
+            # HTTP dates have one-second resolution
+            modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+            return modified <= request.if_modified_since
+        return False
+
+    @staticmethod
+    def apply(response, etag, last_modified=None, cache_control=REVALIDATE):
+        """
+        Sets the validators and Cache-Control header on a response.
+
+        Args:
+            response (Response): Response to update
+            etag (str): Value from HttpCache.etag
+            last_modified (datetime, optional): Naive UTC modification time
+            cache_control (str, optional): Cache-Control header value
+
+        Returns:
+            Response: The same response
+        """
+        response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+        response.headers["Cache-Control"] = cache_control
+        return response
+
+    @staticmethod
+    def not_modified(etag, last_modified=None, cache_control=REVALIDATE):
+        """
+        Returns an empty 304 response if the client's cached copy is current.
+
+        Args:
+            etag (str): Value from HttpCache.etag
+            last_modified (datetime, optional): Naive UTC modification time
+            cache_control (str, optional): Cache-Control header value
+
+        Returns:
+            Response: 304 response, or None if the full response must be sent
+        """
+        if not HttpCache._matches(etag, last_modified):
+            return None
+        response = current_app.response_class(status=304)
+        return HttpCache.apply(response, etag, last_modified, cache_control)
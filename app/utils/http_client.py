@@ -0,0 +1,175 @@
+import logging
+import os
+import random
+import threading
+import time
+import requests
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from flask import current_app
+from app.utils.metrics import Metrics
+from app.utils.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUS_CODES = {502, 503, 504}
+
+
+class HttpClient:
+    """Process-wide HTTP client with keep-alive connection pools for outbound calls."""
+
+    _session = None
+    _pid = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def session(cls):
+        """
+        Returns the shared session for the current process, creating it on first use.
+
+        The session is recreated after a fork so that gunicorn workers never
+        share sockets inherited from the parent process.
+
+        Returns:
+            requests.Session: Session with per-host connection pools
+        """
+        if cls._session is not None and cls._pid == os.getpid():
+            return cls._session
+
+        with cls._lock:
+            if cls._session is None or cls._pid != os.getpid():
+                config = current_app.config
+                adapter = HTTPAdapter(
+                    pool_connections=config['HTTP_POOL_CONNECTIONS'],
+                    pool_maxsize=config['HTTP_POOL_MAXSIZE'],
+                    max_retries=0
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                cls._session = session
+                cls._pid = os.getpid()
+                logger.info(f"Created HTTP session for process {cls._pid}")
+        return cls._session
+
+    @classmethod
+    def request(cls, method, url, idempotent=None, timeout=None, upstream=None, operation=None, **kwargs):
+        """
+        Sends a request through the shared session.
+
+        Idempotent calls are retried on connection errors and 502/503/504
+        responses with full-jitter exponential backoff. Calls to a rate-limited
+        upstream wait for a RateLimiter token first, and 429 responses are
+        retried (they were not processed) once the limiter allows it.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            idempotent (bool, optional): Whether the call is safe to retry.
+                Defaults to True for GET/HEAD/OPTIONS/PUT/DELETE.
+            timeout (float or tuple, optional): Overrides the configured (connect, read) timeout
+            upstream (str, optional): RATE_LIMITS name of the API, e.g. "fireflies"
+            operation (str, optional): Call name for the upstream metrics, defaults to the method
+            **kwargs: Passed through to requests.Session.request
+
+        Returns:
+            requests.Response: The final response
+
+        Raises:
+            requests.exceptions.RequestException: If the last attempt failed to connect
+                (RateLimitExceeded if no rate limit token became available)
+        """
+        config = current_app.config
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        if timeout is None:
+            timeout = (config['HTTP_CONNECT_TIMEOUT'], config['HTTP_READ_TIMEOUT'])
+        max_retries = config['HTTP_MAX_RETRIES'] if idempotent else 0
+
+        started = time.perf_counter()
+        response = None
+        try:
+            response = cls._send(method, url, timeout, max_retries, upstream, **kwargs)
+            return response
+        finally:
+            Metrics.observe_upstream(
+                upstream or urlparse(url).hostname or "unknown",
+                operation or method.lower(),
+                time.perf_counter() - started,
+                response.status_code if response is not None else None
+            )
+
+    @classmethod
+    def _send(cls, method, url, timeout, max_retries, upstream, **kwargs):
+        """Runs the attempts of a request, see request()."""
+        config = current_app.config
+        session = cls.session()
+        attempt = 0
+        while True:
+            try:
+                if upstream:
+                    RateLimiter.acquire(upstream)
+                response = session.request(method, url, timeout=timeout, **kwargs)
+                if upstream:
+                    RateLimiter.observe(upstream, response)
+                    if response.status_code == 429 and attempt < config['HTTP_MAX_RETRIES']:
+                        # The limiter now holds the bucket for Retry-After, wait for it
+                        attempt += 1
+                        logger.warning(f"{method} {url} rate limited, retry {attempt}/{config['HTTP_MAX_RETRIES']}")
+                        response.close()
+                        continue
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+                    return response
+                reason = f"HTTP {response.status_code}"
+                response.close()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= max_retries:
+                    raise
+                reason = str(e)
+
+            delay = random.uniform(0, config['HTTP_BACKOFF_FACTOR'] * (2 ** attempt))
+            attempt += 1
+            logger.warning(f"{method} {url} failed ({reason}), retry {attempt}/{max_retries} in {delay:.2f}s")
+            time.sleep(delay)
+
+    @classmethod
+    def get(cls, url, **kwargs):
+        """Sends a GET request through the shared session."""
+        return cls.request("GET", url, **kwargs)
+
+    @classmethod
+    def post(cls, url, **kwargs):
+        """Sends a POST request through the shared session (not retried unless idempotent=True)."""
+        return cls.request("POST", url, **kwargs)
+
+    @classmethod
+    def stats(cls):
+        """
+        Reports connection reuse per host for the current process.
+
+        Returns:
+            dict: {host: {"requests": int, "connections": int, "reused": int}}
+        """
+        session = cls._session
+        if session is None or cls._pid != os.getpid():
+            return {}
+
+        stats = {}
+        seen = set()
+        for adapter in session.adapters.values():
+            if id(adapter) in seen:
+                continue
+            seen.add(id(adapter))
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = f"{pool.scheme}://{pool.host}:{pool.port}"
+                entry = stats.setdefault(host, {"requests": 0, "connections": 0, "reused": 0})
+                entry["requests"] += pool.num_requests
+                entry["connections"] += pool.num_connections
+                entry["reused"] += max(pool.num_requests - pool.num_connections, 0)
+        return stats
@@ -0,0 +1,111 @@
+import re
+import uuid
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class RawJSON:
+    """Already-serialized JSON text that is embedded into responses as-is.
+
+    Used for JSON stored in text columns (e.g. Project.validation_data), so
+    it is not parsed into Python objects only to be encoded again.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+    def __repr__(self):
+        return f"RawJSON({self.text[:40]!r})"
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider encoding with orjson when it is installed.
+
+    Output matches DefaultJSONProvider: dates are formatted as HTTP dates,
+    keys are sorted if sort_keys is set, and anything orjson cannot encode
+    (e.g. integers above 64 bits or unsupported json.dumps arguments) falls
+    back to the stdlib encoder. RawJSON values are spliced in unparsed.
+    """
+
+    def _orjson_options(self, kwargs):
+        """orjson options equivalent to the json.dumps arguments, or None if orjson can't honour them."""
+        if orjson is None:
+            return None
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        for key, value in kwargs.items():
+            if key == "indent" and value == 2:
+                options |= orjson.OPT_INDENT_2
+            elif key == "separators" and tuple(value) == (",", ":"):
+                continue
+            elif key == "sort_keys":
+                continue
+            else:
+                return None
+        if kwargs.get("sort_keys", self.sort_keys):
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps_bytes(self, obj, **kwargs):
+        """
+        Serializes obj to UTF-8 encoded JSON.
+
+        Args:
+            obj: Value to serialize
+            **kwargs: json.dumps arguments (indent, separators, sort_keys)
+
+        Returns:
+            bytes: The JSON document
+        """
+        raw_values = []
+        marker = uuid.uuid4().hex
+        token = f"\x00raw-json-{marker}-"
+
+        def default(value):
+            if isinstance(value, RawJSON):
+                raw_values.append(value.text)
+                return f"{token}{len(raw_values) - 1}"
+            return self.default(value)
+
+        options = self._orjson_options(kwargs)
+        data = None
+        if options is not None:
+            try:
+                data = orjson.dumps(obj, default=default, option=options)
+            except TypeError:
+                raw_values.clear()
+        if data is None:
+            kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            data = super().dumps(obj, default=default, **kwargs).encode("utf-8")
+
+        if raw_values:
+            # Placeholders are JSON strings ("\u0000raw-json-<marker>-<n>"), which no real value can collide with
+            pattern = re.compile(rb'"\\u0000raw-json-' + marker.encode("ascii") + rb'-(\d+)"')
+            data = pattern.sub(lambda match: raw_values[int(match.group(1))].encode("utf-8"), data)
+        return data
+
+    def dumps(self, obj, **kwargs):
+        """Serializes obj to a JSON string."""
+        return self.dumps_bytes(obj, **kwargs).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        """Deserializes JSON text or bytes."""
+        if orjson is not None and not kwargs:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """Builds a JSON response without decoding the encoded body back to str."""
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            data = self.dumps_bytes(obj, indent=2)
+        else:
+            data = self.dumps_bytes(obj, separators=(",", ":"))
+        return self._app.response_class(data + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,40 @@
+import re
+from urllib.parse import urlparse
+
+MEET_CODE_PATTERN = re.compile(r"[a-z]{3}-[a-z]{4}-[a-z]{3}")
+MAX_CODE_LENGTH = 64
+
+
+class MeetLink:
+    """Utilities for normalizing Google Meet links."""
+    
+    @staticmethod
+    def normalize_code(meeting_link):
+        """
+        Extracts the normalized meeting code from a Google Meet link.
+        
+        Scheme, host, query string, fragment, trailing slashes and case are
+        ignored, so "https://meet.google.com/ABC-defg-hij/?authuser=0" and
+        "meet.google.com/abc-defg-hij" both map to "abc-defg-hij". Links without
+        a standard code fall back to their last path segment.
+        
+        Args:
+            meeting_link (str): Google Meet URL
+            
+        Returns:
+            str: Normalized meeting code or None if the link has no path
+        """
+        if not meeting_link:
+            return None
+        
+        link = meeting_link.strip().lower()
+        if "://" not in link:
+            link = f"https://{link}"
+        path = urlparse(link).path.strip("/")
+        
+        match = MEET_CODE_PATTERN.search(path)
+        if match:
+            return match.group(0)
+        
+        segment = path.rsplit("/", 1)[-1]
+        return segment[:MAX_CODE_LENGTH] or None
@@ -0,0 +1,126 @@
+import os
+import time
+from flask import current_app, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from sqlalchemy import event
+
+# Unlabeled gauges open their file in PROMETHEUS_MULTIPROC_DIR as soon as they are defined
+if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+# Seconds; covers fast cached reads up to slow OpenAI validations
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time until the response of an HTTP request was built (streamed bodies excluded)",
+    ["blueprint", "route", "method", "status"],
+    buckets=LATENCY_BUCKETS
+)
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "upstream_request_duration_seconds",
+    "Duration of outbound API calls including retries and rate limit waits",
+    ["upstream", "operation"],
+    buckets=LATENCY_BUCKETS
+)
+UPSTREAM_REQUESTS = Counter(
+    "upstream_requests_total",
+    "Outbound API calls by outcome (status class, or error if no response was received)",
+    ["upstream", "operation", "outcome"]
+)
+# Gauges are summed over the live worker processes in multiprocess mode
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections", "Database connections currently checked out of the pool",
+    multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections", "Checked out connections beyond pool_size",
+    multiprocess_mode="livesum"
+)
+# Every worker has the same pool settings, so summing them would report a size nobody configured
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool_size per process", multiprocess_mode="max")
+DB_POOL_MAX_OVERFLOW = Gauge("db_pool_max_overflow", "Configured max_overflow per process", multiprocess_mode="max")
+
+
+class Metrics:
+    """Prometheus metrics for requests, outbound calls and the database pool.
+
+    When PROMETHEUS_MULTIPROC_DIR is set (as in the Docker image), every
+    gunicorn worker writes its samples to that directory and /metrics
+    aggregates all of them, whichever worker serves the scrape.
+    """
+
+    @staticmethod
+    def init_app(app):
+        """Registers the request timing hooks."""
+        @app.before_request
+        def start_timer():
+            g.metrics_started = time.perf_counter()
+
+        @app.after_request
+        def record_request(response):
+            started = g.pop("metrics_started", None)
+            if started is not None:
+                HTTP_REQUEST_DURATION.labels(
+                    blueprint=request.blueprint or "app",
+                    # The URL rule, not the path, keeps label cardinality bounded
+                    route=request.url_rule.rule if request.url_rule else "unmatched",
+                    method=request.method,
+                    status=str(response.status_code)
+                ).observe(time.perf_counter() - started)
+            return response
+
+    @staticmethod
+    def instrument_engine(engine):
+        """Keeps the pool gauges of this process up to date through pool events."""
+        pool = engine.pool
+        if not hasattr(pool, "checkedout"):
+            # NullPool/StaticPool have nothing to report
+            return
+        DB_POOL_SIZE.set(pool.size())
+        DB_POOL_MAX_OVERFLOW.set(current_app.config['SQLALCHEMY_ENGINE_OPTIONS'].get("max_overflow", 0))
+
+        def record(checked_out):
+            DB_POOL_CHECKED_OUT.set(checked_out)
+            DB_POOL_OVERFLOW.set(max(0, checked_out - pool.size()))
+
+        @event.listens_for(pool, "checkout")
+        def on_checkout(*args):
+            record(pool.checkedout())
+
+        @event.listens_for(pool, "checkin")
+        def on_checkin(*args):
+            # Fired before the connection is handed back to the pool
+            record(max(0, pool.checkedout() - 1))
+
+    @staticmethod
+    def observe_upstream(upstream, operation, duration, status_code=None):
+        """
+        Records one outbound API call.
+
+        Args:
+            upstream (str): API name, e.g. "fireflies"
+            operation (str): Call name within the API, e.g. "transcript"
+            duration (float): Seconds the call took
+            status_code (int, optional): Final response status, None if the call raised
+        """
+        outcome = f"{status_code // 100}xx" if status_code else "error"
+        UPSTREAM_REQUEST_DURATION.labels(upstream=upstream, operation=operation).observe(duration)
+        UPSTREAM_REQUESTS.labels(upstream=upstream, operation=operation, outcome=outcome).inc()
+
+    @staticmethod
+    def render():
+        """
+        Renders all metrics in the Prometheus text format.
+
+        Returns:
+            tuple: (body bytes, content type)
+        """
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,323 @@
+import hmac
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# The request being profiled on this thread, if any
+_state = threading.local()
+
+# Ids sort by start time: <UTC timestamp with microseconds>-<random>
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{12}-[0-9a-f]{8}$")
+
+# Where a stack sample is spending its time, by the innermost matching frame
+SAMPLE_CATEGORIES = (
+    ("sql", ("sqlalchemy", "psycopg", "sqlite3")),
+    ("json", ("json_provider", "orjson", "/json/")),
+    ("http", ("http_client", "rate_limiter", "requests/", "urllib3", "http/client", "socket.py", "ssl.py")),
+)
+
+PARAMS_MAX_LENGTH = 200
+
+
+class _StackSampler(threading.Thread):
+    """Samples the call stack of one thread at a fixed interval."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name="request-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_name, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+class _Recording:
+    """SQL statements, lazy loads and stack samples of one profiled request."""
+
+    def __init__(self, interval):
+        self.started_at = datetime.utcnow()
+        self.id = f"{self.started_at:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+        self.started = time.perf_counter()
+        self.queries = []
+        self.lazy_loads = Counter()
+        self.sampler = _StackSampler(threading.get_ident(), interval)
+        self.sampler.start()
+
+    def add_query(self, statement, parameters, duration, rowcount):
+        self.queries.append({
+            "statement": statement,
+            "parameters": repr(parameters)[:PARAMS_MAX_LENGTH],
+            "duration_ms": round(duration * 1000, 3),
+            # Drivers report -1 when the row count is unknown (e.g. SQLite SELECTs)
+            "rows": rowcount if rowcount is not None and rowcount >= 0 else None,
+        })
+
+
+class RequestProfiler:
+    """Opt-in profiler recording stack samples and SQL for single requests.
+
+    With PROFILER_ENABLED unset nothing is installed. Otherwise a request
+    is profiled when it carries PROFILER_HEADER (whose value must equal
+    PROFILER_TOKEN if one is configured). The profile covers the request
+    until its body was sent, so streamed responses are included, and is
+    written as JSON to PROFILER_DIR, viewable through /profiles.
+    """
+
+    @staticmethod
+    def authorized(value, config):
+        """Whether a PROFILER_HEADER value carries PROFILER_TOKEN (any value if no token is set)."""
+        if value is None:
+            return False
+        token = config['PROFILER_TOKEN']
+        return not token or hmac.compare_digest(value.encode("utf-8"), token.encode("utf-8"))
+
+    @staticmethod
+    def init_app(app):
+        """Installs the request hooks and SQL listeners if the profiler is enabled."""
+        if not app.config['PROFILER_ENABLED']:
+            return
+
+        if not event.contains(Engine, "before_cursor_execute", RequestProfiler._before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", RequestProfiler._before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", RequestProfiler._after_cursor_execute)
+            event.listen(Session, "do_orm_execute", RequestProfiler._on_orm_execute)
+
+        @app.before_request
+        def start_profile():
+            _state.recording = None
+            if request.blueprint == "profiles":
+                # Viewing profiles sends the same header; don't profile that
+                return
+            value = request.headers.get(current_app.config['PROFILER_HEADER'])
+            if not RequestProfiler.authorized(value, current_app.config):
+                return
+            _state.recording = _Recording(current_app.config['PROFILER_INTERVAL'])
+
+        @app.after_request
+        def finish_profile(response):
+            recording = getattr(_state, "recording", None)
+            if recording is None:
+                return response
+            response.headers["X-Profile-Id"] = recording.id
+            handler_ms = (time.perf_counter() - recording.started) * 1000
+            summary = {
+                "method": request.method,
+                "path": request.path,
+                "query_string": request.query_string.decode("utf-8", "replace"),
+                "endpoint": request.endpoint,
+                "status": response.status_code,
+                "handler_ms": round(handler_ms, 1),
+            }
+            app_obj = current_app._get_current_object()
+            # Runs once the body was sent, so streamed responses are profiled too
+            response.call_on_close(lambda: RequestProfiler._finish(app_obj, recording, summary))
+            return response
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if getattr(_state, "recording", None) is not None:
+            conn.info.setdefault("profiler_started", []).append(time.perf_counter())
+
+    @staticmethod
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        recording = getattr(_state, "recording", None)
+        started = conn.info.get("profiler_started")
+        if recording is None or not started:
+            return
+        recording.add_query(statement, parameters, time.perf_counter() - started.pop(), cursor.rowcount)
+
+    @staticmethod
+    def _on_orm_execute(orm_execute_state):
+        recording = getattr(_state, "recording", None)
+        if recording is not None and orm_execute_state.lazy_loaded_from is not None:
+            # The last element of the loader path is the relationship, e.g. Project.meetings
+            recording.lazy_loads[str(orm_execute_state.loader_strategy_path[-1])] += 1
+
+    @staticmethod
+    def _frame_label(filename, function, line):
+        """Short "function (package/module.py:line)" label for a stack frame."""
+        short = "/".join(filename.replace("\\", "/").rsplit("/", 2)[-2:])
+        return f"{function} ({short}:{line})"
+
+    @staticmethod
+    def _category(stack):
+        """Category of a sample: the innermost frame decides, anything else is app code."""
+        for filename, _, _ in reversed(stack):
+            for category, markers in SAMPLE_CATEGORIES:
+                if any(marker in filename for marker in markers):
+                    return category
+        return "app"
+
+    @staticmethod
+    def _warnings(recording, threshold):
+        """Flags lazy loads repeated per parent row and identical queries repeated threshold times."""
+        warnings = []
+        for relationship, count in recording.lazy_loads.items():
+            if count > 1:
+                warnings.append({
+                    "type": "n_plus_one",
+                    "relationship": relationship,
+                    "count": count,
+                    "message": f"{relationship} was lazy loaded {count} times, eager load it "
+                               f"(selectinload/joinedload) or query it once",
+                })
+        statements = Counter(query["statement"] for query in recording.queries)
+        for statement, count in statements.items():
+            if count >= threshold:
+                warnings.append({
+                    "type": "repeated_query",
+                    "statement": statement,
+                    "count": count,
+                    "message": f"The same statement ran {count} times",
+                })
+        return warnings
+
+    @staticmethod
+    def _finish(app, recording, summary):
+        """Stops sampling and writes the profile of a request (runs after the app context ended)."""
+        _state.recording = None
+        duration = time.perf_counter() - recording.started
+        recording.sampler.stop()
+        config = app.config
+
+        stacks = recording.sampler.stacks
+        samples = sum(stacks.values())
+        breakdown = Counter()
+        for stack, count in stacks.items():
+            breakdown[RequestProfiler._category(stack)] += count
+
+        profile = dict(summary)
+        profile.update({
+            "id": recording.id,
+            "started_at": recording.started_at.isoformat() + "Z",
+            "duration_ms": round(duration * 1000, 1),
+            # Share of the samples per category, scaled to the request duration
+            "breakdown_ms": {
+                category: round(count / samples * duration * 1000, 1)
+                for category, count in breakdown.most_common()
+            } if samples else {},
+            "sql": {
+                "count": len(recording.queries),
+                "total_ms": round(sum(query["duration_ms"] for query in recording.queries), 3),
+                "queries": recording.queries,
+            },
+            "lazy_loads": dict(recording.lazy_loads),
+            "warnings": RequestProfiler._warnings(recording, config['PROFILER_N_PLUS_ONE_THRESHOLD']),
+            "profile": {
+                "interval_ms": config['PROFILER_INTERVAL'] * 1000,
+                "samples": samples,
+                "stacks": [
+                    {"stack": ";".join(RequestProfiler._frame_label(*frame) for frame in stack), "count": count}
+                    for stack, count in stacks.most_common()
+                ],
+            },
+        })
+        for warning in profile["warnings"]:
+            logger.warning(f"Profile {recording.id} ({summary['method']} {summary['path']}): {warning['message']}")
+
+        try:
+            RequestProfiler._write(app, profile)
+        except Exception as e:
+            logger.error(f"Error writing profile {recording.id}: {str(e)}")
+
+    @staticmethod
+    def _directory(app):
+        return os.path.abspath(app.config['PROFILER_DIR'] or os.path.join(app.instance_path, "profiles"))
+
+    @staticmethod
+    def _write(app, profile):
+        """Writes a profile and removes the oldest ones beyond PROFILER_MAX_PROFILES."""
+        config = app.config
+        directory = RequestProfiler._directory(app)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{profile['id']}.json")
+        with open(path + ".tmp", "wb") as handle:
+            handle.write(app.json.dumps_bytes(profile, indent=2))
+        os.replace(path + ".tmp", path)
+
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+        for name in names[:max(0, len(names) - config['PROFILER_MAX_PROFILES'])]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+    @staticmethod
+    def list_profiles(limit=50):
+        """
+        Lists stored profiles, newest first.
+
+        Args:
+            limit (int, optional): Maximum number of profiles
+
+        Returns:
+            list: Profile summaries without SQL statements and stacks
+        """
+        directory = RequestProfiler._directory(current_app)
+        if not os.path.isdir(directory):
+            return []
+        names = sorted((name for name in os.listdir(directory) if name.endswith(".json")), reverse=True)
+        summaries = []
+        for name in names[:limit]:
+            profile = RequestProfiler.load(name[:-5])
+            if profile is None:
+                continue
+            summaries.append({
+                "id": profile["id"],
+                "started_at": profile["started_at"],
+                "method": profile["method"],
+                "path": profile["path"],
+                "status": profile["status"],
+                "duration_ms": profile["duration_ms"],
+                "breakdown_ms": profile["breakdown_ms"],
+                "sql_count": profile["sql"]["count"],
+                "sql_ms": profile["sql"]["total_ms"],
+                "warnings": len(profile["warnings"]),
+            })
+        return summaries
+
+    @staticmethod
+    def load(profile_id):
+        """
+        Loads a stored profile.
+
+        Args:
+            profile_id (str): Id from the X-Profile-Id response header
+
+        Returns:
+            dict: The profile, or None if it does not exist
+        """
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = os.path.join(RequestProfiler._directory(current_app), f"{profile_id}.json")
+        try:
+            with open(path, "rb") as handle:
+                return current_app.json.loads(handle.read())
+        except (OSError, ValueError):
+            return None
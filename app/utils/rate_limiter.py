@@ -0,0 +1,237 @@
+import email.utils
+import logging
+import re
+import time
+import requests
+from flask import current_app
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from app.models import db, RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+# OpenAI style durations, e.g. "1s", "6m0s", "250ms"
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """Raised when no token became available within RATE_LIMIT_MAX_WAIT."""
+
+
+class RateLimiter:
+    """Token buckets per upstream API, shared by all processes through the database.
+
+    Each bucket is a row in rate_limit_buckets that is refilled lazily and
+    updated under a row lock (SELECT ... FOR UPDATE on Postgres; on SQLite the
+    row is updated first, which takes the database write lock). Callers wait
+    for a token instead of failing. Retry-After and rate-limit response
+    headers block the bucket or adjust its size so that the limits the
+    provider actually enforces are learned.
+    """
+
+    _known_buckets = set()
+    _learned_capacity = {}
+
+    @staticmethod
+    def limits():
+        """
+        Parses RATE_LIMITS, e.g. "fireflies=50/60,openai=500/60" (requests per seconds).
+
+        Returns:
+            dict: {name: (capacity, refill_rate)}
+        """
+        limits = {}
+        for entry in current_app.config['RATE_LIMITS'].split(","):
+            name, _, spec = entry.strip().partition("=")
+            if not name or not spec:
+                continue
+            requests_per, _, seconds = spec.partition("/")
+            capacity = float(requests_per)
+            limits[name] = (capacity, capacity / float(seconds or 1))
+        return limits
+
+    @staticmethod
+    def _lock_bucket(conn, name):
+        """Reads a bucket row while holding a lock on it until the transaction ends."""
+        if conn.dialect.name == "sqlite":
+            conn.execute(update(RateLimitBucket).where(RateLimitBucket.name == name).values(name=name))
+            return conn.execute(select(RateLimitBucket.__table__).where(RateLimitBucket.name == name)).first()
+        return conn.execute(
+            select(RateLimitBucket.__table__).where(RateLimitBucket.name == name).with_for_update()
+        ).first()
+
+    @classmethod
+    def _ensure_bucket(cls, name, capacity, refill_rate):
+        """Creates a full bucket on first use."""
+        if name in cls._known_buckets:
+            return
+        with db.engine.connect() as conn:
+            exists = conn.execute(select(RateLimitBucket.name).where(RateLimitBucket.name == name)).first()
+        if not exists:
+            cls._create_bucket(name, capacity, refill_rate)
+        cls._known_buckets.add(name)
+
+    @staticmethod
+    def _create_bucket(name, capacity, refill_rate):
+        """Inserts a full bucket unless another process already has."""
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(RateLimitBucket.__table__.insert().values(
+                    name=name,
+                    capacity=capacity,
+                    refill_rate=refill_rate,
+                    tokens=capacity,
+                    updated_at=time.time()
+                ))
+        except IntegrityError:
+            # Another worker created it first
+            pass
+
+    @classmethod
+    def _take(cls, name, capacity, refill_rate):
+        """
+        Takes a token if one is available.
+
+        Args:
+            name (str): Upstream name from RATE_LIMITS
+            capacity (float): Bucket size used if the row has to be recreated
+            refill_rate (float): Tokens per second used if the row has to be recreated
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one should be available
+        """
+        while True:
+            with db.engine.begin() as conn:
+                bucket = cls._lock_bucket(conn, name)
+                if bucket is not None:
+                    now = time.time()
+                    tokens = min(bucket.capacity, bucket.tokens + (now - bucket.updated_at) * bucket.refill_rate)
+
+                    wait = 0.0
+                    if bucket.blocked_until and bucket.blocked_until > now:
+                        wait = bucket.blocked_until - now
+                    elif tokens >= 1:
+                        tokens -= 1
+                    else:
+                        wait = (1 - tokens) / bucket.refill_rate
+
+                    conn.execute(
+                        update(RateLimitBucket)
+                        .where(RateLimitBucket.name == name)
+                        .values(tokens=tokens, updated_at=now)
+                    )
+                    return wait
+
+            # The row is gone although _ensure_bucket saw it (e.g. the table was cleared);
+            # recreate it outside the transaction, which on SQLite holds the write lock
+            logger.warning(f"{name} rate limit bucket is missing, recreating it")
+            cls._create_bucket(name, capacity, refill_rate)
+
+    @classmethod
+    def acquire(cls, name):
+        """
+        Blocks until a token for the upstream is available.
+
+        Args:
+            name (str): Upstream name from RATE_LIMITS; unknown names are not limited
+
+        Raises:
+            RateLimitExceeded: If waiting would exceed RATE_LIMIT_MAX_WAIT seconds
+        """
+        limit = cls.limits().get(name)
+        if not limit:
+            return
+        cls._ensure_bucket(name, *limit)
+
+        max_wait = current_app.config['RATE_LIMIT_MAX_WAIT']
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = cls._take(name, *limit)
+            if not wait:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitExceeded(f"No {name} rate limit token available within {max_wait:.0f}s")
+            logger.debug(f"Waiting {wait:.2f}s for a {name} rate limit token")
+            time.sleep(wait)
+
+    @staticmethod
+    def _parse_seconds(value, now):
+        """Parses a Retry-After / reset header: seconds, a duration like "6m0s", an epoch or an HTTP date."""
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            seconds = float(value)
+            # Some APIs send the reset time as a Unix timestamp
+            return seconds - now if seconds > 1e9 else seconds
+        except ValueError:
+            pass
+        parts = DURATION_PATTERN.findall(value)
+        if parts:
+            return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+        try:
+            return email.utils.parsedate_to_datetime(value).timestamp() - now
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def observe(cls, name, response):
+        """
+        Learns from an upstream response's rate-limit headers.
+
+        - Retry-After (on 429/503) blocks the bucket for that long
+        - X-RateLimit-Limit(-Requests) resizes the bucket
+        - X-RateLimit-Remaining(-Requests) of 0 blocks the bucket until the reset time
+
+        Args:
+            name (str): Upstream name from RATE_LIMITS
+            response (requests.Response): Response to inspect
+        """
+        limit = cls.limits().get(name)
+        if not limit:
+            return
+
+        headers = response.headers
+        now = time.time()
+        values = {}
+
+        retry_after = cls._parse_seconds(headers.get("Retry-After"), now)
+        if response.status_code in (429, 503) and retry_after is None:
+            # Throttled without a hint, back off for one token's worth of time
+            retry_after = 1 / limit[1]
+
+        learned_limit = headers.get("X-RateLimit-Limit-Requests") or headers.get("X-RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining-Requests") or headers.get("X-RateLimit-Remaining")
+        reset = cls._parse_seconds(headers.get("X-RateLimit-Reset-Requests") or headers.get("X-RateLimit-Reset"), now)
+
+        if learned_limit:
+            try:
+                capacity = float(learned_limit)
+            except ValueError:
+                capacity = None
+            if capacity and capacity not in cls._learned_capacity.get(name, ()):
+                # The configured window is assumed to be the provider's window
+                values["capacity"] = capacity
+                values["refill_rate"] = capacity * limit[1] / limit[0]
+                cls._learned_capacity[name] = (capacity,)
+                logger.info(f"Learned {name} rate limit of {capacity:.0f} requests per window")
+        if remaining is not None and reset:
+            try:
+                if float(remaining) <= 0:
+                    retry_after = max(retry_after or 0, reset)
+            except ValueError:
+                pass
+        if retry_after and retry_after > 0:
+            values["blocked_until"] = now + retry_after
+            values["tokens"] = 0
+            values["updated_at"] = now
+            logger.warning(f"{name} rate limited, holding requests for {retry_after:.1f}s")
+
+        if not values:
+            return
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(update(RateLimitBucket).where(RateLimitBucket.name == name).values(**values))
+        except Exception as e:
+            logger.error(f"Failed to update {name} rate limit: {str(e)}")
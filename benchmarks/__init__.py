@@ -0,0 +1,4 @@
+"""
+In-process benchmarks for the Fireflies Transcription Service.
+Run with: python benchmarks/run.py --help
+"""
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Endpoint Benchmarks
+
+Builds the app with create_app on a seeded database, with the Fireflies,
+OpenAI and project brief APIs replaced by local stubs, and measures
+throughput and latency percentiles of the hot endpoints in-process:
+python benchmarks/run.py [--backend sqlite] [--backend postgres --postgres-uri URI] [--scale 0.01]
+
+Results are written as JSON; compare two runs with:
+python benchmarks/run.py --compare baseline.json current.json
+"""
+
+import argparse
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Add the repository root to the path so we can import the app
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from app import create_app
+from app.config import Config
+from app.models import db, Meeting, Project
+from app.services import openai_service
+from benchmarks import seed as seeding
+from benchmarks.stubs import StubServer
+
+WEBHOOK_SECRET = "benchmark-secret"
+
+# Status a successful call of each endpoint returns; anything else counts as an error
+EXPECTED_STATUS = {
+    "get_meetings": 200,
+    "get_project_meeting": 200,
+    "fireflies_webhook": 202,
+    "create_meeting": 201,
+}
+
+# Read-only endpoints first, so writes don't change what the reads see
+ENDPOINTS = ("get_meetings", "get_project_meeting", "fireflies_webhook", "create_meeting")
+
+PERCENTILES = (50, 90, 99)
+
+
+def benchmark_config(database_uri, stub_url):
+    """Config class pointing the app at the benchmark database and the stubs."""
+    return type("BenchmarkConfig", (Config,), {
+        "SQLALCHEMY_DATABASE_URI": database_uri,
+        "DEBUG": False,
+        "LOG_LEVEL": "WARNING",
+        "FIREFLIES_API_URL": f"{stub_url}/graphql",
+        "FIREFLIES_API_KEY": "benchmark",
+        "FIREFLIES_WEBHOOK_SECRET": WEBHOOK_SECRET,
+        "VERIFY_SIGNATURE": True,
+        "PROJECT_BRIEF_SERVICE_URL": stub_url,
+        "OPENAI_API_KEY": "benchmark",
+        # The stubs have no quota; limiting would measure the token bucket instead of the app
+        "RATE_LIMITS": "",
+        "JOB_WORKER_EMBEDDED": False,
+        "RECONCILE_INTERVAL": 0,
+        "PROFILER_ENABLED": False,
+    })
+
+
+class Workload:
+    """Builds the requests of each endpoint from the ids in the seeded database."""
+
+    def __init__(self, app, random_seed):
+        self.rng = random.Random(random_seed)
+        self._lock = threading.Lock()
+        self._created = itertools.count()
+        with app.app_context():
+            self.project_ids = [row.project_id for row in db.session.query(Project.project_id)]
+            self.meetings_total = db.session.query(db.func.max(Meeting.id)).scalar() or 0
+            self.transcribed = [
+                (row.project_id, row.id)
+                for row in db.session.query(Meeting.project_id, Meeting.id)
+                .filter(Meeting.transcript_blob.isnot(None))
+                .limit(1000)
+            ]
+        if not self.project_ids:
+            raise SystemExit("The benchmark database is empty, run without --skip-seed first")
+
+    def _choice(self, items):
+        with self._lock:
+            return self.rng.choice(items)
+
+    def request(self, endpoint):
+        """
+        Builds one request.
+
+        Returns:
+            tuple: (method, path, keyword arguments for the test client)
+        """
+        if endpoint == "get_meetings":
+            return "GET", f"/projects/{self._choice(self.project_ids)}/meetings", {}
+        if endpoint == "get_project_meeting":
+            if not self.transcribed:
+                raise SystemExit("No transcribed meetings seeded, --transcripts must be at least 1")
+            project_id, meeting_pk = self._choice(self.transcribed)
+            return "GET", f"/projects/{project_id}/meetings/{meeting_pk}", {}
+        if endpoint == "fireflies_webhook":
+            body = json.dumps({"eventType": "Transcription completed", "meetingId": uuid.uuid4().hex}).encode("utf-8")
+            signature = hmac.new(WEBHOOK_SECRET.encode("utf-8"), body, hashlib.sha256).hexdigest()
+            return "POST", "/webhooks/meetings", {
+                "data": body,
+                "content_type": "application/json",
+                "headers": {"X-Hub-Signature": signature},
+            }
+        code = seeding.meet_code(self.meetings_total + 1 + next(self._created))
+        return "POST", f"/projects/{self._choice(self.project_ids)}/meetings", {
+            "json": {"google_meet_url": f"https://meet.google.com/{code}", "title": "Benchmark meeting", "duration": 30}
+        }
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(percent / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_endpoint(app, workload, endpoint, requests, concurrency, warmup):
+    """
+    Sends requests to one endpoint from concurrency threads.
+
+    Returns:
+        dict: Throughput, latency percentiles in milliseconds and status counts
+    """
+    def send(client):
+        method, path, kwargs = workload.request(endpoint)
+        started = time.perf_counter()
+        response = client.open(path, method=method, **kwargs)
+        response.get_data()
+        response.close()
+        return time.perf_counter() - started, response.status_code
+
+    client = app.test_client()
+    for _ in range(warmup):
+        send(client)
+
+    counter = itertools.count()
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+
+    def worker():
+        client = app.test_client()
+        local_latencies = []
+        local_statuses = {}
+        while next(counter) < requests:
+            duration, status = send(client)
+            local_latencies.append(duration)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if status != EXPECTED_STATUS[endpoint])
+    latency_ms = {f"p{percent}": round(percentile(latencies, percent) * 1000, 3) for percent in PERCENTILES}
+    latency_ms["mean"] = round(sum(latencies) / len(latencies) * 1000, 3)
+    latency_ms["max"] = round(latencies[-1] * 1000, 3)
+    return {
+        "endpoint": endpoint,
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "errors": errors,
+        "error_rate": round(errors / len(latencies), 4),
+        "status_counts": {str(status): count for status, count in sorted(statuses.items())},
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": latency_ms,
+    }
+
+
+def run_backend(backend, database_uri, args, stubs):
+    """Seeds (unless --skip-seed) and benchmarks one database backend."""
+    app = create_app(benchmark_config(database_uri, stubs.url))
+    result = {"backend": backend, "database": database_uri.split("@")[-1], "seed": None, "endpoints": []}
+
+    if not args.skip_seed:
+        with app.app_context():
+            result["seed"] = seeding.seed(
+                projects=max(1, int(args.projects * args.scale)),
+                meetings=max(1, int(args.meetings * args.scale)),
+                transcripts=max(1, int(args.transcripts * args.scale)),
+                transcript_bytes=int(args.transcript_mb * 1024 * 1024),
+                random_seed=args.seed
+            )
+        print(f"[{backend}] seeded: {json.dumps(result['seed'])}", flush=True)
+
+    workload = Workload(app, args.seed)
+    for endpoint in args.endpoints:
+        stats = run_endpoint(app, workload, endpoint, args.requests, args.concurrency, args.warmup)
+        result["endpoints"].append(stats)
+        latency = stats["latency_ms"]
+        print(
+            f"[{backend}] {endpoint:<20} {stats['throughput_rps']:>8.1f} req/s  "
+            f"p50 {latency['p50']:>8.2f} ms  p99 {latency['p99']:>8.2f} ms  errors {stats['errors']}",
+            flush=True
+        )
+
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    return result
+
+
+def git_commit():
+    """Commit the benchmark ran against, or None outside a git checkout."""
+    try:
+        output = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10)
+        return output.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(baseline_path, current):
+    """Prints throughput and p50/p99 changes of a run against a baseline result file."""
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)
+    previous = {
+        (run["backend"], stats["endpoint"]): stats
+        for run in baseline["runs"] for stats in run["endpoints"]
+    }
+    print(f"\nCompared with {baseline_path} ({baseline.get('git_commit') or 'unknown commit'}):")
+    for run in current["runs"]:
+        for stats in run["endpoints"]:
+            old = previous.get((run["backend"], stats["endpoint"]))
+            if not old:
+                continue
+
+            def change(new_value, old_value):
+                return f"{(new_value - old_value) / old_value * 100:+7.1f}%" if old_value else "    n/a"
+
+            print(
+                f"[{run['backend']}] {stats['endpoint']:<20} "
+                f"throughput {change(stats['throughput_rps'], old['throughput_rps'])}  "
+                f"p50 {change(stats['latency_ms']['p50'], old['latency_ms']['p50'])}  "
+                f"p99 {change(stats['latency_ms']['p99'], old['latency_ms']['p99'])}"
+            )
+
+
+def main():
+    """Run the benchmarks and write the results as JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark the hot endpoints against a seeded database")
+    parser.add_argument("--backend", action="append", choices=["sqlite", "postgres"],
+                        help="Database backend, repeat for several (default: sqlite)")
+    parser.add_argument("--sqlite-uri", default=f"sqlite:///{os.path.join(tempfile.gettempdir(), 'fireflies-benchmark.db')}",
+                        help="SQLite database to seed and benchmark")
+    parser.add_argument("--postgres-uri", default=os.getenv("BENCHMARK_POSTGRES_URI"),
+                        help="Postgres database to seed and benchmark (BENCHMARK_POSTGRES_URI); its tables are dropped")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--meetings", type=int, default=500000)
+    parser.add_argument("--transcripts", type=int, default=50, help="Meetings with a stored transcript")
+    parser.add_argument("--transcript-mb", type=float, default=2.0, help="Size of each stored transcript")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplies the project, meeting and transcript counts")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data of a previous run")
+    parser.add_argument("--requests", type=int, default=1000, help="Measured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=4, help="Threads sending requests")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per endpoint")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the data and the workload")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", nargs="+", metavar="RESULT",
+                        help="Baseline result to compare this run with, or two result files to compare without running")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[1]) as handle:
+            compare(args.compare[0], json.load(handle))
+        return
+
+    backends = args.backend = args.backend or ["sqlite"]
+    if "postgres" in backends and not args.postgres_uri:
+        parser.error("--postgres-uri (or BENCHMARK_POSTGRES_URI) is required for the postgres backend")
+
+    stubs = StubServer().start()
+    # The OpenAI endpoint is a module constant rather than config
+    openai_service.OPENAI_CHAT_COMPLETIONS_URL = f"{stubs.url}/v1/chat/completions"
+
+    started_at = datetime.utcnow()
+    results = {
+        "started_at": started_at.isoformat() + "Z",
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("postgres_uri", "compare", "output")},
+        "runs": [],
+    }
+    try:
+        for backend in backends:
+            database_uri = args.sqlite_uri if backend == "sqlite" else args.postgres_uri
+            results["runs"].append(run_backend(backend, database_uri, args, stubs))
+    finally:
+        stubs.stop()
+    results["upstream_calls"] = stubs.calls
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{started_at:%Y%m%dT%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(results, handle, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        compare(args.compare[0], results)
+
+
+if __name__ == "__main__":
+    main()
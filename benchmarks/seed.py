@@ -0,0 +1,142 @@
+"""
+Seeds a benchmark database with projects, meetings and large transcripts.
+
+Projects and meetings are written with bulk INSERTs; transcripts go through
+TranscriptStore.save_sentences like ingested Fireflies transcripts, so the
+sentence rows, compressed blob and search index match production data.
+"""
+
+import logging
+import random
+import string
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert, text
+from app.models import db, Meeting, Project
+from app.services.search_service import TranscriptSearchService
+from app.services.transcript_store import TranscriptStore
+from benchmarks.stubs import TRANSCRIPT_SENTENCE_WORDS, WORDS
+
+logger = logging.getLogger(__name__)
+
+INSERT_BATCH_SIZE = 10000
+
+# Tables created outside the models by TranscriptSearchService.ensure_schema
+SEARCH_TABLES = ("transcript_fts", "transcript_search")
+
+
+def meet_code(number):
+    """Deterministic, unique Meet code (abc-defg-hij) for a meeting number."""
+    letters = []
+    for _ in range(10):
+        number, digit = divmod(number, 26)
+        letters.append(string.ascii_lowercase[digit])
+    code = "".join(reversed(letters))
+    return f"{code[:3]}-{code[3:7]}-{code[7:]}"
+
+
+def project_id(number):
+    return f"bench-{number:06d}"
+
+
+def reset_schema():
+    """Drops and recreates all tables, including the full-text search index."""
+    with db.engine.begin() as conn:
+        for table in SEARCH_TABLES:
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    db.drop_all()
+    db.create_all()
+    TranscriptSearchService.ensure_schema()
+
+
+def _sentences(rng, size):
+    """Generates transcript sentences until about size bytes of text."""
+    written = 0
+    index = 0
+    while written < size:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(TRANSCRIPT_SENTENCE_WORDS)).capitalize() + "."
+        written += len(sentence) + 12
+        yield {
+            "speaker": f"Speaker {index % 4 + 1}",
+            "text": sentence,
+            "start_time": index * 4.0,
+            "end_time": index * 4.0 + 3.5,
+        }
+        index += 1
+
+
+def seed(projects, meetings, transcripts, transcript_bytes, random_seed=0):
+    """
+    Replaces the database contents with generated benchmark data.
+
+    Meetings are spread evenly over the projects. The first transcripts
+    meetings get a stored transcript of about transcript_bytes each; the
+    rest are pending, like meetings whose bot was just invited.
+
+    Args:
+        projects (int): Number of projects
+        meetings (int): Number of meetings
+        transcripts (int): Number of meetings with a stored transcript
+        transcript_bytes (int): Approximate transcript size in bytes
+        random_seed (int, optional): Seed of the generated data
+
+    Returns:
+        dict: Row counts and seconds spent per step
+    """
+    rng = random.Random(random_seed)
+    stats = {"projects": projects, "meetings": meetings, "transcripts": transcripts}
+
+    started = time.perf_counter()
+    reset_schema()
+
+    now = datetime.utcnow()
+    rows = []
+    for number in range(projects):
+        rows.append({
+            "project_id": project_id(number),
+            "requirements": f"# Goals\nBenchmark project {number}\n\n# Scope\nWebsite redesign",
+            "questions": "Who is the audience?",
+            "last_updated": now,
+            "created_at": now,
+        })
+        if len(rows) == INSERT_BATCH_SIZE:
+            db.session.execute(insert(Project), rows)
+            rows = []
+    if rows:
+        db.session.execute(insert(Project), rows)
+    db.session.commit()
+    stats["projects_seconds"] = round(time.perf_counter() - started, 2)
+
+    started = time.perf_counter()
+    rows = []
+    for number in range(meetings):
+        code = meet_code(number)
+        meeting_time = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+        rows.append({
+            "project_id": project_id(number % projects),
+            "meeting_url": f"https://meet.google.com/{code}",
+            "meet_code": code,
+            "meeting_datetime": meeting_time,
+            "updated_at": meeting_time,
+        })
+        if len(rows) == INSERT_BATCH_SIZE:
+            db.session.execute(insert(Meeting), rows)
+            rows = []
+    if rows:
+        db.session.execute(insert(Meeting), rows)
+    db.session.commit()
+    stats["meetings_seconds"] = round(time.perf_counter() - started, 2)
+
+    started = time.perf_counter()
+    stored_bytes = 0
+    transcribed = Meeting.query.order_by(Meeting.id).limit(transcripts).all()
+    for meeting in transcribed:
+        # Fireflies ids equal to the Meet code let the stub serve matching transcripts
+        meeting.meeting_id = meeting.meet_code
+        stored = TranscriptStore.save_sentences(meeting, _sentences(rng, transcript_bytes))
+        stored_bytes += stored["bytes"]
+        db.session.commit()
+    stats["transcript_bytes"] = stored_bytes
+    stats["transcripts_seconds"] = round(time.perf_counter() - started, 2)
+    logger.info(f"Seeded benchmark database: {stats}")
+    return stats
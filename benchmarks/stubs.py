@@ -0,0 +1,131 @@
+"""
+Local stand-ins for the Fireflies, OpenAI and project brief APIs.
+
+The benchmarks point FIREFLIES_API_URL, PROJECT_BRIEF_SERVICE_URL and the
+OpenAI endpoint at a StubServer, so outbound calls go over real HTTP
+(connection pools, rate limiter, metrics) without leaving the machine.
+"""
+
+import json
+import random
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TRANSCRIPT_SENTENCE_WORDS = 18
+WORDS = (
+    "project brief deadline budget design review client feedback scope sprint estimate "
+    "deliverable milestone approval revision launch timeline meeting agenda follow-up"
+).split()
+
+
+def transcript_payload(transcript_id, sentences, seed=0):
+    """
+    Builds a Fireflies GraphQL transcript response.
+
+    Args:
+        transcript_id (str): Fireflies transcript ID; a Meet code gives a matching meeting_link
+        sentences (int): Number of sentences
+        seed (int, optional): Seed of the generated words
+
+    Returns:
+        dict: {"data": {"transcript": {...}}}
+    """
+    rng = random.Random(f"{seed}:{transcript_id}")
+    items = []
+    for index in range(sentences):
+        items.append({
+            "index": index,
+            "speaker_name": f"Speaker {index % 4 + 1}",
+            "text": " ".join(rng.choice(WORDS) for _ in range(TRANSCRIPT_SENTENCE_WORDS)).capitalize() + ".",
+            "start_time": index * 4.0,
+            "end_time": index * 4.0 + 3.5,
+        })
+    return {"data": {"transcript": {
+        "id": transcript_id,
+        "title": f"Meeting {transcript_id}",
+        "meeting_link": f"https://meet.google.com/{transcript_id}",
+        "sentences": items,
+    }}}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Routes stub requests by path: /graphql, /v1/chat/completions and /projects/<id>."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        match = re.match(r"^/projects/([^/?]+)", self.path)
+        if not match:
+            self._send_json({"error": "Not found"}, 404)
+            return
+        project_id = match.group(1)
+        self._send_json({
+            "project_id": project_id,
+            "requirements": f"# Goals\nBrief of {project_id}\n\n# Scope\nWebsite redesign",
+            "questions": "Who is the audience?",
+        })
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        self.server.calls[self.path] = self.server.calls.get(self.path, 0) + 1
+
+        if self.path.startswith("/v1/chat/completions"):
+            content = json.dumps({"overall_status": "Fully Addressed", "sections": {}})
+            self._send_json({"choices": [{"message": {"role": "assistant", "content": content}}]})
+            return
+
+        query = request.get("query", "")
+        variables = request.get("variables") or {}
+        if "addToLiveMeeting" in query:
+            self._send_json({"data": {"addToLiveMeeting": {"success": True}}})
+        elif "transcripts(" in query:
+            self._send_json({"data": {"transcripts": []}})
+        elif "transcript(" in query:
+            # Transcript ids that are Meet codes match the seeded meeting booked on that code
+            transcript_id = variables.get("id") or ""
+            self._send_json(transcript_payload(transcript_id, self.server.transcript_sentences))
+        else:
+            self._send_json({"errors": [{"message": "Unsupported stub query"}]})
+
+
+class StubServer:
+    """Threaded HTTP server answering like the upstream APIs, on a free local port."""
+
+    def __init__(self, transcript_sentences=2000):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.calls = {}
+        self._server.transcript_sentences = transcript_sentences
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def calls(self):
+        """Requests served per path."""
+        return dict(self._server.calls)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="benchmark-stubs", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
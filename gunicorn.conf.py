@@ -0,0 +1,27 @@
+"""
+Gunicorn hooks for the Fireflies Transcription Service.
+Workers share Prometheus metrics through PROMETHEUS_MULTIPROC_DIR.
+"""
+import os
+import shutil
+import tempfile
+
+# Set here rather than in the image so only gunicorn workers run in multiprocess
+# mode; CLI processes (worker.py, migrate_db.py, ...) keep in-memory metrics and
+# leave no files behind that would count towards the live gauges.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "prometheus"))
+
+
+def on_starting(server):
+    """Clears metric files left over from a previous run of the master."""
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drops the live gauges of a worker that exited."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -21,8 +21,11 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 try:
     from app import create_app
-    from app.models import db, Project, Meeting
-    from sqlalchemy import text
+    from app.models import db, Project, Meeting, Job, BriefValidation
+    from app.services.search_service import TranscriptSearchService
+    from app.services.transcript_store import TranscriptStore
+    from app.utils.meet_link import MeetLink
+    from sqlalchemy import func, inspect, text, update
 except ImportError as e:
     logger.error(f"Failed to import required modules: {e}")
     sys.exit(1)
@@ -35,6 +38,117 @@ def check_table_exists(table_name):
         ))
         return result.scalar()
 
+def add_missing_columns(model):
+    """Add columns declared on a model that are missing from an existing table"""
+    existing = {column['name'] for column in inspect(db.engine).get_columns(model.__tablename__)}
+    for column in model.__table__.columns:
+        if column.name not in existing:
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            logger.info(f"Adding column {model.__tablename__}.{column.name} ({column_type})...")
+            with db.engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {model.__tablename__} ADD COLUMN {column.name} {column_type}"))
+
+def create_missing_indexes(model):
+    """Create indexes declared on a model that are missing from an existing table"""
+    existing = {index['name'] for index in inspect(db.engine).get_indexes(model.__tablename__)}
+    for index in model.__table__.indexes:
+        if index.name not in existing:
+            logger.info(f"Creating index {index.name}...")
+            index.create(bind=db.engine)
+
+def backfill_meeting_datetime():
+    """Give meetings without a meeting_datetime one and make the column NOT NULL (keyset cursors)"""
+    with db.engine.begin() as conn:
+        # Bound through the model so SQLite stores the same datetime format as the app
+        result = conn.execute(
+            update(Meeting)
+            .where(Meeting.meeting_datetime.is_(None))
+            .values(
+                meeting_datetime=func.coalesce(Meeting.updated_at, datetime.utcnow()),
+                # Keep updated_at (and with it the ETags) instead of the column's onupdate default
+                updated_at=Meeting.updated_at
+            )
+        )
+        if result.rowcount:
+            logger.info(f"Set meeting_datetime on {result.rowcount} meetings")
+        if db.engine.dialect.name == 'postgresql':
+            conn.execute(text("ALTER TABLE meetings ALTER COLUMN meeting_datetime SET NOT NULL"))
+        else:
+            # SQLite cannot change a column's constraints in place; the backfill is enough there
+            logger.info("Skipping NOT NULL constraint on meetings.meeting_datetime for this database")
+
+def backfill_meeting_updated_at():
+    """Give existing meetings an updated_at so they are covered by list ETags"""
+    with db.engine.begin() as conn:
+        result = conn.execute(text("UPDATE meetings SET updated_at = meeting_datetime WHERE updated_at IS NULL"))
+    if result.rowcount:
+        logger.info(f"Set updated_at on {result.rowcount} meetings")
+
+def backfill_transcript_sentences(batch_size=100):
+    """Convert legacy Meeting.transcription text into sentences and a compressed blob"""
+    converted = 0
+    while True:
+        meetings = Meeting.query.filter(
+            Meeting.transcription.isnot(None),
+            Meeting.transcript_blob.is_(None)
+        ).order_by(Meeting.id).limit(batch_size).all()
+        if not meetings:
+            break
+        for meeting in meetings:
+            TranscriptStore.save_text(meeting, meeting.transcription)
+        db.session.commit()
+        converted += len(meetings)
+        logger.info(f"Converted {converted} legacy transcripts...")
+    logger.info(f"Converted {converted} legacy transcripts in total")
+
+def backfill_search_index(batch_size=500):
+    """(Re)build the full-text search index for all stored transcripts"""
+    if not TranscriptSearchService.is_supported():
+        logger.info("Full-text search is not supported by this database, skipping index backfill")
+        return
+    indexed = 0
+    last_id = 0
+    while True:
+        meetings = Meeting.query.filter(
+            Meeting.id > last_id,
+            Meeting.sentence_count > 0
+        ).order_by(Meeting.id).limit(batch_size).all()
+        if not meetings:
+            break
+        for meeting in meetings:
+            TranscriptSearchService.index_meeting(meeting)
+        db.session.commit()
+        last_id = meetings[-1].id
+        indexed += len(meetings)
+        logger.info(f"Indexed {indexed} transcripts...")
+    logger.info(f"Indexed {indexed} transcripts in total")
+
+def drop_index_if_exists(table_name, index_name):
+    """Drop an index that is no longer declared on a model"""
+    existing = {index['name'] for index in inspect(db.engine).get_indexes(table_name)}
+    if index_name in existing:
+        logger.info(f"Dropping index {index_name}...")
+        with db.engine.begin() as conn:
+            conn.execute(text(f"DROP INDEX {index_name}"))
+
+def backfill_meet_codes(batch_size=1000):
+    """Populate Meeting.meet_code for rows created before the column existed"""
+    updated = 0
+    last_id = 0
+    while True:
+        meetings = Meeting.query.filter(
+            Meeting.id > last_id,
+            Meeting.meet_code.is_(None)
+        ).order_by(Meeting.id).limit(batch_size).all()
+        if not meetings:
+            break
+        for meeting in meetings:
+            meeting.meet_code = MeetLink.normalize_code(meeting.meeting_url)
+        db.session.commit()
+        last_id = meetings[-1].id
+        updated += len(meetings)
+    logger.info(f"Backfilled meet codes for {updated} meetings")
+
 def migrate_database():
     """Run the database migration"""
     app = create_app()
@@ -54,6 +168,9 @@ def migrate_database():
             db.create_all(tables=[Project.__table__])
             logger.info("Projects table created successfully")
         
+        # Project rows are queried below, so their new columns must exist first
+        add_missing_columns(Project)
+        
         # Get all unique project_ids from meetings
         logger.info("Collecting unique project IDs from meetings...")
         project_ids = db.session.query(Meeting.project_id).distinct().all()
@@ -81,6 +198,24 @@ def migrate_database():
         else:
             logger.info("No new projects needed to be created")
         
+        # Columns and indexes added to existing tables (db.create_all only covers new tables)
+        add_missing_columns(BriefValidation)
+        add_missing_columns(Job)
+        create_missing_indexes(Job)
+        add_missing_columns(Meeting)
+        backfill_meet_codes()
+        backfill_meeting_datetime()
+        backfill_meeting_updated_at()
+        # Exact-match lookups on the unbounded URL are replaced by ix_meetings_meet_code_datetime
+        drop_index_if_exists('meetings', 'ix_meetings_meeting_url')
+        create_missing_indexes(Meeting)
+        
+        # Move legacy uncompressed transcripts to sentence rows + compressed blob
+        backfill_transcript_sentences()
+        
+        # Populate the full-text search index for existing transcripts
+        backfill_search_index()
+        
         logger.info("Migration completed successfully")
         
 if __name__ == "__main__":
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Transcript Reconciler
+
+Fetches transcripts for meetings that are still pending RECONCILE_MIN_AGE
+minutes after they were created, e.g. because the Fireflies webhook was lost:
+python reconcile.py [--once] [--min-age 30] [--concurrency 4]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+# Add the current directory to the path so we can import the app
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app
+from app.routes.meetings import process_transcription
+from app.services.reconciler import TranscriptReconciler
+
+logger = logging.getLogger("reconciler")
+
+
+def main():
+    """Run reconciliation passes until interrupted (or once with --once)."""
+    parser = argparse.ArgumentParser(description="Backfill missing transcripts from Fireflies")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    parser.add_argument("--interval", type=float, default=None, help="Seconds between passes (RECONCILE_INTERVAL)")
+    parser.add_argument("--min-age", type=float, default=None, help="Minutes a meeting must be pending (RECONCILE_MIN_AGE)")
+    parser.add_argument("--concurrency", type=int, default=None, help="Parallel fetches (RECONCILE_CONCURRENCY)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Meetings per page (RECONCILE_BATCH_SIZE)")
+    args = parser.parse_args()
+    
+    app = create_app()
+    interval = args.interval or app.config['RECONCILE_INTERVAL'] or 300
+    
+    try:
+        while True:
+            with app.app_context():
+                stats = TranscriptReconciler.run_once(
+                    process_transcription,
+                    min_age=args.min_age,
+                    concurrency=args.concurrency,
+                    batch_size=args.batch_size
+                )
+            print(json.dumps(stats), flush=True)
+            if args.once:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        logger.info("Stopping reconciler...")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,18 +7,27 @@ This script tests all endpoints of the Fireflies transcription service:
 2. Simulating a webhook callback from Fireflies
 3. Retrieving the meeting transcript
 
+With --load it instead generates load: virtual users polling like the UI,
+a stream of signed webhooks and meeting creations, reporting latency
+percentiles, error rates and throughput per interval.
+
 Usage:
-    python test_fireflies_service.py [--host=http://localhost:8000]
+    python test_fireflies_service.py [--host=http://localhost:5000]
+    python test_fireflies_service.py --load --users 50 --duration 300 --webhook-rate 20 [--output load.json]
 """
 
 import argparse
 import json
+import random
 import requests
+import string
+import threading
 import time
 import hmac
 import hashlib
 import uuid
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 
 class Colors:
@@ -72,13 +81,13 @@ def check_health(base_url):
         return False
 
 
-def create_meeting(base_url, project_id, google_meet_url, title=None, duration=None):
+def create_meeting(base_url, project_id, google_meet_url, title=None, duration=None, session=None, verbose=True):
     """Test creating a new meeting."""
-    log_section("Testing Create Meeting Endpoint")
+    if verbose:
+        log_section("Testing Create Meeting Endpoint")
     
     # Prepare request data
     data = {
-        "project_id": project_id,
         "google_meet_url": google_meet_url
     }
     
@@ -88,34 +97,41 @@ def create_meeting(base_url, project_id, google_meet_url, title=None, duration=N
     if duration:
         data["duration"] = duration
     
-    log_info(f"Sending request to {base_url}/meetings")
-    log_info(f"Request data: {json.dumps(data, indent=2)}")
+    url = f"{base_url}/projects/{project_id}/meetings"
+    if verbose:
+        log_info(f"Sending request to {url}")
+        log_info(f"Request data: {json.dumps(data, indent=2)}")
     
     try:
-        response = requests.post(
-            f"{base_url}/meetings",
+        response = (session or requests).post(
+            url,
             json=data,
             headers={"Content-Type": "application/json"},
             timeout=10
         )
         
-        log_info(f"Response status: {response.status_code}")
-        log_info(f"Response body: {json.dumps(response.json(), indent=2)}")
+        if verbose:
+            log_info(f"Response status: {response.status_code}")
+            log_info(f"Response body: {response.text}")
         
         if response.status_code == 201:
-            log_success("Successfully created meeting")
+            if verbose:
+                log_success("Successfully created meeting")
             return response.json()
         else:
-            log_error(f"Failed to create meeting: {response.text}")
+            if verbose:
+                log_error(f"Failed to create meeting: {response.text}")
             return None
     except requests.RequestException as e:
-        log_error(f"Request failed: {e}")
+        if verbose:
+            log_error(f"Request failed: {e}")
         return None
 
 
-def simulate_webhook(base_url, meeting_id, meeting_url, webhook_secret=None):
+def simulate_webhook(base_url, meeting_id, meeting_url, webhook_secret=None, session=None, verbose=True):
     """Simulate a webhook call from Fireflies."""
-    log_section("Simulating Fireflies Webhook")
+    if verbose:
+        log_section("Simulating Fireflies Webhook")
     
     # Create a synthetic Fireflies webhook payload
     webhook_data = {
@@ -124,51 +140,57 @@ def simulate_webhook(base_url, meeting_id, meeting_url, webhook_secret=None):
         "meeting_link": meeting_url
     }
     
-    log_info(f"Webhook payload: {json.dumps(webhook_data, indent=2)}")
+    if verbose:
+        log_info(f"Webhook payload: {json.dumps(webhook_data, indent=2)}")
     
     # Prepare headers
     headers = {"Content-Type": "application/json"}
     
-    # Add signature if webhook secret is provided
+    # Add signature if webhook secret is provided; it covers the exact bytes sent
+    payload_bytes = json.dumps(webhook_data).encode('utf-8')
     if webhook_secret:
-        payload_bytes = json.dumps(webhook_data).encode('utf-8')
         signature = hmac.new(
             webhook_secret.encode('utf-8'),
             payload_bytes,
             hashlib.sha256
         ).hexdigest()
         headers["X-Hub-Signature"] = signature
-        log_info(f"Added webhook signature: {signature}")
+        if verbose:
+            log_info(f"Added webhook signature: {signature}")
     
     try:
-        response = requests.post(
-            f"{base_url}/webhook",
-            json=webhook_data,
+        response = (session or requests).post(
+            f"{base_url}/webhooks/meetings",
+            data=payload_bytes,
             headers=headers,
             timeout=10
         )
         
-        log_info(f"Response status: {response.status_code}")
-        log_info(f"Response body: {response.text}")
+        if verbose:
+            log_info(f"Response status: {response.status_code}")
+            log_info(f"Response body: {response.text}")
         
-        if response.status_code == 200:
-            log_success("Webhook processed successfully")
+        if response.status_code in (200, 202):
+            if verbose:
+                log_success("Webhook accepted successfully")
             return True
         else:
-            log_error(f"Webhook processing failed: {response.text}")
+            if verbose:
+                log_error(f"Webhook processing failed: {response.text}")
             return False
     except requests.RequestException as e:
-        log_error(f"Request failed: {e}")
+        if verbose:
+            log_error(f"Request failed: {e}")
         return False
 
 
-def get_meeting(base_url, meeting_id):
+def get_meeting(base_url, project_id, meeting_id):
     """Test retrieving a meeting transcript."""
     log_section(f"Testing Get Meeting Endpoint: {meeting_id}")
     
     try:
         response = requests.get(
-            f"{base_url}/meetings/{meeting_id}",
+            f"{base_url}/projects/{project_id}/meetings/{meeting_id}",
             timeout=10
         )
         
@@ -231,11 +253,289 @@ def inject_test_transcript(base_url, meeting_id, meeting_url):
         return False
 
 
+LOAD_PERCENTILES = (50, 90, 99)
+
+
+def random_meet_url(rng):
+    """Random Google Meet URL with a standard abc-defg-hij code."""
+    letters = "".join(rng.choice(string.ascii_lowercase) for _ in range(10))
+    return f"https://meet.google.com/{letters[:3]}-{letters[3:7]}-{letters[7:]}"
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(percent / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LoadStats:
+    """Thread-safe latency and error recorder, in total and per reporting window."""
+    
+    def __init__(self, window):
+        self.window = window
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._windows = {}
+        self._totals = {}
+    
+    def record(self, operation, latency, ok):
+        """Records one request; latency in seconds."""
+        index = int((time.monotonic() - self.started) // self.window)
+        with self._lock:
+            for buckets in (self._windows.setdefault(index, {}), self._totals):
+                bucket = buckets.setdefault(operation, {"latencies": [], "errors": 0})
+                bucket["latencies"].append(latency)
+                if not ok:
+                    bucket["errors"] += 1
+    
+    @staticmethod
+    def summarize(bucket, seconds):
+        """Request count, throughput, error rate and latency percentiles (ms) of a bucket."""
+        latencies = sorted(bucket["latencies"])
+        count = len(latencies)
+        summary = {
+            "requests": count,
+            "errors": bucket["errors"],
+            "error_rate": round(bucket["errors"] / count, 4) if count else 0.0,
+            "throughput_rps": round(count / seconds, 2) if seconds else 0.0,
+        }
+        for percent in LOAD_PERCENTILES:
+            value = percentile(latencies, percent)
+            summary[f"p{percent}_ms"] = round(value * 1000, 1) if value is not None else None
+        return summary
+    
+    def window_summary(self, index):
+        """Summaries per operation of one window, or {} if nothing was recorded in it."""
+        with self._lock:
+            buckets = {operation: dict(bucket, latencies=list(bucket["latencies"]))
+                       for operation, bucket in self._windows.get(index, {}).items()}
+        # The window still in progress (or cut short by the end of the run) is shorter
+        seconds = min(self.window, time.monotonic() - self.started - index * self.window)
+        return {operation: self.summarize(bucket, seconds) for operation, bucket in sorted(buckets.items())}
+    
+    def report(self):
+        """Totals and per-window summaries of the whole run."""
+        elapsed = time.monotonic() - self.started
+        with self._lock:
+            indexes = sorted(self._windows)
+            totals = {operation: dict(bucket, latencies=list(bucket["latencies"]))
+                      for operation, bucket in self._totals.items()}
+        return {
+            "duration_s": round(elapsed, 1),
+            "totals": {operation: self.summarize(bucket, elapsed) for operation, bucket in sorted(totals.items())},
+            "windows": [
+                {"start_s": index * self.window, "operations": self.window_summary(index)}
+                for index in indexes
+            ],
+        }
+
+
+def print_load_summary(title, summaries):
+    """Prints one line per operation: throughput, error rate and latency percentiles."""
+    print(f"{Colors.BOLD}{title}{Colors.RESET}")
+    for operation, summary in summaries.items():
+        color = Colors.RED if summary["errors"] else Colors.GREEN
+        print(
+            f"  {operation:<16} {summary['requests']:>6} req {summary['throughput_rps']:>8.2f}/s  "
+            f"p50 {summary['p50_ms']:>8.1f} ms  p90 {summary['p90_ms']:>8.1f} ms  p99 {summary['p99_ms']:>8.1f} ms  "
+            f"{color}errors {summary['error_rate'] * 100:5.1f}%{Colors.RESET}"
+        )
+
+
+def timed_get(session, stats, operation, url, etags, timeout):
+    """
+    Sends a GET like a browser: revalidating with the ETag of the last response.
+    
+    Returns:
+        requests.Response: The response, or None if the request failed
+    """
+    headers = {}
+    if url in etags:
+        headers["If-None-Match"] = etags[url]
+    started = time.monotonic()
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+        response.content
+    except requests.RequestException:
+        stats.record(operation, time.monotonic() - started, False)
+        return None
+    stats.record(operation, time.monotonic() - started, response.status_code < 400)
+    if response.headers.get("ETag"):
+        etags[url] = response.headers["ETag"]
+    return response
+
+
+def virtual_user(base_url, project_id, stats, stop, args, rng):
+    """
+    Simulates one browser tab of the UI.
+    
+    Loads the project and its meeting list, then polls the newest meeting every
+    --poll-interval seconds and refreshes the list every --list-interval
+    seconds (the UI's fallback when the event stream is not connected).
+    """
+    session = requests.Session()
+    etags = {}
+    meetings_url = f"{base_url}/projects/{project_id}/meetings"
+    
+    # Tabs are opened over the first poll interval rather than all at once
+    if stop.wait(rng.uniform(0, args.poll_interval)):
+        return
+    timed_get(session, stats, "get_project", f"{base_url}/projects/{project_id}", etags, args.timeout)
+    
+    meeting_id = None
+    next_list = 0
+    while not stop.is_set():
+        now = time.monotonic()
+        if now >= next_list:
+            response = timed_get(session, stats, "list_meetings", f"{meetings_url}?limit=50", etags, args.timeout)
+            if response is not None and response.status_code == 200:
+                meetings = response.json().get("meetings") or []
+                if meetings:
+                    meeting_id = meetings[0]["id"]
+            next_list = now + args.list_interval
+        if meeting_id is not None:
+            timed_get(session, stats, "get_meeting", f"{meetings_url}/{meeting_id}", etags, args.timeout)
+        stop.wait(args.poll_interval)
+    session.close()
+
+
+def paced(rate, stop, executor, task):
+    """Submits task() to the executor rate times per second until stopped (open model)."""
+    if rate <= 0:
+        return
+    started = time.monotonic()
+    sent = 0
+    # Requests are scheduled by the clock, so slow responses don't lower the rate
+    while not stop.wait(max(0, started + sent / rate - time.monotonic())):
+        executor.submit(task)
+        sent += 1
+
+
+def run_load(base_url, args):
+    """
+    Runs the load mode: virtual users polling, a webhook storm and meeting creations.
+    
+    Returns:
+        dict: LoadStats.report() of the run
+    """
+    rng = random.Random(args.seed)
+    run_id = uuid.uuid4().hex[:6]
+    project_ids = [f"load-{run_id}-{index}" for index in range(args.projects or args.users)]
+    stats = LoadStats(args.report_interval)
+    stop = threading.Event()
+    
+    log_section("Load Test")
+    log_info(
+        f"{args.users} virtual users on {len(project_ids)} projects for {args.duration:.0f}s, "
+        f"{args.webhook_rate}/s webhooks, {args.create_rate}/s meeting creations"
+    )
+    
+    # Every project gets a meeting up front so the virtual users have something to poll
+    sent_meetings = []
+    for project_id in project_ids:
+        meet_url = random_meet_url(rng)
+        if create_meeting(base_url, project_id, meet_url, title="Load test meeting", verbose=False):
+            sent_meetings.append(meet_url)
+    log_info(f"Seeded {len(sent_meetings)}/{len(project_ids)} projects with a meeting")
+    
+    session = requests.Session()
+    rng_lock = threading.Lock()
+    sent_webhooks = []
+    
+    def send_webhook():
+        with rng_lock:
+            # Fireflies redelivers events; the ledger should acknowledge those without work
+            if sent_webhooks and rng.random() < args.webhook_duplicates:
+                meeting_id = rng.choice(sent_webhooks)
+            else:
+                meeting_id = f"load-{run_id}-{uuid.uuid4().hex[:10]}"
+                sent_webhooks.append(meeting_id)
+            meeting_url = rng.choice(sent_meetings) if sent_meetings else random_meet_url(rng)
+        started = time.monotonic()
+        ok = simulate_webhook(base_url, meeting_id, meeting_url, webhook_secret=args.webhook_secret,
+                              session=session, verbose=False)
+        stats.record("webhook", time.monotonic() - started, ok)
+    
+    def send_creation():
+        with rng_lock:
+            project_id = rng.choice(project_ids)
+            meet_url = random_meet_url(rng)
+        started = time.monotonic()
+        ok = create_meeting(base_url, project_id, meet_url, title="Load test meeting", duration=30,
+                            session=session, verbose=False) is not None
+        stats.record("create_meeting", time.monotonic() - started, ok)
+    
+    reported = [0]
+    
+    def report_windows(until):
+        """Prints the windows that ended before until (seconds since the start)."""
+        while (reported[0] + 1) * stats.window <= until:
+            index = reported[0]
+            summaries = stats.window_summary(index)
+            if summaries:
+                print_load_summary(f"[{index * stats.window:>5.0f}s - {(index + 1) * stats.window:>5.0f}s]", summaries)
+            reported[0] += 1
+    
+    def reporter():
+        while not stop.wait(max(0, stats.started + (reported[0] + 1) * stats.window - time.monotonic())):
+            report_windows(time.monotonic() - stats.started)
+    
+    reporter_thread = threading.Thread(target=reporter, daemon=True)
+    reporter_thread.start()
+    
+    users = ThreadPoolExecutor(max_workers=args.users)
+    requests_pool = ThreadPoolExecutor(max_workers=args.max_inflight)
+    try:
+        for index in range(args.users):
+            users.submit(virtual_user, base_url, project_ids[index % len(project_ids)], stats, stop, args,
+                         random.Random(f"{args.seed}:{index}"))
+        generators = [
+            threading.Thread(target=paced, args=(args.webhook_rate, stop, requests_pool, send_webhook), daemon=True),
+            threading.Thread(target=paced, args=(args.create_rate, stop, requests_pool, send_creation), daemon=True),
+        ]
+        for generator in generators:
+            generator.start()
+        stop.wait(args.duration)
+    except KeyboardInterrupt:
+        log_warning("Interrupted, waiting for requests in flight...")
+    finally:
+        stop.set()
+        users.shutdown(wait=True, cancel_futures=True)
+        requests_pool.shutdown(wait=True)
+        reporter_thread.join()
+    
+    report = stats.report()
+    # Windows the reporter did not get to, including the last, partial one
+    report_windows(max((window["start_s"] for window in report["windows"]), default=-stats.window) + stats.window)
+    print()
+    print_load_summary(f"Totals over {report['duration_s']:.0f}s", report["totals"])
+    return report
+
+
 def main():
     """Main test function."""
     parser = argparse.ArgumentParser(description="Test Fireflies Transcription Service")
-    parser.add_argument("--host", default="http://localhost:8000", help="Base URL of the service")
+    parser.add_argument("--host", default="http://localhost:5000", help="Base URL of the service")
     parser.add_argument("--webhook-secret", default=None, help="Webhook secret (if enabled)")
+    
+    load = parser.add_argument_group("load mode")
+    load.add_argument("--load", action="store_true", help="Generate load instead of running the functional test")
+    load.add_argument("--users", type=int, default=10, help="Concurrent virtual users polling like the UI")
+    load.add_argument("--projects", type=int, default=None, help="Projects the users are spread over (default: one per user)")
+    load.add_argument("--duration", type=float, default=60, help="Seconds to generate load")
+    load.add_argument("--poll-interval", type=float, default=10, help="Seconds between meeting polls of a user")
+    load.add_argument("--list-interval", type=float, default=30, help="Seconds between meeting list refreshes of a user")
+    load.add_argument("--webhook-rate", type=float, default=5, help="Webhooks per second")
+    load.add_argument("--webhook-duplicates", type=float, default=0.1, help="Share of webhooks redelivering an earlier event")
+    load.add_argument("--create-rate", type=float, default=0.5, help="Meeting creations per second")
+    load.add_argument("--max-inflight", type=int, default=50, help="Concurrent webhook and creation requests")
+    load.add_argument("--report-interval", type=float, default=10, help="Seconds per reported window")
+    load.add_argument("--timeout", type=float, default=10, help="Request timeout in seconds")
+    load.add_argument("--seed", type=int, default=0, help="Random seed of the generated traffic")
+    load.add_argument("--max-error-rate", type=float, default=0.01, help="Exit with an error above this error rate")
+    load.add_argument("--output", default=None, help="Write the report as JSON to this file")
     args = parser.parse_args()
     
     base_url = args.host.rstrip('/')
@@ -248,6 +548,20 @@ def main():
         log_error("Service is not running. Exiting.")
         sys.exit(1)
     
+    if args.load:
+        report = run_load(base_url, args)
+        if args.output:
+            with open(args.output, "w") as handle:
+                json.dump(report, handle, indent=2)
+            log_info(f"Report written to {args.output}")
+        
+        failing = [op for op, summary in report["totals"].items() if summary["error_rate"] > args.max_error_rate]
+        if failing:
+            log_error(f"Error rate above {args.max_error_rate:.1%} for: {', '.join(failing)}")
+            sys.exit(1)
+        log_success("Load test completed")
+        sys.exit(0)
+    
     # Generate unique values for testing
     project_id = f"test-project-{uuid.uuid4().hex[:8]}"
     google_meet_url = f"https://meet.google.com/test-{uuid.uuid4().hex[:10]}"
@@ -275,7 +589,7 @@ def main():
     if inject_result:
         # Attempt to retrieve the meeting using the Fireflies meeting ID
         time.sleep(1)  # Give the service a moment to process
-        meeting_result = get_meeting(base_url, fireflies_meeting_id)
+        meeting_result = get_meeting(base_url, project_id, fireflies_meeting_id)
         
         if meeting_result:
             if meeting_result.get("transcription"):
@@ -305,7 +619,7 @@ def main():
         
         # Try retrieving the meeting data by internal ID
         if internal_meeting_id:
-            meeting_result = get_meeting(base_url, str(internal_meeting_id))
+            meeting_result = get_meeting(base_url, project_id, str(internal_meeting_id))
             if meeting_result:
                 log_success("Retrieved meeting by internal ID.")
             else:
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Background Job Worker
+
+Drains the jobs table (e.g. Fireflies webhook processing) outside the web
+processes. Set JOB_WORKER_EMBEDDED=false on the web service when running this:
+python worker.py [--concurrency 4] [--metrics-port 9100]
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Add the current directory to the path so we can import the app
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app
+from app.services.job_queue import JobWorker
+from app.services.reconciler import TranscriptReconciler
+
+logger = logging.getLogger("job_worker")
+
+
+def main():
+    """Run the job worker until interrupted."""
+    parser = argparse.ArgumentParser(description="Run the background job worker")
+    parser.add_argument("--concurrency", type=int, default=None, help="Number of worker threads")
+    parser.add_argument("--poll-interval", type=float, default=None, help="Seconds to sleep when idle")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus metrics on this port")
+    args = parser.parse_args()
+    
+    app = create_app()
+    with app.app_context():
+        TranscriptReconciler.schedule()
+    
+    if args.metrics_port:
+        # The web service's /metrics only sees its own processes, so upstream calls
+        # made here are exported separately
+        from prometheus_client import start_http_server
+        start_http_server(args.metrics_port)
+        logger.info(f"Serving metrics on port {args.metrics_port}")
+    
+    worker = JobWorker(app, concurrency=args.concurrency, poll_interval=args.poll_interval)
+    logger.info("Starting standalone job worker")
+    worker.run_forever()
+
+
+if __name__ == "__main__":
+    main()
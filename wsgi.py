@@ -1,6 +1,16 @@
 from app import create_app
+from app.services.job_queue import JobWorker
+from app.services.reconciler import TranscriptReconciler
 
 app = create_app()
 
+# Drain background jobs inside each web process unless a standalone worker is used
+if app.config['JOB_WORKER_EMBEDDED']:
+    JobWorker(app).start()
+    
+    # Make sure a periodic transcript reconciliation is queued (worker.py does this otherwise)
+    with app.app_context():
+        TranscriptReconciler.schedule()
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000)